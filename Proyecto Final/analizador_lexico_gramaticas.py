@@ -1,5 +1,5 @@
 import re
-from typing import List, Tuple, Optional
+from typing import Iterator, List, Tuple, Optional
 
 
 class PatronesGramaticas:
@@ -15,6 +15,39 @@ class PatronesGramaticas:
     RE_ESPACIOS = re.compile(r"\s+")
     RE_COMENTARIO = re.compile(r"#.*")
 
+    # Patrón maestro: las mismas reglas en un solo regex con grupos con nombre.
+    # El orden de las alternativas es la prioridad de las reglas; al final
+    # van los saltos de línea (los mismos que reconoce str.splitlines)
+    # y cualquier otro carácter como INVALIDO.
+    SALTOS_LINEA = "\\n\\r\\v\\f\\x1c\\x1d\\x1e\\x85\\u2028\\u2029"
+    RE_MAESTRO = re.compile(
+        rf"(?P<ESPACIOS>[^\S{SALTOS_LINEA}]+)"
+        rf"|(?P<COMENTARIO>#[^{SALTOS_LINEA}]*)"
+        r"|(?P<PRODUCCION>->|::=)"
+        r"|(?P<PIPE>\|)"
+        r"|(?P<EPSILON>\bepsilon\b|ε)"
+        r"|(?P<NO_TERMINAL_BRACKETS><[a-zA-Z_][a-zA-Z0-9_]*>)"
+        r"|(?P<NO_TERMINAL_MAYUS>[A-Z][A-Z0-9_]*)"
+        r"|(?P<TERMINAL_MINUS>[a-z][a-z0-9_]*)"
+        rf"|(?P<TERMINAL_COMILLAS>'[^{SALTOS_LINEA}]*?')"
+        rf"|(?P<NUEVA_LINEA>\r\n|[{SALTOS_LINEA}])"
+        r"|(?P<INVALIDO>.)"
+    )
+
+    # Grupo del patrón maestro -> tipo de token (None = se descarta)
+    TIPOS_MAESTRO = {
+        "ESPACIOS": None,
+        "COMENTARIO": None,
+        "PRODUCCION": "PRODUCCION",
+        "PIPE": "PIPE",
+        "EPSILON": "EPSILON",
+        "NO_TERMINAL_BRACKETS": "NO_TERMINAL",
+        "NO_TERMINAL_MAYUS": "NO_TERMINAL",
+        "TERMINAL_MINUS": "TERMINAL",
+        "TERMINAL_COMILLAS": "TERMINAL",
+        "INVALIDO": "INVALIDO",
+    }
+
 
 class AnalizadorLexicoGramaticas:
     """
@@ -40,29 +73,33 @@ class AnalizadorLexicoGramaticas:
         """
         Recorre una línea y devuelve la lista de tokens válidos detectados.
         """
-        tokens: List[Tuple[str, str, int, int]] = []
-        i, n = 0, len(linea)
-
-        while i < n:
-            columna = i + 1
-            encontrado = False
+        return list(self.tokenizar_texto(linea, numero_linea))
 
-            for regex, tipo in self.reglas:
-                m = regex.match(linea, i)
-                if m:
-                    i = m.end()
-                    if tipo:
-                        lexema = m.group(0)
-                        if tipo == "TERMINAL_COMILLAS":
-                            tipo = "TERMINAL"
-                            lexema = lexema[1:-1]
-                        tokens.append((lexema, tipo, numero_linea, columna))
-                    encontrado = True
-                    break
-
-            if not encontrado:
-                lexema_invalido = linea[i]
-                tokens.append((lexema_invalido, "INVALIDO", numero_linea, columna))
-                i += 1
+    def tokenizar_texto(
+        self, texto: str, linea_inicial: int = 1, incluir_fin_linea: bool = False
+    ) -> Iterator[Tuple[str, str, int, int]]:
+        """
+        Recorre un documento completo con el patrón maestro (sin dividirlo
+        en líneas) y va entregando los tokens con su línea y columna.
+        Con incluir_fin_linea=True cada salto de línea se entrega como un
+        token FIN_LINEA (lo usa GRAMATICA_DE_GRAMATICAS para separar reglas).
+        """
+        tipos = self.P.TIPOS_MAESTRO
+        numero_linea = linea_inicial
+        inicio_linea = 0
 
-        return tokens
+        for m in self.P.RE_MAESTRO.finditer(texto):
+            grupo = m.lastgroup
+            if grupo == "NUEVA_LINEA":
+                if incluir_fin_linea:
+                    yield m.group(), "FIN_LINEA", numero_linea, m.start() - inicio_linea + 1
+                numero_linea += 1
+                inicio_linea = m.end()
+                continue
+            tipo = tipos[grupo]
+            if tipo is None:
+                continue
+            lexema = m.group()
+            if grupo == "TERMINAL_COMILLAS":
+                lexema = lexema[1:-1]
+            yield lexema, tipo, numero_linea, m.start() - inicio_linea + 1
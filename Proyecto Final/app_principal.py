@@ -1,3 +1,4 @@
+import multiprocessing
 import tkinter as tk
 
 from utilidades_generales import VentanaCentrada, Alerta
@@ -5,6 +6,7 @@ from ventana_clasificador import VentanaClasificador
 from ventana_conversor import VentanaConversor
 from ventana_tutor import VentanaTutor
 from ventana_equivalencias import VentanaEquivalencias
+from tareas_segundo_plano import cancelar_todas
 
 
 class AplicacionPrincipal(tk.Tk, VentanaCentrada):
@@ -18,6 +20,7 @@ class AplicacionPrincipal(tk.Tk, VentanaCentrada):
         self.title("Chomsky Classifier AI - Menú Principal")
         self.configure(bg="#1E283D")
         self.centrar_ventana(self, 520, 420)
+        self.protocol("WM_DELETE_WINDOW", self.cerrar)
 
         tk.Label(
             self,
@@ -92,6 +95,11 @@ class AplicacionPrincipal(tk.Tk, VentanaCentrada):
         except Exception as e:
             Alerta.mostrar(self, "Error", f"No se pudo abrir el modo tutor:\n{e}")
 
+    def cerrar(self):
+        # Las tareas en segundo plano no deben mantener vivo el proceso
+        cancelar_todas()
+        self.destroy()
+
     def abrir_equivalencias(self):
         try:
             ventana = VentanaEquivalencias(self)
@@ -101,5 +109,10 @@ class AplicacionPrincipal(tk.Tk, VentanaCentrada):
 
 
 if __name__ == "__main__":
+    # Necesario para los procesos de trabajo en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
     app = AplicacionPrincipal()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        cancelar_todas()
@@ -0,0 +1,164 @@
+"""
+Representación compacta de un AFD con tabla de transiciones densa.
+
+La especificación del Proyecto 1 guarda el AFD como listas paralelas
+(estActua, lecturas, escribeC, estsigui, mueveCab), así que buscar
+δ(q, a) obliga a recorrer todas las transiciones. AFDDenso numera los
+estados 0..n-1 y los símbolos 0..m-1 y guarda δ en un array('i') de
+n * m enteros: δ(q, a) = tabla[q * m + columna(a)], o SIN_TRANSICION.
+"""
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from utilidades_generales import EPSILON_MT, MOVER_DERECHA
+
+
+SIN_TRANSICION = -1
+
+
+class AFDDenso:
+    """
+    AFD con tabla de transiciones densa.
+
+    - estados: etiqueta original de cada estado (índice -> etiqueta).
+    - simbolos: símbolos ordenados; columnas[a] es la columna de a.
+    - inicial: índice del estado inicial.
+    - aceptacion: bytearray con 1 en los estados de aceptación.
+    - tabla: array('i') de n * m destinos (SIN_TRANSICION si no hay).
+    - extras: valores de escribeC / mueveCab distintos de los por defecto,
+      por celda de la tabla, para que la conversión a la especificación
+      no pierda información.
+    """
+
+    def __init__(
+        self,
+        estados: Sequence[Any],
+        simbolos: Sequence[str],
+        inicial: int = 0,
+        nombre: str = "AFD",
+        alfabeto: Optional[Set[str]] = None,
+    ):
+        self.nombre = nombre
+        self.estados: List[Any] = list(estados)
+        self.indice: Dict[Any, int] = {e: i for i, e in enumerate(self.estados)}
+        self.simbolos: Tuple[str, ...] = tuple(simbolos)
+        self.columnas: Dict[str, int] = {a: c for c, a in enumerate(self.simbolos)}
+        self.alfabeto = alfabeto
+        self.inicial = inicial
+        self.aceptacion = bytearray(len(self.estados))
+        self.tabla = array("i", [SIN_TRANSICION]) * (len(self.estados) * len(self.simbolos))
+        self.extras: Dict[int, Tuple[Any, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.estados)
+
+    def __repr__(self) -> str:
+        return f"AFDDenso({self.nombre!r}, {len(self.estados)} estados, {len(self.simbolos)} símbolos)"
+
+    def agregar_transicion(
+        self, q: int, simbolo: str, r: int, escribe: Any = EPSILON_MT, mueve: Any = MOVER_DERECHA
+    ) -> None:
+        """Define δ(q, simbolo) = r (q y r son índices de estado)."""
+        columna = self.columnas.get(simbolo)
+        if columna is None:
+            raise ValueError(f"El símbolo '{simbolo}' no está en el alfabeto del AFD.")
+        celda = q * len(self.simbolos) + columna
+        anterior = self.tabla[celda]
+        if anterior != SIN_TRANSICION and anterior != r:
+            raise ValueError(
+                f"El autómata no es determinista: el estado {self.estados[q]} tiene dos "
+                f"transiciones con '{simbolo}'."
+            )
+        self.tabla[celda] = r
+        if escribe != EPSILON_MT or mueve != MOVER_DERECHA:
+            self.extras[celda] = (escribe, mueve)
+        else:
+            self.extras.pop(celda, None)
+
+    def siguiente(self, q: int, columna: int) -> int:
+        """δ por índices: destino de q con el símbolo de la columna dada."""
+        return self.tabla[q * len(self.simbolos) + columna]
+
+    def delta(self, estado: Any, simbolo: str) -> Optional[Any]:
+        """δ por etiquetas: estado destino, o None si la transición no existe."""
+        q = self.indice.get(estado)
+        columna = self.columnas.get(simbolo)
+        if q is None or columna is None:
+            return None
+        r = self.siguiente(q, columna)
+        return None if r == SIN_TRANSICION else self.estados[r]
+
+    def transiciones(self) -> Iterator[Tuple[int, str, int]]:
+        """Entrega (q, a, r) por índices, en orden de estado y de símbolo."""
+        m = len(self.simbolos)
+        for celda, r in enumerate(self.tabla):
+            if r != SIN_TRANSICION:
+                yield celda // m, self.simbolos[celda % m], r
+
+    def estados_aceptacion(self) -> Set[Any]:
+        return {self.estados[q] for q, es_final in enumerate(self.aceptacion) if es_final}
+
+    @classmethod
+    def desde_spec(cls, spec: Dict[str, Any]) -> "AFDDenso":
+        """Construye el AFD denso a partir de la especificación del Proyecto 1."""
+        alfabeto = spec.get("alphabet")
+        simbolos = sorted(set(spec["lecturas"]) | set(alfabeto or ()))
+
+        # El inicial queda en 0; el resto, en orden de aparición
+        estados: Dict[Any, int] = {spec["start_state"]: 0}
+        for lista in (spec["estActua"], spec["estsigui"], spec["accept_states"]):
+            for q in lista:
+                if q not in estados:
+                    estados[q] = len(estados)
+
+        afd = cls(
+            estados,
+            simbolos,
+            inicial=0,
+            nombre=spec.get("nombre", "AFD"),
+            alfabeto=set(alfabeto) if alfabeto is not None else None,
+        )
+        escribe = spec.get("escribeC") or [EPSILON_MT] * len(spec["estActua"])
+        mueve = spec.get("mueveCab") or [MOVER_DERECHA] * len(spec["estActua"])
+        for q, a, w, r, d in zip(spec["estActua"], spec["lecturas"], escribe, spec["estsigui"], mueve):
+            afd.agregar_transicion(estados[q], a, estados[r], w, d)
+        for q in spec["accept_states"]:
+            afd.aceptacion[estados[q]] = 1
+        return afd
+
+    def a_spec(self) -> Dict[str, Any]:
+        """
+        Devuelve la especificación del Proyecto 1 (listas paralelas) con las
+        mismas etiquetas de estado y el mismo conjunto de transiciones,
+        ordenadas por estado y símbolo.
+        """
+        spec: Dict[str, Any] = {
+            "nombre": self.nombre,
+            "start_state": self.estados[self.inicial],
+            "accept_states": self.estados_aceptacion(),
+            "alphabet": set(self.alfabeto) if self.alfabeto is not None else set(self.simbolos),
+            "estActua": [],
+            "lecturas": [],
+            "escribeC": [],
+            "estsigui": [],
+            "mueveCab": [],
+        }
+        m = len(self.simbolos)
+        for q, a, r in self.transiciones():
+            escribe, mueve = self.extras.get(q * m + self.columnas[a], (EPSILON_MT, MOVER_DERECHA))
+            spec["estActua"].append(self.estados[q])
+            spec["lecturas"].append(a)
+            spec["escribeC"].append(escribe)
+            spec["estsigui"].append(self.estados[r])
+            spec["mueveCab"].append(mueve)
+        return spec
+
+
+def como_denso(afd: Union[AFDDenso, Dict[str, Any]]) -> AFDDenso:
+    """Acepta un AFDDenso o una especificación y devuelve siempre un AFDDenso."""
+    return afd if isinstance(afd, AFDDenso) else AFDDenso.desde_spec(afd)
+
+
+def como_spec(afd: Union[AFDDenso, Dict[str, Any]]) -> Dict[str, Any]:
+    """Acepta un AFDDenso o una especificación y devuelve siempre la especificación."""
+    return afd.a_spec() if isinstance(afd, AFDDenso) else afd
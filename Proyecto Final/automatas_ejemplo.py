@@ -1,5 +1,6 @@
-from typing import Dict, Any, Tuple, List, Set
+from typing import Dict, Any, Tuple, List, Set, Union
 from utilidades_generales import EPSILON_MT, MOVER_DERECHA, MOVER_IZQUIERDA, MOVER_SIN_CAMBIO
+from automata_denso import AFDDenso
 
 
 class DefinicionesAutomatas:
@@ -8,7 +9,16 @@ class DefinicionesAutomatas:
     """
 
     @staticmethod
-    def convertir_delta_a_listas(delta: Dict[Tuple[int, str], Tuple[str, int, int]]):
+    def convertir_delta_a_listas(delta: Union[Dict[Tuple[int, str], Tuple[str, int, int]], AFDDenso]):
+        """
+        Convierte δ en las listas paralelas de la especificación.
+        Acepta el diccionario (estado, leído) -> (escribe, siguiente, mueve)
+        o directamente un AFDDenso.
+        """
+        if isinstance(delta, AFDDenso):
+            spec = delta.a_spec()
+            return spec["estActua"], spec["lecturas"], spec["escribeC"], spec["estsigui"], spec["mueveCab"]
+
         estados_actuales: List[int] = []
         lecturas: List[str] = []
         escribe: List[str] = []
@@ -72,8 +82,12 @@ class DefinicionesAutomatas:
         }
 
     @staticmethod
-    def obtener_lista() -> List[Dict[str, Any]]:
-        return [
+    def obtener_lista(denso: bool = False) -> List[Union[Dict[str, Any], AFDDenso]]:
+        """Autómatas de ejemplo; con denso=True se entregan como AFDDenso."""
+        lista = [
             DefinicionesAutomatas.automata_l1(),
             DefinicionesAutomatas.automata_l2(),
         ]
+        if denso:
+            return [AFDDenso.desde_spec(spec) for spec in lista]
+        return lista
@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from estructuras_gramatica import leer_gramatica_desde_texto
+from clasificador_chomsky import ClasificadorChomsky
+
+
+def clasificar_texto(identificador: str, texto: str) -> Dict[str, Any]:
+    """
+    Lee y clasifica una sola gramática.
+    Nunca lanza excepciones: los errores quedan en el campo "error".
+    """
+    try:
+        producciones = leer_gramatica_desde_texto(texto)
+        tipo, descripcion, justificacion = ClasificadorChomsky(producciones).clasificar()
+    except Exception as e:
+        return {
+            "id": identificador,
+            "tipo": None,
+            "descripcion": None,
+            "justificacion": [],
+            "error": f"{type(e).__name__}: {e}",
+        }
+
+    return {
+        "id": identificador,
+        "tipo": tipo,
+        "descripcion": descripcion,
+        "justificacion": justificacion,
+        "error": None,
+    }
+
+
+def iterar_directorio(ruta: str, extension: str = ".txt") -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Recorre un directorio (en orden alfabético) y entrega
+    (nombre_archivo, texto, None) por cada archivo con la extensión indicada.
+    Los archivos que no se pueden leer o no son UTF-8 válido se entregan
+    como (nombre_archivo, None, error) para que el lote siga.
+    """
+    for nombre in sorted(os.listdir(ruta)):
+        ruta_archivo = os.path.join(ruta, nombre)
+        if not os.path.isfile(ruta_archivo) or not nombre.endswith(extension):
+            continue
+        try:
+            with open(ruta_archivo, encoding="utf-8") as f:
+                texto = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            yield nombre, None, f"{type(e).__name__}: {e}"
+            continue
+        yield nombre, texto, None
+
+
+def iterar_jsonl(flujo: Iterable[Union[bytes, str]]) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """
+    Lee un flujo JSONL donde cada línea es:
+        {"id": "...", "gramatica": "S -> a S b | a b"}
+    Si falta "id" se usa el número de línea.
+    Las líneas mal formadas se entregan con texto None para que
+    el error quede registrado sin detener el lote.
+    El flujo debe abrirse en modo binario (ver main): así cada línea se
+    decodifica por separado y una que no sea UTF-8 válido también queda
+    como error en lugar de cortar la lectura.
+    """
+    for numero, linea in enumerate(flujo, start=1):
+        if isinstance(linea, bytes):
+            try:
+                linea = linea.decode("utf-8")
+            except UnicodeDecodeError as e:
+                yield str(numero), None, f"Línea {numero}: no es UTF-8 válido ({e})"
+                continue
+        if not linea.strip():
+            continue
+        try:
+            registro = json.loads(linea)
+            identificador = str(registro.get("id", numero))
+            texto = registro["gramatica"]
+        except Exception as e:
+            yield str(numero), None, f"Línea {numero}: JSON inválido ({e})"
+            continue
+        yield identificador, texto, None
+
+
+def _clasificar_entrada(entrada: Tuple[str, Optional[str], Optional[str]]) -> Dict[str, Any]:
+    identificador, texto, error_lectura = entrada
+    if error_lectura is not None:
+        return {
+            "id": identificador,
+            "tipo": None,
+            "descripcion": None,
+            "justificacion": [],
+            "error": error_lectura,
+        }
+    return clasificar_texto(identificador, texto)
+
+
+def clasificar_en_lotes(
+    entradas: Iterable[Tuple],
+    procesos: Optional[int] = None,
+    max_en_vuelo: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Clasifica muchas gramáticas en paralelo con un ProcessPoolExecutor.
+
+    - entradas: tuplas (id, texto) o (id, texto, error_lectura).
+    - procesos: número de procesos (por defecto, os.cpu_count()).
+    - max_en_vuelo: máximo de tareas enviadas y aún sin leer; evita
+      cargar todo el lote en memoria (por defecto, 4 * procesos).
+
+    Los resultados se entregan en el mismo orden de las entradas.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    max_en_vuelo = max_en_vuelo or 4 * procesos
+
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = deque()
+        for entrada in entradas:
+            if len(entrada) == 2:
+                entrada = (entrada[0], entrada[1], None)
+            pendientes.append(ejecutor.submit(_clasificar_entrada, entrada))
+            if len(pendientes) >= max_en_vuelo:
+                yield pendientes.popleft().result()
+
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Clasifica gramáticas en lote según la jerarquía de Chomsky (salida JSONL)."
+    )
+    parser.add_argument(
+        "entrada",
+        help="Directorio con archivos de gramática, archivo JSONL, o '-' para leer JSONL de stdin.",
+    )
+    parser.add_argument("-o", "--salida", help="Archivo JSONL de salida (por defecto, stdout).")
+    parser.add_argument("-p", "--procesos", type=int, default=None, help="Número de procesos.")
+    parser.add_argument(
+        "--en-vuelo", type=int, default=None, help="Máximo de gramáticas en proceso a la vez."
+    )
+    parser.add_argument(
+        "--extension", default=".txt", help="Extensión de los archivos al leer un directorio."
+    )
+    args = parser.parse_args(argv)
+
+    if args.entrada == "-":
+        entradas = iterar_jsonl(sys.stdin.buffer)
+        archivo_entrada = None
+    elif os.path.isdir(args.entrada):
+        entradas = iterar_directorio(args.entrada, args.extension)
+        archivo_entrada = None
+    else:
+        archivo_entrada = open(args.entrada, "rb")
+        entradas = iterar_jsonl(archivo_entrada)
+
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else sys.stdout
+    try:
+        for resultado in clasificar_en_lotes(entradas, args.procesos, args.en_vuelo):
+            salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+            salida.flush()
+    finally:
+        if archivo_entrada is not None:
+            archivo_entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
-from typing import List, Tuple
-from estructuras_gramatica import Produccion
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from estructuras_gramatica import Produccion, TablaSimbolos, leer_linea_gramatica
 
 
 class ClasificadorChomsky:
@@ -11,11 +12,28 @@ class ClasificadorChomsky:
       - 1: Sensible al Contexto
       - 0: Recursivamente Enumerable
     Devuelve SIEMPRE el tipo más restrictivo que cumple (3 > 2 > 1 > 0).
+
+    Acepta una lista de producciones o un iterador (por ejemplo, el de
+    iterar_producciones). Con un iterador las producciones se recorren
+    una sola vez: solo se puede llamar una vez a clasificar() o a
+    veredicto(), y los métodos _es_tipo_* necesitan una lista.
+
+    El símbolo inicial se reconoce por su id: las producciones deben
+    venir de una misma TablaSimbolos (como las de iterar_producciones o
+    leer_gramatica_desde_texto).
     """
 
-    def __init__(self, producciones: List[Produccion]):
+    def __init__(self, producciones: Iterable[Produccion]):
+        self._una_pasada = not isinstance(producciones, Sequence)
+        if self._una_pasada:
+            iterador = iter(producciones)
+            primera = next(iterador, None)
+            producciones = chain([primera], iterador) if primera is not None else iter(())
+        else:
+            primera = producciones[0] if producciones else None
         self.producciones = producciones
-        self.simbolo_inicial = producciones[0].alpha[0].valor if producciones else ""
+        self.simbolo_inicial = primera.alpha[0].valor if primera is not None else ""
+        self.id_inicial = primera.ids_alpha[0] if primera is not None else -1
 
     def _es_tipo_3(self) -> Tuple[bool, List[str]]:
         """
@@ -85,7 +103,7 @@ class ClasificadorChomsky:
         for p in self.producciones:
             if len(p.beta) == 0:
                 # Producción a epsilon
-                if len(p.alpha) == 1 and p.alpha[0].valor == self.simbolo_inicial:
+                if p.ids_alpha == (self.id_inicial,):
                     acepta_epsilon = True
                 else:
                     violaciones.append(
@@ -103,35 +121,348 @@ class ClasificadorChomsky:
         if acepta_epsilon:
             # Si S -> ε existe, S no puede aparecer en el lado derecho
             for p in self.producciones:
-                for s in p.beta:
-                    if s.valor == self.simbolo_inicial:
-                        violaciones.append(
-                            f"Regla '{p}': no es Tipo 1, S -> ε existe pero S aparece en el lado derecho."
-                        )
-                        es_sensible_contexto = False
-                        break
+                if self.id_inicial in p.ids_beta:
+                    violaciones.append(
+                        f"Regla '{p}': no es Tipo 1, S -> ε existe pero S aparece en el lado derecho."
+                    )
+                    es_sensible_contexto = False
 
         return es_sensible_contexto, violaciones
 
-    def clasificar(self) -> Tuple[int, str, List[str]]:
+    def _recorrer(self, registrar: bool, salida_temprana: bool) -> "_ResumenPasada":
+        """
+        Recorre las producciones UNA sola vez y evalúa a la vez los
+        predicados de Tipo 3, 2 y 1. No construye texto: si registrar=True
+        guarda solo referencias a las reglas que violan cada tipo, para
+        armar la justificación después (y solo si se pide).
+        Con salida_temprana=True se detiene en cuanto el resultado es
+        seguro Tipo 0 (violó Tipo 2 y Tipo 1).
+        """
+        if self.producciones is None:
+            raise RuntimeError("Las producciones venían de un iterador y ya fueron recorridas.")
+        r = _ResumenPasada()
+        inicial = (self.id_inicial,)
+        id_inicial = self.id_inicial
+
+        for p in self.producciones:
+            alpha, beta = p.alpha, p.beta
+            n_alpha, n_beta = len(alpha), len(beta)
+
+            # Tipo 3 y Tipo 2
+            if n_alpha != 1 or alpha[0].es_terminal:
+                r.viola_t3 = r.viola_t2 = True
+                if registrar:
+                    r.violaciones_t3.append((p, _LADO_IZQUIERDO))
+                    r.violaciones_t2.append(p)
+            elif not (
+                n_beta == 0
+                or (n_beta == 1 and beta[0].es_terminal)
+                or (n_beta == 2 and beta[0].es_terminal and not beta[1].es_terminal)
+            ):
+                r.viola_t3 = True
+                if registrar:
+                    r.violaciones_t3.append((p, _LADO_DERECHO))
+
+            # Tipo 1
+            if n_beta == 0:
+                if p.ids_alpha == inicial:
+                    r.acepta_epsilon = True
+                else:
+                    r.viola_t1_local = True
+                    if registrar:
+                        r.violaciones_t1.append((p, _EPSILON))
+            elif n_alpha > n_beta:
+                r.viola_t1_local = True
+                if registrar:
+                    r.violaciones_t1.append((p, _ACORTA))
+
+            if id_inicial in p.ids_beta:
+                r.inicial_a_la_derecha = True
+                if registrar:
+                    r.con_inicial_a_la_derecha.append(p)
+
+            if salida_temprana and r.viola_t2 and r.viola_t1:
+                break
+
+        if self._una_pasada:
+            self.producciones = None
+        return r
+
+    def veredicto(self) -> int:
+        """
+        Modo "solo veredicto": devuelve únicamente el número de tipo,
+        sin construir justificación y cortando el recorrido en cuanto
+        el resultado es seguro.
+        """
+        return self._recorrer(registrar=False, salida_temprana=True).tipo
+
+    def clasificar(self, justificar: bool = True) -> Tuple[int, str, List[str]]:
         """
         Devuelve (tipo_numero, texto_descriptivo, lista_justificacion).
         Escoge el tipo más restrictivo que sí se cumple.
+        Con justificar=False la lista de justificación se devuelve vacía
+        y no se genera ningún texto.
         """
-        es_t3, just_t3 = self._es_tipo_3()
-        es_t2, just_t2 = self._es_tipo_2()
-        es_t1, just_t1 = self._es_tipo_1()
+        resumen = self._recorrer(registrar=justificar, salida_temprana=False)
+        tipo = resumen.tipo
+        justificacion = resumen.justificacion(tipo) if justificar else []
+        return tipo, _DESCRIPCIONES[tipo], justificacion
+
+
+_LADO_IZQUIERDO = 0
+_LADO_DERECHO = 1
+_EPSILON = 2
+_ACORTA = 3
+
+_DESCRIPCIONES = {
+    3: "Tipo 3 (Regular)",
+    2: "Tipo 2 (Libre de Contexto)",
+    1: "Tipo 1 (Sensible al Contexto)",
+    0: "Tipo 0 (Recursivamente Enumerable)",
+}
+
+
+class _ResumenPasada:
+    """Resultado de la pasada única de ClasificadorChomsky._recorrer."""
+
+    __slots__ = (
+        "viola_t3",
+        "viola_t2",
+        "viola_t1_local",
+        "acepta_epsilon",
+        "inicial_a_la_derecha",
+        "violaciones_t3",
+        "violaciones_t2",
+        "violaciones_t1",
+        "con_inicial_a_la_derecha",
+    )
+
+    def __init__(self):
+        self.viola_t3 = False
+        self.viola_t2 = False
+        self.viola_t1_local = False
+        self.acepta_epsilon = False
+        self.inicial_a_la_derecha = False
+        self.violaciones_t3: List[Tuple[Produccion, int]] = []
+        self.violaciones_t2: List[Produccion] = []
+        self.violaciones_t1: List[Tuple[Produccion, int]] = []
+        self.con_inicial_a_la_derecha: List[Produccion] = []
+
+    @property
+    def viola_t1(self) -> bool:
+        # Si S -> ε existe, S no puede aparecer en ningún lado derecho
+        return self.viola_t1_local or (self.acepta_epsilon and self.inicial_a_la_derecha)
+
+    @property
+    def tipo(self) -> int:
+        if not self.viola_t3:
+            return 3
+        if not self.viola_t2:
+            return 2
+        if not self.viola_t1:
+            return 1
+        return 0
 
-        if es_t3:
-            return 3, "Tipo 3 (Regular)", just_t3
+    def _textos_t3(self) -> List[str]:
+        return [
+            f"Regla '{p}': no es Tipo 3, el lado izquierdo no es un solo No-Terminal."
+            if motivo == _LADO_IZQUIERDO
+            else f"Regla '{p}': no es Tipo 3, lado derecho no cumple 'a', 'aB' o ε."
+            for p, motivo in self.violaciones_t3
+        ]
 
-        if es_t2:
+    def _textos_t2(self) -> List[str]:
+        return [
+            f"Regla '{p}': no es Tipo 2, el lado izquierdo no es un solo No-Terminal."
+            for p in self.violaciones_t2
+        ]
+
+    def _textos_t1(self) -> List[str]:
+        textos = [
+            f"Regla '{p}': no es Tipo 1, producción a ε no permitida excepto S -> ε."
+            if motivo == _EPSILON
+            else f"Regla '{p}': no es Tipo 1, acorta la cadena (|alpha| > |beta|)."
+            for p, motivo in self.violaciones_t1
+        ]
+        if self.acepta_epsilon:
+            textos.extend(
+                f"Regla '{p}': no es Tipo 1, S -> ε existe pero S aparece en el lado derecho."
+                for p in self.con_inicial_a_la_derecha
+            )
+        return textos
+
+    def justificacion(self, tipo: int) -> List[str]:
+        """Arma los textos de justificación solo para el tipo obtenido."""
+        if tipo == 3:
+            return []
+        if tipo == 2:
             # Es Libre de Contexto pero no Regular
-            return 2, "Tipo 2 (Libre de Contexto)", just_t3 or just_t2
+            return self._textos_t3()
+        # Tipo 1 o 0: se explica por qué no es Tipo 2
+        return self._textos_t2() or self._textos_t1()
+
+
+class _AporteLinea:
+    """
+    Lo que una línea del texto aporta a los contadores de
+    ClasificadorIncremental. No depende del número de línea ni del
+    símbolo inicial, así que se puede reutilizar para líneas iguales.
+    """
+
+    __slots__ = ("producciones", "con_error", "viola_t3", "viola_t2", "acortan", "epsilon", "a_la_derecha")
+
+    def __init__(self, linea: str, tabla: TablaSimbolos):
+        self.producciones: List[Produccion] = []
+        self.con_error = False
+        self.viola_t3 = 0
+        self.viola_t2 = 0
+        self.acortan = 0
+        # Producciones a ε por id del lado izquierdo (None si tiene más de un símbolo)
+        self.epsilon: Dict[Optional[int], int] = {}
+        # Producciones en cuyo lado derecho aparece cada símbolo, por id
+        self.a_la_derecha: Dict[int, int] = {}
+
+        if not linea.strip():
+            return
+        try:
+            self.producciones = leer_linea_gramatica(linea, 0, tabla)
+        except ValueError:
+            # El mensaje (con el número de línea real) se arma al consultarlo
+            self.con_error = True
+            return
+
+        for p in self.producciones:
+            alpha, beta = p.alpha, p.beta
+            n_alpha, n_beta = len(alpha), len(beta)
+            if n_alpha != 1 or alpha[0].es_terminal:
+                self.viola_t3 += 1
+                self.viola_t2 += 1
+            elif not (
+                n_beta == 0
+                or (n_beta == 1 and beta[0].es_terminal)
+                or (n_beta == 2 and beta[0].es_terminal and not beta[1].es_terminal)
+            ):
+                self.viola_t3 += 1
+            if n_beta == 0:
+                lado = p.ids_alpha[0] if n_alpha == 1 else None
+                self.epsilon[lado] = self.epsilon.get(lado, 0) + 1
+            elif n_alpha > n_beta:
+                self.acortan += 1
+            for id_simbolo in set(p.ids_beta):
+                self.a_la_derecha[id_simbolo] = self.a_la_derecha.get(id_simbolo, 0) + 1
+
+
+class ClasificadorIncremental:
+    """
+    Clasificación en vivo de un texto que se edita.
+
+    Guarda, por contenido de línea, sus producciones y su aporte a los
+    contadores de Tipo 3 / 2 / 1 (ver _AporteLinea). En cada actualizar()
+    compara el texto nuevo con el anterior por prefijo y sufijo comunes:
+    solo las líneas del tramo cambiado restan o suman su aporte, y solo
+    las que nunca se habían visto se vuelven a leer. El veredicto sale de
+    los contadores sin recorrer las producciones.
+    """
+
+    def __init__(self):
+        self.tabla = TablaSimbolos()
+        self._cache: Dict[str, _AporteLinea] = {}
+        self._lineas: List[str] = []
+        self._aportes: List[_AporteLinea] = []
+        self._viola_t3 = 0
+        self._viola_t2 = 0
+        self._acortan = 0
+        self._con_error = 0
+        self._epsilon_total = 0
+        self._epsilon: Dict[Optional[int], int] = {}
+        self._a_la_derecha: Dict[int, int] = {}
+
+    def _aporte(self, linea: str) -> _AporteLinea:
+        aporte = self._cache.get(linea)
+        if aporte is None:
+            aporte = self._cache[linea] = _AporteLinea(linea, self.tabla)
+        return aporte
+
+    def _sumar(self, aporte: _AporteLinea, signo: int) -> None:
+        self._viola_t3 += signo * aporte.viola_t3
+        self._viola_t2 += signo * aporte.viola_t2
+        self._acortan += signo * aporte.acortan
+        self._con_error += signo * aporte.con_error
+        for lado, n in aporte.epsilon.items():
+            self._epsilon_total += signo * n
+            self._epsilon[lado] = self._epsilon.get(lado, 0) + signo * n
+        for id_simbolo, n in aporte.a_la_derecha.items():
+            self._a_la_derecha[id_simbolo] = self._a_la_derecha.get(id_simbolo, 0) + signo * n
+
+    def actualizar(self, texto: str) -> int:
+        """Pasa al texto nuevo; devuelve cuántas líneas del tramo cambiado se procesaron."""
+        nuevas = texto.splitlines()
+        viejas = self._lineas
+        limite = min(len(nuevas), len(viejas))
+        inicio = 0
+        while inicio < limite and nuevas[inicio] == viejas[inicio]:
+            inicio += 1
+        fin_viejas, fin_nuevas = len(viejas), len(nuevas)
+        while fin_viejas > inicio and fin_nuevas > inicio and viejas[fin_viejas - 1] == nuevas[fin_nuevas - 1]:
+            fin_viejas -= 1
+            fin_nuevas -= 1
+
+        for aporte in self._aportes[inicio:fin_viejas]:
+            self._sumar(aporte, -1)
+        insertados = [self._aporte(linea) for linea in nuevas[inicio:fin_nuevas]]
+        for aporte in insertados:
+            self._sumar(aporte, +1)
+        self._aportes[inicio:fin_viejas] = insertados
+        self._lineas = nuevas
+
+        # Líneas que ya no están en el texto: se olvidan cuando la caché crece demasiado
+        if len(self._cache) > 2 * len(nuevas) + 1024:
+            vigentes = set(nuevas)
+            self._cache = {linea: a for linea, a in self._cache.items() if linea in vigentes}
+        return fin_nuevas - inicio
+
+    def _primera_produccion(self) -> Optional[Produccion]:
+        for aporte in self._aportes:
+            if aporte.producciones:
+                return aporte.producciones[0]
+        return None
+
+    def simbolo_inicial(self) -> str:
+        primera = self._primera_produccion()
+        return primera.alpha[0].valor if primera is not None else ""
+
+    def error(self) -> Optional[str]:
+        """Mensaje del primer error (como leer_gramatica_desde_texto), o None."""
+        if self._con_error:
+            for numero, (linea, aporte) in enumerate(zip(self._lineas, self._aportes), start=1):
+                if aporte.con_error:
+                    try:
+                        leer_linea_gramatica(linea, numero)
+                    except ValueError as e:
+                        return str(e)
+        if not any(aporte.producciones for aporte in self._aportes):
+            return "La gramática está vacía o solo contiene comentarios/espacios."
+        return None
+
+    def producciones(self) -> List[Produccion]:
+        return [p for aporte in self._aportes for p in aporte.producciones]
+
+    def veredicto(self) -> int:
+        """Tipo (3, 2, 1 o 0) a partir de los contadores, como ClasificadorChomsky.veredicto()."""
+        if not self._viola_t3:
+            return 3
+        if not self._viola_t2:
+            return 2
+        primera = self._primera_produccion()
+        inicial = primera.ids_alpha[0] if primera is not None else -1
+        epsilon_inicial = self._epsilon.get(inicial, 0)
+        viola_t1 = (
+            self._acortan > 0
+            or self._epsilon_total > epsilon_inicial
+            or (epsilon_inicial > 0 and self._a_la_derecha.get(inicial, 0) > 0)
+        )
+        return 0 if viola_t1 else 1
 
-        if es_t1:
-            # Es Sensible al Contexto pero no Tipo 2
-            return 1, "Tipo 1 (Sensible al Contexto)", just_t2 or just_t1
+    def descripcion(self) -> str:
+        return _DESCRIPCIONES[self.veredicto()]
 
-        # Si no cumple Tipo 1, es Tipo 0
-        return 0, "Tipo 0 (Recursivamente Enumerable)", just_t2 or just_t1
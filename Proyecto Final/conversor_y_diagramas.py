@@ -1,11 +1,39 @@
-from typing import Dict, Any, Set, List, Optional
+from collections import deque
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import webbrowser
+from pathlib import Path
+from typing import Dict, Any, Iterable, Set, List, Optional, Tuple, Union
 import tkinter as tk
 
-import graphviz
 from PIL import Image, ImageTk
 
+try:
+    import graphviz
+except ImportError:
+    # Sin el paquete graphviz los diagramas se dibujan con diagramas_svg
+    graphviz = None
+
 from utilidades_generales import EPSILON_MT, MOVER_DERECHA, VentanaCentrada, Alerta, NodoArbol
-from estructuras_gramatica import Produccion, Simbolo
+from estructuras_gramatica import Produccion, Simbolo, TablaSimbolos
+from automata_denso import AFDDenso, SIN_TRANSICION, como_denso, como_spec
+from tareas_segundo_plano import TareaCancelada, TokenCancelacion, verificador
+from diagramas_svg import aristas_agrupadas, estados_del_diagrama, guardar_svg_automata
+from expresiones_regulares import (
+    NodoRegex,
+    SIMBOLO,
+    EPSILON,
+    UNION,
+    CONCAT,
+    ESTRELLA,
+    MAS,
+    afd_a_regex_por_eliminacion,
+    parsear_regex,
+)
 
 
 # ======================
@@ -13,13 +41,13 @@ from estructuras_gramatica import Produccion, Simbolo
 # ======================
 
 class EstadoNFA:
-    """Estado de un autómata no determinista (NFA)."""
+    """
+    Estado de un autómata no determinista (NFA).
+    Los ids son únicos dentro de su autómata (ver AutomataNFA.nuevo_estado).
+    """
 
-    _contador_id = 0
-
-    def __init__(self):
-        self.id = EstadoNFA._contador_id
-        EstadoNFA._contador_id += 1
+    def __init__(self, id_estado: int):
+        self.id = id_estado
 
     def __repr__(self):
         return f"q{self.id}"
@@ -39,6 +67,13 @@ class AutomataNFA:
         self.estado_inicial: Optional[EstadoNFA] = None
         self.estado_final: Optional[EstadoNFA] = None
         self.estados: Set[EstadoNFA] = set()
+        # Contador propio: dos conversiones en hilos distintos no comparten ids
+        self._siguiente_id = 0
+
+    def nuevo_estado(self) -> EstadoNFA:
+        estado = EstadoNFA(self._siguiente_id)
+        self._siguiente_id += 1
+        return estado
 
     def agregar_transicion(self, desde: EstadoNFA, simbolo: str, hacia: EstadoNFA):
         self.estados.add(desde)
@@ -50,70 +85,69 @@ class AutomataNFA:
 #   AFD ↔ Gramática Regular
 # ==========================
 
-def convertir_afd_a_gramatica(afd: Dict[str, Any]) -> List[Produccion]:
+def convertir_afd_a_gramatica(afd: Union[Dict[str, Any], AFDDenso]) -> List[Produccion]:
     """
-    Convierte una especificación de AFD
+    Convierte una especificación de AFD (o un AFDDenso)
     en una gramática regular equivalente.
     """
+    afd = como_spec(afd)
     producciones: List[Produccion] = []
+    tabla = TablaSimbolos()
     mapeo_estados: Dict[int, Simbolo] = {}
     todos_estados = set(afd["estActua"]) | set(afd["estsigui"]) | {afd["start_state"]}
 
     for estado in todos_estados:
-        mapeo_estados[estado] = Simbolo(f"Q{estado}", es_terminal=False)
+        mapeo_estados[estado] = tabla.interna(f"Q{estado}", es_terminal=False)
 
     for q_i, a, q_j in zip(afd["estActua"], afd["lecturas"], afd["estsigui"]):
         no_terminal_i = mapeo_estados[q_i]
         no_terminal_j = mapeo_estados[q_j]
-        terminal_a = Simbolo(a, es_terminal=True)
+        terminal_a = tabla.interna(a, es_terminal=True)
         producciones.append(
-            Produccion(lado_izquierdo=[no_terminal_i], lado_derecho=[terminal_a, no_terminal_j])
+            tabla.produccion([no_terminal_i], [terminal_a, no_terminal_j])
         )
 
     for q_f in afd["accept_states"]:
         if q_f in mapeo_estados:
             no_terminal_f = mapeo_estados[q_f]
             producciones.append(
-                Produccion(lado_izquierdo=[no_terminal_f], lado_derecho=[])
+                tabla.produccion([no_terminal_f], [])
             )
 
     return producciones
 
 
-def convertir_gramatica_a_nfa(gramatica: List[Produccion]) -> AutomataNFA:
+def convertir_gramatica_a_nfa(gramatica: Iterable[Produccion]) -> AutomataNFA:
     """
     Convierte una gramática regular de Tipo 3 en un NFA.
     Asume que todas las producciones son del tipo:
       A -> a B
       A -> a
       A -> ε
+    Recorre las producciones una sola vez, así que acepta un iterador
+    (por ejemplo, el de iterar_producciones).
     """
     nfa = AutomataNFA()
     mapeo_estados: Dict[str, EstadoNFA] = {}
 
-    EstadoNFA._contador_id = 0
-    estado_final_unico = EstadoNFA()
+    estado_final_unico = nfa.nuevo_estado()
     nfa.estado_final = estado_final_unico
 
-    # Crear estados a partir de los no-terminales
-    todos_no_terminales = set()
+    def estado_de(nombre_nt: str) -> EstadoNFA:
+        estado = mapeo_estados.get(nombre_nt)
+        if estado is None:
+            estado = mapeo_estados[nombre_nt] = nfa.nuevo_estado()
+        return estado
+
+    # Crear estados (a partir de los no-terminales) y transiciones
     for p in gramatica:
-        todos_no_terminales.add(p.alpha[0].valor)
+        estado_A = estado_de(p.alpha[0].valor)
+        if nfa.estado_inicial is None:
+            nfa.estado_inicial = estado_A
         for s in p.beta:
             if not s.es_terminal:
-                todos_no_terminales.add(s.valor)
+                estado_de(s.valor)
 
-    for nombre_nt in todos_no_terminales:
-        mapeo_estados[nombre_nt] = EstadoNFA()
-
-    if not gramatica:
-        return nfa
-
-    nfa.estado_inicial = mapeo_estados[gramatica[0].alpha[0].valor]
-
-    # Crear transiciones
-    for p in gramatica:
-        estado_A = mapeo_estados[p.alpha[0].valor]
         if len(p.beta) == 2:  # A -> aB
             simbolo, nt_B = p.beta[0].valor, p.beta[1].valor
             estado_B = mapeo_estados[nt_B]
@@ -127,61 +161,112 @@ def convertir_gramatica_a_nfa(gramatica: List[Produccion]) -> AutomataNFA:
     return nfa
 
 
-def _cerradura_epsilon(estados: Set[EstadoNFA], transiciones: Dict) -> Set[EstadoNFA]:
-    pila = list(estados)
-    clausura = set(estados)
-
-    while pila:
-        estado_actual = pila.pop()
-        if estado_actual in transiciones and "ε" in transiciones[estado_actual]:
-            for siguiente in transiciones[estado_actual]["ε"]:
-                if siguiente not in clausura:
-                    clausura.add(siguiente)
-                    pila.append(siguiente)
-
-    return frozenset(clausura)
+def _iterar_bits(mascara: int):
+    """Entrega los índices de los bits encendidos de una máscara."""
+    while mascara:
+        bit = mascara & -mascara
+        yield bit.bit_length() - 1
+        mascara ^= bit
 
 
-def convertir_nfa_a_afd(nfa: AutomataNFA, alfabeto: Set[str]) -> Dict[str, Any]:
+def _cerraduras_epsilon_bits(nfa: AutomataNFA, indices: Dict[EstadoNFA, int]) -> List[int]:
+    """
+    Precalcula la cerradura-ε de cada estado del NFA como máscara de bits
+    (bit i encendido = estado con índice i en la cerradura).
+    """
+    sucesores_eps: List[List[int]] = [[] for _ in indices]
+    for estado, trans in nfa.transiciones.items():
+        for siguiente in trans.get("ε", ()):
+            sucesores_eps[indices[estado]].append(indices[siguiente])
+
+    cerraduras: List[int] = []
+    for i in range(len(indices)):
+        mascara = 1 << i
+        pila = [i]
+        while pila:
+            for j in sucesores_eps[pila.pop()]:
+                if not (mascara >> j) & 1:
+                    mascara |= 1 << j
+                    pila.append(j)
+        cerraduras.append(mascara)
+    return cerraduras
+
+
+def convertir_nfa_a_afd(
+    nfa: AutomataNFA, alfabeto: Set[str], token: Optional[TokenCancelacion] = None
+) -> Dict[str, Any]:
     """
     Convierte un NFA (con transiciones ε) en un AFD
     compatible con el formato del Proyecto 1.
+
+    Construcción de subconjuntos con máscaras de bits: los estados del NFA
+    se numeran 0..n-1, cada estado del AFD es un entero cuyos bits son los
+    estados del NFA que contiene, las cerraduras-ε de cada estado se
+    precalculan y la cerradura de cada conjunto "mover" se memoriza.
+    Con un token, la construcción se puede cancelar entre estado y estado.
     """
+    verificar = verificador(token)
+    # Si se canceló mientras se armaba el NFA, no se empieza la construcción
+    verificar()
     if nfa.estado_inicial is None:
         raise ValueError("El NFA no tiene estado inicial definido.")
 
-    q0_afd = _cerradura_epsilon({nfa.estado_inicial}, nfa.transiciones)
-    estados_afd = {q0_afd}
-    cola = [q0_afd]
-    transiciones_afd: Dict[Any, Dict[str, Any]] = {}
-    estados_finales_afd: Set[Any] = set()
-    nombres_estados: Dict[Any, int] = {q0_afd: 0}
-    contador_id = 1
+    todos = set(nfa.estados) | {nfa.estado_inicial}
+    if nfa.estado_final is not None:
+        todos.add(nfa.estado_final)
+    indices = {estado: i for i, estado in enumerate(sorted(todos, key=lambda e: e.id))}
+    cerraduras = _cerraduras_epsilon_bits(nfa, indices)
+    bit_final = 1 << indices[nfa.estado_final] if nfa.estado_final is not None else 0
+
+    # Por símbolo: destinos directos de cada estado y máscara de estados con salida
+    simbolos = sorted(alfabeto)
+    destinos: Dict[str, List[int]] = {a: [0] * len(indices) for a in simbolos}
+    con_salida: Dict[str, int] = {a: 0 for a in simbolos}
+    for estado, trans in nfa.transiciones.items():
+        i = indices[estado]
+        for a in simbolos:
+            if a in trans:
+                for siguiente in trans[a]:
+                    destinos[a][i] |= 1 << indices[siguiente]
+                con_salida[a] |= 1 << i
+
+    memo_cerradura: Dict[int, int] = {}
+
+    def cerradura(mascara: int) -> int:
+        resultado = memo_cerradura.get(mascara)
+        if resultado is None:
+            resultado = 0
+            for i in _iterar_bits(mascara):
+                resultado |= cerraduras[i]
+            memo_cerradura[mascara] = resultado
+        return resultado
+
+    q0_afd = cerraduras[indices[nfa.estado_inicial]]
+    nombres_estados: Dict[int, int] = {q0_afd: 0}
+    cola = deque([q0_afd])
+    transiciones_afd: Dict[int, Dict[str, int]] = {}
+    estados_finales_afd: Set[int] = set()
 
     while cola:
-        conjunto_actual = cola.pop(0)
-        if nfa.estado_final in conjunto_actual:
+        verificar()
+        conjunto_actual = cola.popleft()
+        if conjunto_actual & bit_final:
             estados_finales_afd.add(conjunto_actual)
 
         transiciones_afd[conjunto_actual] = {}
-        for simbolo in alfabeto:
-            siguiente_conjunto = set()
-            for estado_nfa in conjunto_actual:
-                if (
-                    estado_nfa in nfa.transiciones
-                    and simbolo in nfa.transiciones[estado_nfa]
-                ):
-                    siguiente_conjunto.update(nfa.transiciones[estado_nfa][simbolo])
-
-            if not siguiente_conjunto:
+        for simbolo in simbolos:
+            activos = conjunto_actual & con_salida[simbolo]
+            if not activos:
                 continue
-
-            clausura_siguiente = _cerradura_epsilon(siguiente_conjunto, nfa.transiciones)
-            if clausura_siguiente not in estados_afd:
-                estados_afd.add(clausura_siguiente)
+            dest = destinos[simbolo]
+            mover = 0
+            for i in _iterar_bits(activos):
+                mover |= dest[i]
+
+            clausura_siguiente = cerradura(mover)
+            if clausura_siguiente not in nombres_estados:
+                nombres_estados[clausura_siguiente] = len(nombres_estados)
                 cola.append(clausura_siguiente)
-                nombres_estados[clausura_siguiente] = contador_id
-                contador_id += 1
 
             transiciones_afd[conjunto_actual][simbolo] = clausura_siguiente
 
@@ -208,171 +293,202 @@ def convertir_nfa_a_afd(nfa: AutomataNFA, alfabeto: Set[str]) -> Dict[str, Any]:
     return spec_final
 
 
-# ======================
-#   Regex
-# ======================
+# ===========================
+#   Minimización de AFD
+# ===========================
 
-def _es_simbolo_regex(c: str) -> bool:
-    return c not in {"(", ")", "|", "*", "."}
+def contar_estados_afd(afd: Union[Dict[str, Any], AFDDenso]) -> int:
+    """Número de estados que aparecen en una especificación de AFD."""
+    if isinstance(afd, AFDDenso):
+        return len(afd)
+    return len(
+        set(afd["estActua"]) | set(afd["estsigui"]) | {afd["start_state"]} | set(afd["accept_states"])
+    )
 
 
-def _insertar_concatenacion_implicita(regex: str) -> str:
+def minimizar_afd(afd: Union[Dict[str, Any], AFDDenso]) -> Union[Dict[str, Any], AFDDenso]:
     """
-    Inserta el operador '.' para concatenación donde sea necesario.
-    Ejemplo: 'a(b|c)*' -> 'a.(b|c)*'
+    Minimiza un AFD con el algoritmo de Hopcroft (O(n log n)).
+    - Descarta los estados inalcanzables desde el inicial.
+    - Completa el AFD con un estado sumidero implícito para las
+      transiciones faltantes; ese estado (y todo lo equivalente a él)
+      no aparece en el resultado, que sigue siendo un AFD parcial.
+    Devuelve un autómata nuevo del mismo tipo que el recibido (especificación
+    o AFDDenso), con los estados renumerados en orden BFS desde el inicial
+    (que queda en 0).
     """
-    regex = regex.replace(" ", "")
-    if not regex:
-        return ""
-
-    resultado = []
-    n = len(regex)
+    densa = como_denso(afd)
+    simbolos = densa.simbolos
+    m = len(simbolos)
+    tabla = densa.tabla
+
+    # Estados alcanzables, numerados 0..n-1 (el sumidero es n)
+    indices = {densa.inicial: 0}
+    alcanzables = [densa.inicial]
+    cola = deque([densa.inicial])
+    while cola:
+        q = cola.popleft()
+        for r in tabla[q * m:(q + 1) * m]:
+            if r != SIN_TRANSICION and r not in indices:
+                indices[r] = len(alcanzables)
+                alcanzables.append(r)
+                cola.append(r)
+
+    n = len(alcanzables)
+    sumidero = n
+    total = n + 1
+
+    # Transiciones inversas: inversas[c][q] = estados que llegan a q leyendo c
+    inversas: List[List[List[int]]] = [[[] for _ in range(total)] for _ in simbolos]
+    for c, a in enumerate(simbolos):
+        for i, q in enumerate(alcanzables):
+            r = tabla[q * m + c]
+            inversas[c][indices[r] if r != SIN_TRANSICION else sumidero].append(i)
+        inversas[c][sumidero].append(sumidero)
+
+    # Partición inicial: aceptación / no aceptación
+    finales = {i for i, q in enumerate(alcanzables) if densa.aceptacion[q]}
+    no_finales = set(range(total)) - finales
+    bloques: Dict[int, Set[int]] = {}
+    bloque_de = [0] * total
+    for conjunto in (finales, no_finales):
+        if conjunto:
+            b = len(bloques)
+            bloques[b] = conjunto
+            for i in conjunto:
+                bloque_de[i] = b
+
+    pendientes = deque(bloques)
+    en_pendientes = set(bloques)
+
+    while pendientes:
+        A = pendientes.popleft()
+        en_pendientes.discard(A)
+        divisor = list(bloques[A])
+
+        for c in range(len(simbolos)):
+            X: Set[int] = set()
+            for q in divisor:
+                X.update(inversas[c][q])
+            if not X:
+                continue
 
-    for i, c1 in enumerate(regex):
-        resultado.append(c1)
-        if i == n - 1:
-            break
-        c2 = regex[i + 1]
+            tocados: Dict[int, Set[int]] = {}
+            for q in X:
+                tocados.setdefault(bloque_de[q], set()).add(q)
+
+            for Y, interseccion in tocados.items():
+                if len(interseccion) == len(bloques[Y]):
+                    continue
+                nuevo = len(bloques)
+                bloques[Y] -= interseccion
+                bloques[nuevo] = interseccion
+                for q in interseccion:
+                    bloque_de[q] = nuevo
+                if Y in en_pendientes:
+                    pendientes.append(nuevo)
+                    en_pendientes.add(nuevo)
+                else:
+                    menor = nuevo if len(interseccion) <= len(bloques[Y]) else Y
+                    pendientes.append(menor)
+                    en_pendientes.add(menor)
+
+    # Construir el AFD mínimo (sin el bloque sumidero)
+    bloque_sumidero = bloque_de[sumidero]
+    nombres = {bloque_de[0]: 0}
+    if bloque_de[0] != bloque_sumidero:
+        cola = deque([bloque_de[0]])
+        while cola:
+            b = cola.popleft()
+            representante = alcanzables[next(iter(bloques[b]))]
+            for c in range(m):
+                r = tabla[representante * m + c]
+                if r == SIN_TRANSICION or bloque_de[indices[r]] == bloque_sumidero:
+                    continue
+                destino = bloque_de[indices[r]]
+                if destino not in nombres:
+                    nombres[destino] = len(nombres)
+                    cola.append(destino)
+    # Si el inicial es equivalente al sumidero, el lenguaje es vacío:
+    # queda un solo estado sin transiciones.
+
+    minimo = AFDDenso(
+        range(len(nombres)),
+        simbolos,
+        inicial=0,
+        nombre=f"{densa.nombre} (mínimo)",
+        alfabeto=set(densa.alfabeto) if densa.alfabeto is not None else set(simbolos),
+    )
+    if bloque_de[0] != bloque_sumidero:
+        for b, nuevo in nombres.items():
+            representante = alcanzables[next(iter(bloques[b]))]
+            minimo.aceptacion[nuevo] = densa.aceptacion[representante]
+            for c in range(m):
+                r = tabla[representante * m + c]
+                if r != SIN_TRANSICION and bloque_de[indices[r]] != bloque_sumidero:
+                    minimo.tabla[nuevo * m + c] = nombres[bloque_de[indices[r]]]
 
-        if (
-            ( _es_simbolo_regex(c1) or c1 in {")", "*", "ε"} )
-            and ( _es_simbolo_regex(c2) or c2 in {"(", "ε"} )
-        ):
-            resultado.append(".")
+    return minimo if isinstance(afd, AFDDenso) else minimo.a_spec()
 
-    return "".join(resultado)
 
+# ======================
+#   Regex
+# ======================
 
-def _infix_a_postfix(regex: str) -> str:
+def _thompson(nodo: NodoRegex, nfa: AutomataNFA) -> Tuple[EstadoNFA, EstadoNFA]:
     """
-    Convierte una expresión regular en notación infija a postfija.
-    Operadores: *, ., |
-    Precedencia: * > . > |
+    Construye el fragmento de Thompson de `nodo` directamente dentro de `nfa`
+    (un solo autómata compartido, sin copiar transiciones) y devuelve
+    sus estados (inicio, fin).
     """
-    precedencia = {"|": 1, ".": 2, "*": 3}
-    salida = []
-    pila = []
-
-    for c in regex:
-        if _es_simbolo_regex(c) or c == "ε":
-            salida.append(c)
-        elif c == "(":
-            pila.append(c)
-        elif c == ")":
-            while pila and pila[-1] != "(":
-                salida.append(pila.pop())
-            if pila and pila[-1] == "(":
-                pila.pop()
-        else:
-            while (
-                pila
-                and pila[-1] != "("
-                and precedencia.get(pila[-1], 0) >= precedencia.get(c, 0)
-            ):
-                salida.append(pila.pop())
-            pila.append(c)
-
-    while pila:
-        salida.append(pila.pop())
+    s = nfa.nuevo_estado()
+    e = nfa.nuevo_estado()
+
+    if nodo.tipo == SIMBOLO:
+        nfa.agregar_transicion(s, nodo.simbolo, e)
+    elif nodo.tipo == EPSILON:
+        nfa.agregar_transicion(s, "ε", e)
+    elif nodo.tipo == CONCAT:
+        anterior = s
+        for hijo in nodo.hijos:
+            inicio_h, fin_h = _thompson(hijo, nfa)
+            nfa.agregar_transicion(anterior, "ε", inicio_h)
+            anterior = fin_h
+        nfa.agregar_transicion(anterior, "ε", e)
+    elif nodo.tipo == UNION:
+        for hijo in nodo.hijos:
+            inicio_h, fin_h = _thompson(hijo, nfa)
+            nfa.agregar_transicion(s, "ε", inicio_h)
+            nfa.agregar_transicion(fin_h, "ε", e)
+    elif nodo.tipo in (ESTRELLA, MAS):
+        inicio_h, fin_h = _thompson(nodo.hijos[0], nfa)
+        nfa.agregar_transicion(s, "ε", inicio_h)
+        nfa.agregar_transicion(fin_h, "ε", inicio_h)
+        nfa.agregar_transicion(fin_h, "ε", e)
+        if nodo.tipo == ESTRELLA:
+            nfa.agregar_transicion(s, "ε", e)
+    # VACIO: inicio y fin sin transiciones
 
-    return "".join(salida)
+    return s, e
 
 
 def expresion_regular_a_nfa(expresion: str) -> AutomataNFA:
     """
     Construye un NFA a partir de una expresión regular usando Thompson.
-    Soporta: concatenación (implícita), | y *, paréntesis.
+    Soporta: concatenación (implícita), |, *, +, ?, paréntesis, clases
+    [a-z], terminales de varios caracteres entre comillas y escapes
+    (ver expresiones_regulares.ParserRegex).
     """
     expresion = expresion.strip()
     if not expresion:
         raise ValueError("La expresión regular está vacía.")
 
-    expresion = _insertar_concatenacion_implicita(expresion)
-    postfix = _infix_a_postfix(expresion)
-    pila: List[AutomataNFA] = []
-
-    for c in postfix:
-        if _es_simbolo_regex(c) or c == "ε":
-            nfa = AutomataNFA()
-            s = EstadoNFA()
-            e = EstadoNFA()
-            nfa.estado_inicial = s
-            nfa.estado_final = e
-            nfa.agregar_transicion(s, c, e)
-            pila.append(nfa)
-
-        elif c == ".":
-            # concatenación
-            if len(pila) < 2:
-                raise ValueError("Expresión regular inválida (concatenación).")
-            nfa2 = pila.pop()
-            nfa1 = pila.pop()
-            nfa1.agregar_transicion(nfa1.estado_final, "ε", nfa2.estado_inicial)
-            # copiar transiciones
-            for estado, trans in nfa2.transiciones.items():
-                for simb, dests in trans.items():
-                    for d in dests:
-                        nfa1.agregar_transicion(estado, simb, d)
-            nfa1.estado_final = nfa2.estado_final
-            pila.append(nfa1)
-
-        elif c == "|":
-            # unión
-            if len(pila) < 2:
-                raise ValueError("Expresión regular inválida (unión).")
-            nfa2 = pila.pop()
-            nfa1 = pila.pop()
-
-            nfa = AutomataNFA()
-            s = EstadoNFA()
-            e = EstadoNFA()
-            nfa.estado_inicial = s
-            nfa.estado_final = e
-
-            # copiar transiciones
-            for dic in (nfa1.transiciones, nfa2.transiciones):
-                for estado, trans in dic.items():
-                    for simb, dests in trans.items():
-                        for d in dests:
-                            nfa.agregar_transicion(estado, simb, d)
-
-            nfa.agregar_transicion(s, "ε", nfa1.estado_inicial)
-            nfa.agregar_transicion(s, "ε", nfa2.estado_inicial)
-            nfa.agregar_transicion(nfa1.estado_final, "ε", e)
-            nfa.agregar_transicion(nfa2.estado_final, "ε", e)
-
-            pila.append(nfa)
-
-        elif c == "*":
-            # cierre de Kleene
-            if not pila:
-                raise ValueError("Expresión regular inválida (estrella).")
-            nfa1 = pila.pop()
-            nfa = AutomataNFA()
-            s = EstadoNFA()
-            e = EstadoNFA()
-            nfa.estado_inicial = s
-            nfa.estado_final = e
-
-            for estado, trans in nfa1.transiciones.items():
-                for simb, dests in trans.items():
-                    for d in dests:
-                        nfa.agregar_transicion(estado, simb, d)
-
-            nfa.agregar_transicion(s, "ε", nfa1.estado_inicial)
-            nfa.agregar_transicion(s, "ε", e)
-            nfa.agregar_transicion(nfa1.estado_final, "ε", nfa1.estado_inicial)
-            nfa.agregar_transicion(nfa1.estado_final, "ε", e)
-
-            pila.append(nfa)
-
-        else:
-            raise ValueError(f"Símbolo de expresión regular no soportado: '{c}'")
-
-    if len(pila) != 1:
-        raise ValueError("Expresión regular inválida (pila final != 1).")
-
-    return pila[0]
+    arbol = parsear_regex(expresion)
+    nfa = AutomataNFA()
+    nfa.estado_inicial, nfa.estado_final = _thompson(arbol, nfa)
+    nfa.estados.add(nfa.estado_inicial)
+    nfa.estados.add(nfa.estado_final)
+    return nfa
 
 
 def obtener_alfabeto_desde_nfa(nfa: AutomataNFA) -> Set[str]:
@@ -388,145 +504,284 @@ def obtener_alfabeto_desde_nfa(nfa: AutomataNFA) -> Set[str]:
 #   AFD → Expresión Regular
 # ===========================
 
-def _union_regex(a: str, b: str) -> str:
-    if not a:
-        return b
-    if not b:
-        return a
-    if a == b:
-        return a
-    return f"{a}|{b}"
+def convertir_afd_a_expresion_regular(afd: Union[Dict[str, Any], AFDDenso]) -> str:
+    """
+    Convierte un AFD a una expresión regular usando eliminación de estados
+    con orden heurístico sobre un AST compartido (ver
+    expresiones_regulares.afd_a_regex_por_eliminacion), a cualquier tamaño.
+    Acepta la especificación o un AFDDenso.
+    """
+    return afd_a_regex_por_eliminacion(como_spec(afd))
 
 
-def _concatenar_regex(a: str, b: str) -> str:
-    if not a or not b:
-        return ""
-    if a == "ε":
-        return b
-    if b == "ε":
-        return a
+# ======================
+#   Diagramas y Árboles
+# ======================
 
-    def par(s: str) -> str:
-        if "|" in s and not (s.startswith("(") and s.endswith(")")):
-            return f"({s})"
-        return s
+VERSION_CACHE_DIAGRAMAS = 2
+LIMITE_CACHE_DIAGRAMAS = 64 * 1024 * 1024  # bytes
+OPCIONES_DIAGRAMA: Dict[str, str] = {"rankdir": "LR"}
+# Desde cuántos estados se dibuja con diagramas_svg en lugar de `dot`
+UMBRAL_DIAGRAMA_SVG = 150
+_DOT_DISPONIBLE: Optional[bool] = None
 
-    return par(a) + par(b)
 
+def graphviz_disponible() -> bool:
+    """Indica si están el paquete graphviz y el ejecutable `dot` (se revisa una vez)."""
+    global _DOT_DISPONIBLE
+    if _DOT_DISPONIBLE is None:
+        _DOT_DISPONIBLE = graphviz is not None and shutil.which("dot") is not None
+    return _DOT_DISPONIBLE
 
-def _estrella_regex(a: str) -> str:
-    if not a:
-        return ""
-    if a == "ε":
-        return "ε"
-    if len(a) == 1:
-        return a + "*"
-    if a.startswith("(") and a.endswith(")"):
-        return a + "*"
-    return f"({a})*"
 
+def motor_de_diagrama(spec: Dict[str, Any]) -> str:
+    """"dot" (Graphviz) o "svg" (diagramas_svg, para autómatas grandes o sin Graphviz)."""
+    if not graphviz_disponible() or len(estados_del_diagrama(spec)) > UMBRAL_DIAGRAMA_SVG:
+        return "svg"
+    return "dot"
+
+
+def directorio_cache_diagramas() -> str:
+    """Carpeta de caché del usuario (LOCALAPPDATA en Windows, XDG_CACHE_HOME o ~/.cache)."""
+    base = (
+        os.environ.get("LOCALAPPDATA")
+        or os.environ.get("XDG_CACHE_HOME")
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(base, "ChomskyClassifierAI", "diagramas")
 
-def convertir_afd_a_expresion_regular(afd: Dict[str, Any]) -> str:
+
+def huella_diagrama(spec: Dict[str, Any], formato: str, opciones: Dict[str, str], motor: str = "dot") -> str:
     """
-    Convierte un AFD a una expresión regular usando eliminación de estados.
-    Usa el método de Matriz R_k[i][j].
+    Hash SHA-256 de la forma canónica del autómata (estados, transiciones
+    y aceptación ordenados, como texto) junto con el formato, las opciones
+    de dibujo y el motor: el mismo autómata da la misma huella sin importar
+    el orden de sus listas.
     """
-    estados = sorted(
-        set(afd["estActua"]) | set(afd["estsigui"]) | {afd["start_state"]} | set(afd["accept_states"])
+    transiciones = sorted(
+        {(str(q), str(a), str(r)) for q, a, r in zip(spec["estActua"], spec["lecturas"], spec["estsigui"])}
     )
-    if not estados:
-        return "∅"
+    contenido = json.dumps(
+        [
+            VERSION_CACHE_DIAGRAMAS,
+            motor,
+            formato,
+            sorted(opciones.items()),
+            str(spec.get("nombre", "Automata")),
+            str(spec["start_state"]),
+            sorted(str(q) for q in spec["accept_states"]),
+            estados_del_diagrama(spec),
+            transiciones,
+        ],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
 
-    # Crear nuevo estado final único F
-    nuevo_final = max(estados) + 1
-    estados.append(nuevo_final)
 
-    start = afd["start_state"]
-    accept_states = set(afd["accept_states"])
+def _digrafo_automata(spec: Dict[str, Any], opciones: Dict[str, str]) -> "graphviz.Digraph":
+    dot = graphviz.Digraph(comment=str(spec.get("nombre", "Automata")))
+    dot.attr(**opciones)
 
-    indices = {estado: i for i, estado in enumerate(estados)}
-    n = len(estados)
-    R = [["" for _ in range(n)] for _ in range(n)]
+    estados_aceptacion = {str(s) for s in spec["accept_states"]}
+    for etiqueta in estados_del_diagrama(spec):
+        forma = "doublecircle" if etiqueta in estados_aceptacion else "circle"
+        dot.node(etiqueta, shape=forma)
 
-    # Inicializar R[-1]
-    for desde, simb, hasta in zip(afd["estActua"], afd["lecturas"], afd["estsigui"]):
-        i = indices[desde]
-        j = indices[hasta]
-        R[i][j] = _union_regex(R[i][j], simb)
+    dot.node("inicio", shape="point", style="invisible")
+    dot.edge("inicio", str(spec["start_state"]), label="Inicio")
 
-    # Diagonales con ε
-    for estado in estados:
-        i = indices[estado]
-        R[i][i] = _union_regex(R[i][i], "ε")
-
-    # Agregar transiciones ε desde estados de aceptación al nuevo final
-    idx_final = indices[nuevo_final]
-    for qf in accept_states:
-        i = indices[qf]
-        R[i][idx_final] = _union_regex(R[i][idx_final], "ε")
-
-    # También el final consigo mismo con ε
-    R[idx_final][idx_final] = _union_regex(R[idx_final][idx_final], "ε")
-
-    # Programa dinámico R_k
-    for k in range(n):
-        for i in range(n):
-            for j in range(n):
-                sin_k = R[i][j]
-                if not R[i][k] or not R[k][j]:
-                    con_k = ""
-                else:
-                    loop = _estrella_regex(R[k][k])
-                    con_k = _concatenar_regex(R[i][k], _concatenar_regex(loop, R[k][j]))
-                R[i][j] = _union_regex(sin_k, con_k)
+    # Una sola arista por par de estados, con todos sus símbolos
+    for (est_act, est_sig), simbolos in aristas_agrupadas(spec).items():
+        dot.edge(est_act, est_sig, label=", ".join(simbolos))
+    return dot
 
-    idx_start = indices[start]
-    regex = R[idx_start][idx_final]
-    return regex if regex else "∅"
 
+def _ejecutar_dot(fuente: str, salida: str, formato: str, token: Optional[TokenCancelacion] = None) -> None:
+    """
+    Corre `dot` como subproceso revisando el token cada 100 ms; si se
+    cancela, el proceso se mata en lugar de esperar a que termine el acomodo.
+    """
+    verificar = verificador(token)
+    opciones_proceso: Dict[str, Any] = {}
+    if os.name == "nt":
+        # Sin ventana de consola en la aplicación empaquetada
+        opciones_proceso["startupinfo"] = subprocess.STARTUPINFO()
+        opciones_proceso["startupinfo"].dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    proceso = subprocess.Popen(
+        ["dot", f"-T{formato}", "-o", salida],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        **opciones_proceso,
+    )
+    entrada: Optional[bytes] = fuente.encode("utf-8")
+    try:
+        while True:
+            try:
+                _, errores = proceso.communicate(entrada, timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                entrada = None
+                verificar()
+    except BaseException:
+        proceso.kill()
+        proceso.wait()
+        raise
+    if proceso.returncode != 0:
+        raise Exception(errores.decode("utf-8", "replace").strip() or f"dot terminó con código {proceso.returncode}")
+
+
+def _renderizar(
+    spec: Dict[str, Any],
+    motor: str,
+    directorio: str,
+    nombre: str,
+    formato: str,
+    opciones: Dict[str, str],
+    token: Optional[TokenCancelacion] = None,
+) -> str:
+    if motor == "svg":
+        return guardar_svg_automata(spec, os.path.join(directorio, f"{nombre}.svg"), opciones)
+    ruta = os.path.join(directorio, f"{nombre}.{formato}")
+    try:
+        _ejecutar_dot(_digrafo_automata(spec, opciones).source, ruta, formato, token)
+    except TareaCancelada:
+        raise
+    except Exception as e:
+        raise Exception(f"Error al generar el diagrama con Graphviz: {e}")
+    return ruta
 
-# ======================
-#   Diagramas y Árboles
-# ======================
 
-def dibujar_automata(
+def _renderizar_en_temporal(
     spec: Dict[str, Any],
+    motor: str,
+    carpeta: str,
+    formato: str,
+    opciones: Dict[str, str],
+    token: Optional[TokenCancelacion] = None,
+) -> Tuple[str, str]:
+    """
+    Renderiza en una carpeta temporal propia dentro de `carpeta`, así dos
+    dibujos simultáneos nunca escriben el mismo archivo.
+    Devuelve (ruta_del_archivo, carpeta_temporal).
+    """
+    temporal = tempfile.mkdtemp(dir=carpeta, prefix=".dibujo-")
+    try:
+        return _renderizar(spec, motor, temporal, "diagrama", formato, opciones, token), temporal
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+
+
+def _recortar_cache_diagramas(carpeta: str, limite: int, conservar: str) -> None:
+    """
+    Borra los diagramas usados hace más tiempo (según su fecha de
+    modificación, que se renueva en cada acierto) hasta que el total
+    quede por debajo del límite. `conservar` nunca se borra.
+    """
+    archivos = []
+    total = 0
+    try:
+        with os.scandir(carpeta) as entradas:
+            for entrada in entradas:
+                if entrada.name.startswith(".") or not entrada.is_file():
+                    continue
+                try:
+                    info = entrada.stat()
+                except OSError:
+                    continue
+                archivos.append((info.st_mtime, info.st_size, entrada.path))
+                total += info.st_size
+    except OSError:
+        return
+
+    archivos.sort()
+    for _, tamano, ruta in archivos:
+        if total <= limite:
+            break
+        if os.path.normcase(ruta) == os.path.normcase(conservar):
+            continue
+        try:
+            os.unlink(ruta)
+        except OSError:
+            # Otro proceso ya lo borró o lo tiene abierto
+            continue
+        total -= tamano
+
+
+def dibujar_automata(
+    spec: Union[Dict[str, Any], AFDDenso],
     ruta_salida: str = "automata_grafico",
     formato: str = "png",
+    opciones: Optional[Dict[str, str]] = None,
+    directorio_cache: Optional[str] = None,
+    limite_cache: int = LIMITE_CACHE_DIAGRAMAS,
+    token: Optional[TokenCancelacion] = None,
 ) -> str:
     """
-    Genera un diagrama de autómata usando Graphviz y devuelve
-    la ruta del archivo generado.
+    Genera un diagrama de autómata (especificación o AFDDenso)
+    usando Graphviz y devuelve la ruta del archivo generado.
+    Con más de UMBRAL_DIAGRAMA_SVG estados, o si Graphviz no está
+    instalado, se dibuja con diagramas_svg y el archivo es siempre SVG.
+
+    Los diagramas se guardan en una caché en disco con nombre igual a la
+    huella del autómata, el formato y las opciones (ver huella_diagrama):
+    si ya se dibujó, se devuelve el archivo sin llamar a Graphviz. Cada
+    dibujo nuevo se hace en una carpeta temporal y se mueve con
+    os.replace, y la caché se recorta por tamaño total (LRU). Si la caché
+    no se puede usar, el diagrama queda en una carpeta temporal con el
+    nombre `ruta_salida`. Con un token, el dibujo se puede cancelar
+    (se mata el proceso de `dot`).
     """
-    dot = graphviz.Digraph(comment=spec.get("nombre", "Automata"))
-    dot.attr(rankdir="LR")
+    spec = como_spec(spec)
+    opciones = dict(OPCIONES_DIAGRAMA, **(opciones or {}))
+    motor = motor_de_diagrama(spec)
+    if motor == "svg":
+        formato = "svg"
+    carpeta = directorio_cache or directorio_cache_diagramas()
+    ruta = os.path.join(carpeta, f"{huella_diagrama(spec, formato, opciones, motor)}.{formato}")
 
-    estados = set(spec["estActua"]) | set(spec["estsigui"]) | {spec["start_state"]}
-    estado_inicial = str(spec["start_state"])
-    estados_aceptacion = {str(s) for s in spec["accept_states"]}
-
-    for e in estados:
-        etiqueta = str(e)
-        forma = "doublecircle" if etiqueta in estados_aceptacion else "circle"
-        dot.node(etiqueta, shape=forma)
+    try:
+        # Acierto: se renueva la fecha para el orden LRU
+        os.utime(ruta)
+        return ruta
+    except OSError:
+        pass
 
-    dot.node("inicio", shape="point", style="invisible")
-    dot.edge("inicio", estado_inicial, label="Inicio")
+    try:
+        os.makedirs(carpeta, exist_ok=True)
+    except OSError:
+        carpeta = None
 
-    for est_act, lectura, est_sig in zip(spec["estActua"], spec["lecturas"], spec["estsigui"]):
-        dot.edge(str(est_act), str(est_sig), label=str(lectura))
+    if carpeta is None:
+        return _renderizar(
+            spec, motor, tempfile.mkdtemp(prefix="diagrama-"), os.path.basename(ruta_salida), formato, opciones, token
+        )
+    generado, temporal = _renderizar_en_temporal(spec, motor, carpeta, formato, opciones, token)
 
     try:
-        ruta = dot.render(filename=ruta_salida, view=False, cleanup=True, format=formato)
-        return ruta
-    except Exception as e:
-        raise Exception(f"Error al generar el diagrama con Graphviz: {e}")
+        os.replace(generado, ruta)
+    except OSError:
+        # En Windows falla si otro hilo ya dejó el mismo diagrama y lo tiene abierto
+        if not os.path.exists(ruta):
+            raise
+    finally:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+    _recortar_cache_diagramas(carpeta, limite_cache, conservar=ruta)
+    return ruta
 
 
 def mostrar_imagen_en_ventana(padre: tk.Misc, ruta_imagen: str, titulo: str):
     """
     Muestra una imagen en una ventana Tkinter con scroll.
+    Tk no muestra SVG: esos diagramas se abren en el navegador.
     """
+    if ruta_imagen.lower().endswith(".svg"):
+        webbrowser.open(Path(ruta_imagen).resolve().as_uri())
+        return
+
     ventana = tk.Toplevel(padre)
     ventana.title(titulo)
     ventana.configure(bg="#b9ede2")
@@ -0,0 +1,292 @@
+"""
+Dibujo de autómatas en SVG sin Graphviz.
+
+Para AFD con cientos de estados casi todo el tiempo de dibujar_automata
+se va en el acomodo de `dot`, y sin Graphviz instalado no hay diagrama.
+Este módulo hace un acomodo por capas propio y escribe el SVG directamente:
+
+- DisposicionPorCapas: capas por BFS desde el estado inicial (los estados
+  no alcanzables van en capas al final) y orden dentro de cada capa por
+  baricentro de los vecinos en la capa contigua, con barridos alternos
+  hacia adelante y hacia atrás; se queda con el orden de menos cruces.
+- aristas_agrupadas: las transiciones paralelas (mismo origen y destino)
+  se juntan en una sola arista con todos sus símbolos.
+- automata_a_svg / guardar_svg_automata: el documento SVG (texto o archivo).
+"""
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+import math
+
+from automata_denso import AFDDenso, como_spec
+
+
+RADIO_ESTADO = 20
+SEPARACION_CAPAS = 120
+SEPARACION_ESTADOS = 70
+MARGEN = 80
+BARRIDOS_BARICENTRO = 12
+FUENTE = "Segoe UI, Helvetica, Arial, sans-serif"
+
+
+def estados_del_diagrama(spec: Dict[str, Any]) -> List[str]:
+    """Etiquetas (como texto) de todos los estados que aparecen en el autómata, ordenadas."""
+    estados = set(spec["estActua"]) | set(spec["estsigui"]) | {spec["start_state"]}
+    return sorted({str(e) for e in estados})
+
+
+def aristas_agrupadas(spec: Dict[str, Any]) -> Dict[Tuple[str, str], List[str]]:
+    """(origen, destino) -> símbolos ordenados de todas las transiciones entre ambos."""
+    grupos: Dict[Tuple[str, str], set] = {}
+    for q, a, r in zip(spec["estActua"], spec["lecturas"], spec["estsigui"]):
+        grupos.setdefault((str(q), str(r)), set()).add(str(a))
+    return {clave: sorted(simbolos) for clave, simbolos in sorted(grupos.items())}
+
+
+def _contar_inversiones(pares: List[Tuple[int, int]], tope: int) -> int:
+    """Cruces entre dos capas: pares (i, j) ordenados por i con j decreciente (árbol de Fenwick)."""
+    arbol = [0] * (tope + 1)
+    cruces = 0
+    vistos = 0
+    for _, j in sorted(pares):
+        # Aristas ya vistas que llegan estrictamente más abajo que j
+        k = j + 1
+        menores_o_iguales = 0
+        while k > 0:
+            menores_o_iguales += arbol[k]
+            k -= k & -k
+        cruces += vistos - menores_o_iguales
+        k = j + 1
+        while k <= tope:
+            arbol[k] += 1
+            k += k & -k
+        vistos += 1
+    return cruces
+
+
+class DisposicionPorCapas:
+    """
+    Acomodo por capas de un grafo dirigido.
+
+    - capa[e]: número de capa del estado e (distancia BFS desde el inicial).
+    - capas: estados de cada capa en su orden final.
+    - cruces_iniciales / cruces: cruces entre capas contiguas antes y
+      después de los barridos por baricentro.
+    """
+
+    def __init__(
+        self,
+        estados: List[str],
+        inicial: str,
+        aristas: Iterable[Tuple[str, str]],
+        barridos: int = BARRIDOS_BARICENTRO,
+    ):
+        sucesores: Dict[str, List[str]] = {e: [] for e in estados}
+        self.vecinos: Dict[str, set] = {e: set() for e in estados}
+        for q, r in aristas:
+            if q == r:
+                continue
+            sucesores[q].append(r)
+            self.vecinos[q].add(r)
+            self.vecinos[r].add(q)
+
+        self.capa: Dict[str, int] = {}
+        self.capas: List[List[str]] = []
+        self._asignar_capas(estados, inicial, sucesores)
+
+        self.cruces_iniciales = self._total_cruces(self.capas)
+        self.cruces = self.cruces_iniciales
+        self._reducir_cruces(barridos)
+
+    def _asignar_capas(self, estados: List[str], inicial: str, sucesores: Dict[str, List[str]]) -> None:
+        """
+        BFS desde el inicial; los estados que quedan sin capa se acomodan
+        con otro BFS, desde todos los que no tienen predecesor entre ellos
+        a la vez, en capas a continuación.
+        """
+        raices = [inicial]
+        while raices:
+            base = len(self.capas)
+            for raiz in raices:
+                self.capa[raiz] = base
+            cola = deque(raices)
+            while cola:
+                q = cola.popleft()
+                k = self.capa[q]
+                if k == len(self.capas):
+                    self.capas.append([])
+                self.capas[k].append(q)
+                for r in sucesores[q]:
+                    if r not in self.capa:
+                        self.capa[r] = k + 1
+                        cola.append(r)
+
+            restantes = [e for e in estados if e not in self.capa]
+            con_predecesor = {r for q in restantes for r in sucesores[q]}
+            # En un ciclo sin entrada cualquier estado sirve de raíz
+            raices = [e for e in restantes if e not in con_predecesor] or restantes[:1]
+
+    def _cruces_entre(self, izquierda: List[str], derecha: List[str]) -> int:
+        posicion = {e: j for j, e in enumerate(derecha)}
+        pares = [
+            (i, posicion[v])
+            for i, e in enumerate(izquierda)
+            for v in self.vecinos[e]
+            if v in posicion
+        ]
+        return _contar_inversiones(pares, len(derecha))
+
+    def _total_cruces(self, capas: List[List[str]]) -> int:
+        return sum(self._cruces_entre(capas[k], capas[k + 1]) for k in range(len(capas) - 1))
+
+    def _ordenar_por_baricentro(self, movil: List[str], fija: List[str]) -> None:
+        posicion = {e: j for j, e in enumerate(fija)}
+        claves = []
+        for i, e in enumerate(movil):
+            vecinos = [posicion[v] for v in self.vecinos[e] if v in posicion]
+            # Sin vecinos en la capa fija, el estado conserva su lugar
+            baricentro = sum(vecinos) / len(vecinos) if vecinos else float(i)
+            claves.append((baricentro, i, e))
+        claves.sort()
+        movil[:] = [e for _, _, e in claves]
+
+    def _reducir_cruces(self, barridos: int) -> None:
+        capas = [list(c) for c in self.capas]
+        for barrido in range(barridos):
+            if self.cruces == 0:
+                break
+            if barrido % 2 == 0:
+                for k in range(1, len(capas)):
+                    self._ordenar_por_baricentro(capas[k], capas[k - 1])
+            else:
+                for k in range(len(capas) - 2, -1, -1):
+                    self._ordenar_por_baricentro(capas[k], capas[k + 1])
+            cruces = self._total_cruces(capas)
+            if cruces < self.cruces:
+                self.cruces = cruces
+                self.capas = [list(c) for c in capas]
+
+    def coordenadas(self, horizontal: bool = True) -> Dict[str, Tuple[float, float]]:
+        """Centro de cada estado; las capas se centran respecto de la más poblada."""
+        mas_poblada = max((len(c) for c in self.capas), default=1)
+        puntos: Dict[str, Tuple[float, float]] = {}
+        for k, capa in enumerate(self.capas):
+            desplazamiento = (mas_poblada - len(capa)) * SEPARACION_ESTADOS / 2
+            for i, e in enumerate(capa):
+                a = MARGEN + k * SEPARACION_CAPAS
+                b = MARGEN + desplazamiento + i * SEPARACION_ESTADOS
+                puntos[e] = (a, b) if horizontal else (b, a)
+        return puntos
+
+
+def _num(v: float) -> str:
+    return f"{v:.1f}"
+
+
+def _hacia(origen: Tuple[float, float], destino: Tuple[float, float], distancia: float) -> Tuple[float, float]:
+    """Punto a `distancia` de origen en dirección a destino."""
+    dx, dy = destino[0] - origen[0], destino[1] - origen[1]
+    largo = math.hypot(dx, dy) or 1.0
+    return origen[0] + dx / largo * distancia, origen[1] + dy / largo * distancia
+
+
+def _svg_arista(p: Tuple[float, float], q: Tuple[float, float], curvar: bool, etiqueta: str) -> List[str]:
+    """
+    Arista de p a q: recta, o curva hacia la izquierda del sentido de
+    avance (así q -> p y p -> q quedan a lados opuestos).
+    """
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    largo = math.hypot(dx, dy) or 1.0
+    curvatura = 0.2 * largo + 15 if curvar else 0.0
+    control = ((p[0] + q[0]) / 2 + dy / largo * curvatura, (p[1] + q[1]) / 2 - dx / largo * curvatura)
+    inicio = _hacia(p, control, RADIO_ESTADO)
+    fin = _hacia(q, control, RADIO_ESTADO)
+    medio_x = 0.25 * inicio[0] + 0.5 * control[0] + 0.25 * fin[0]
+    medio_y = 0.25 * inicio[1] + 0.5 * control[1] + 0.25 * fin[1] - 5
+    return [
+        f'<path d="M {_num(inicio[0])} {_num(inicio[1])} Q {_num(control[0])} {_num(control[1])} '
+        f'{_num(fin[0])} {_num(fin[1])}" class="arista" marker-end="url(#flecha)"/>',
+        f'<text x="{_num(medio_x)}" y="{_num(medio_y)}" class="simbolo">{etiqueta}</text>',
+    ]
+
+
+def _svg_bucle(p: Tuple[float, float], etiqueta: str) -> List[str]:
+    x, y = p
+    arriba = y - RADIO_ESTADO + 3
+    return [
+        f'<path d="M {_num(x - 8)} {_num(arriba)} C {_num(x - 28)} {_num(arriba - 42)} '
+        f'{_num(x + 28)} {_num(arriba - 42)} {_num(x + 8)} {_num(arriba)}" class="arista" '
+        f'marker-end="url(#flecha)"/>',
+        f'<text x="{_num(x)}" y="{_num(arriba - 38)}" class="simbolo">{etiqueta}</text>',
+    ]
+
+
+def automata_a_svg(spec: Union[Dict[str, Any], AFDDenso], opciones: Optional[Dict[str, str]] = None) -> str:
+    """
+    Documento SVG del autómata (especificación o AFDDenso). De las
+    opciones de Graphviz solo se usa rankdir (LR u horizontal por defecto,
+    TB vertical).
+    """
+    spec = como_spec(spec)
+    horizontal = (opciones or {}).get("rankdir", "LR") in ("LR", "RL")
+    inicial = str(spec["start_state"])
+    aceptacion = {str(q) for q in spec["accept_states"]}
+    aristas = aristas_agrupadas(spec)
+
+    disposicion = DisposicionPorCapas(estados_del_diagrama(spec), inicial, aristas)
+    puntos = disposicion.coordenadas(horizontal)
+    ancho = max(x for x, _ in puntos.values()) + MARGEN
+    alto = max(y for _, y in puntos.values()) + MARGEN
+
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(ancho)}" height="{_num(alto)}" '
+        f'viewBox="0 0 {_num(ancho)} {_num(alto)}">',
+        f"<title>{escape(str(spec.get('nombre', 'Automata')))}</title>",
+        "<defs>",
+        '<marker id="flecha" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" '
+        'orient="auto-start-reverse"><path d="M 0 0 L 10 5 L 0 10 z"/></marker>',
+        "<style>",
+        ".arista { fill: none; stroke: #000; stroke-width: 1.2; }",
+        ".estado { fill: #fff; stroke: #000; stroke-width: 1.2; }",
+        f"text {{ font-family: {FUENTE}; font-size: 12px; text-anchor: middle; }}",
+        ".nombre { dominant-baseline: central; }",
+        ".simbolo { fill: #204080; }",
+        "</style>",
+        "</defs>",
+        f'<rect width="{_num(ancho)}" height="{_num(alto)}" fill="#fff"/>',
+    ]
+
+    for (q, r), simbolos in aristas.items():
+        etiqueta = escape(", ".join(simbolos))
+        if q == r:
+            partes.extend(_svg_bucle(puntos[q], etiqueta))
+        else:
+            # Solo va recta si avanza una capa y no hay arista de vuelta
+            recta = disposicion.capa[r] == disposicion.capa[q] + 1 and (r, q) not in aristas
+            partes.extend(_svg_arista(puntos[q], puntos[r], not recta, etiqueta))
+
+    x, y = puntos[inicial]
+    desde = (x - RADIO_ESTADO - 30, y) if horizontal else (x, y - RADIO_ESTADO - 30)
+    hasta = _hacia((x, y), desde, RADIO_ESTADO)
+    partes.append(
+        f'<path d="M {_num(desde[0])} {_num(desde[1])} L {_num(hasta[0])} {_num(hasta[1])}" '
+        f'class="arista" marker-end="url(#flecha)"/>'
+    )
+
+    for e, (x, y) in puntos.items():
+        partes.append(f'<circle cx="{_num(x)}" cy="{_num(y)}" r="{RADIO_ESTADO}" class="estado"/>')
+        if e in aceptacion:
+            partes.append(f'<circle cx="{_num(x)}" cy="{_num(y)}" r="{RADIO_ESTADO - 4}" class="estado"/>')
+        partes.append(f'<text x="{_num(x)}" y="{_num(y)}" class="nombre">{escape(e)}</text>')
+
+    partes.append("</svg>")
+    return "\n".join(partes)
+
+
+def guardar_svg_automata(
+    spec: Union[Dict[str, Any], AFDDenso], ruta: str, opciones: Optional[Dict[str, str]] = None
+) -> str:
+    """Escribe el SVG del autómata en `ruta` y devuelve la ruta."""
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(automata_a_svg(spec, opciones))
+    return ruta
@@ -1,121 +1,639 @@
-from typing import List, Dict, Set, Tuple
+import multiprocessing
+import queue
+from collections import deque
+from contextlib import closing
+from hashlib import blake2b
+from typing import Iterable, Iterator, List, Dict, Optional, Set, Tuple
 
 from estructuras_gramatica import Produccion, Simbolo
+from clasificador_chomsky import ClasificadorChomsky
+from automata_denso import AFDDenso, SIN_TRANSICION
+from conversor_y_diagramas import convertir_gramatica_a_nfa, convertir_nfa_a_afd, minimizar_afd
+from tareas_segundo_plano import TareaCancelada, TokenCancelacion, verificador
 
 
 class AnalizadorEquivalencia:
     """
-    Genera, de forma heurística, el conjunto de cadenas que
-    produce una gramática hasta cierta longitud máxima n.
+    Genera el conjunto de cadenas que produce una gramática
+    hasta cierta longitud máxima n.
     Se asume que la gramática es al menos de Tipo 2 (alpha = 1 No-Terminal).
+
+    Las cadenas se calculan por longitud exacta: L[X][k] es el conjunto de
+    cadenas de longitud k derivables desde X. Antes, las reglas se llevan
+    a una forma normal con cuerpos de a lo sumo dos símbolos (A -> ε,
+    A -> X, A -> X Y), así que cada nivel k se obtiene de los niveles
+    menores más un punto fijo dentro del propio nivel (reglas unitarias y
+    símbolos anulables). Funciona con recursión izquierda y derecha.
+    Con un token, la enumeración se puede cancelar (TareaCancelada).
+
+    Límite de memoria: para calcular el nivel k hacen falta todos los
+    niveles menores de cada nodo que aparece dentro de un cuerpo binario,
+    así que esos conjuntos se guardan hasta el final (cadenas_guardadas
+    dice cuántas cadenas hay en memoria); los demás nodos no guardan
+    historia. contar_derivaciones calcula solo números.
     """
 
-    def __init__(self, producciones: List[Produccion], n_max: int):
+    def __init__(self, producciones: Iterable[Produccion], n_max: int, token: Optional[TokenCancelacion] = None):
         self.n_max = n_max
-        self.simbolo_inicial = producciones[0].alpha[0].valor if producciones else ""
-        self.mapa_gramatica: Dict[str, List[List[Simbolo]]] = {}
+        self.token = token
+        self.cadenas_guardadas = 0
+        self.simbolo_inicial = ""
+        self.mapa_gramatica: Dict[str, List[Tuple[Simbolo, ...]]] = {}
+        vistas: Set[Tuple[Tuple[int, ...], Tuple[int, ...]]] = set()
 
         for p in producciones:
+            if not self.simbolo_inicial:
+                self.simbolo_inicial = p.alpha[0].valor
             # Solo consideramos reglas de la forma A -> beta (un No-Terminal en alpha)
             if len(p.alpha) == 1 and not p.alpha[0].es_terminal:
+                # Las reglas repetidas (mismos ids) no aportan cadenas nuevas
+                if p.alpha[0].id >= 0:
+                    if p.clave in vistas:
+                        continue
+                    vistas.add(p.clave)
                 A = p.alpha[0].valor
                 self.mapa_gramatica.setdefault(A, []).append(p.beta)
 
-    def _generar(
-        self,
-        secuencia: List[Simbolo],
-        cache: Dict[str, Set[str]],
-        longitud_actual: int,
-    ) -> Set[str]:
+    def _forma_normal(self):
         """
-        Genera todas las cadenas posibles derivando la secuencia dada,
-        sin exceder la longitud máxima.
+        Numera los nodos alcanzables desde el símbolo inicial y deja cada
+        regla con cuerpo de 0, 1 o 2 nodos. Un nodo es un no terminal, un
+        terminal o un sufijo (de dos o más símbolos) de algún cuerpo; los
+        sufijos iguales se comparten.
+        Devuelve (reglas, terminales): reglas[x] es la lista de cuerpos del
+        nodo x y terminales[x] el texto del nodo si es terminal.
         """
-        if longitud_actual > self.n_max:
-            return set()
+        indices: Dict[Tuple, int] = {}
+        reglas: List[List[Tuple[int, ...]]] = []
+        terminales: Dict[int, str] = {}
+        pendientes: List[Tuple] = []
 
-        if not secuencia:
-            return {""}
+        def nodo(clave: Tuple) -> int:
+            x = indices.get(clave)
+            if x is None:
+                x = indices[clave] = len(reglas)
+                reglas.append([])
+                if clave[0] == "t":
+                    terminales[x] = clave[1]
+                else:
+                    pendientes.append(clave)
+            return x
 
-        simbolo_actual = secuencia[0]
-        resto = secuencia[1:]
+        def cuerpo(claves: Tuple[Tuple, ...]) -> Tuple[int, ...]:
+            if len(claves) <= 2:
+                return tuple(nodo(c) for c in claves)
+            return nodo(claves[0]), nodo(("suf", claves[1:]))
 
-        if simbolo_actual.es_terminal:
-            # Avanzamos con ese terminal
-            cadenas_resto = self._generar(
-                resto, cache, longitud_actual + len(simbolo_actual.valor)
-            )
-            resultado = set()
-            for s in cadenas_resto:
-                nueva = simbolo_actual.valor + s
-                if len(nueva) <= self.n_max:
-                    resultado.add(nueva)
-            return resultado
-
-        # Es No-Terminal
-        nombre_nt = simbolo_actual.valor
-
-        if nombre_nt in cache:
-            cadenas_nt = cache[nombre_nt]
-        else:
-            cadenas_nt: Set[str] = set()
-            cache[nombre_nt] = set()  # marca "en progreso" para evitar recursión infinita
+        nodo(("nt", self.simbolo_inicial))
+        while pendientes:
+            clave = pendientes.pop()
+            x = indices[clave]
+            if clave[0] == "nt":
+                reglas[x] = [
+                    cuerpo(tuple(("t" if s.es_terminal else "nt", s.valor) for s in beta))
+                    for beta in self.mapa_gramatica.get(clave[1], [])
+                ]
+            else:
+                reglas[x] = [cuerpo(clave[1])]
+        return reglas, terminales
+
+    @staticmethod
+    def _anulables(reglas: List[List[Tuple[int, ...]]]) -> List[bool]:
+        """Nodos que derivan ε."""
+        anulable = [False] * len(reglas)
+        cambio = True
+        while cambio:
+            cambio = False
+            for x in range(len(reglas)):
+                if not anulable[x] and any(all(anulable[y] for y in c) for c in reglas[x]):
+                    anulable[x] = cambio = True
+        return anulable
+
+    def contar_derivaciones(self) -> List[int]:
+        """
+        Número de árboles de derivación de cada longitud k = 0..n_max desde
+        el símbolo inicial, con enteros por nodo y longitud (sin cadenas):
+
+            N[A][k] = Σ reglas A -> X: N[X][k]
+                    + Σ reglas A -> X Y: Σ_i N[X][i] · N[Y][k - i]
+
+        Si la gramática no es ambigua, es el número de cadenas distintas de
+        cada longitud; si lo es, cuenta de más. Lanza ValueError si hay
+        ciclos de reglas unitarias o con símbolos anulables (A -> B -> A,
+        A -> A B con B anulable): ahí las derivaciones son infinitas.
+        """
+        if not self.simbolo_inicial:
+            return [0] * (self.n_max + 1)
+
+        verificar = verificador(self.token)
+        reglas, terminales = self._forma_normal()
+        total = len(reglas)
+        anulable = self._anulables(reglas)
+
+        # Dentro de un mismo nivel, A depende de X por A -> X, o por A -> X Y
+        # y A -> Y X con Y anulable; hace falta un orden topológico.
+        dependencias: List[Set[int]] = [set() for _ in range(total)]
+        for a in range(total):
+            for c in reglas[a]:
+                if len(c) == 1:
+                    dependencias[a].add(c[0])
+                elif len(c) == 2:
+                    if anulable[c[1]]:
+                        dependencias[a].add(c[0])
+                    if anulable[c[0]]:
+                        dependencias[a].add(c[1])
+        orden: List[int] = []
+        estado = [0] * total  # 0 = sin visitar, 1 = en la pila, 2 = listo
+        for raiz in range(total):
+            if estado[raiz]:
+                continue
+            estado[raiz] = 1
+            pila = [(raiz, iter(dependencias[raiz]))]
+            while pila:
+                x, pendientes = pila[-1]
+                for y in pendientes:
+                    if estado[y] == 1:
+                        raise ValueError(
+                            "La gramática tiene ciclos de reglas unitarias o anulables: "
+                            "el número de derivaciones no es finito."
+                        )
+                    if estado[y] == 0:
+                        estado[y] = 1
+                        pila.append((y, iter(dependencias[y])))
+                        break
+                else:
+                    estado[x] = 2
+                    orden.append(x)
+                    pila.pop()
+
+        N: List[List[int]] = [[0] * (self.n_max + 1) for _ in range(total)]
+        for k in range(self.n_max + 1):
+            verificar()
+            for a in orden:
+                if a in terminales:
+                    N[a][k] = int(len(terminales[a]) == k)
+                    continue
+                cuenta = 0
+                for c in reglas[a]:
+                    if not c:
+                        cuenta += int(k == 0)
+                    elif len(c) == 1:
+                        cuenta += N[c[0]][k]
+                    else:
+                        nx, ny = N[c[0]], N[c[1]]
+                        cuenta += sum(nx[i] * ny[k - i] for i in range(k + 1))
+                N[a][k] = cuenta
+        return N[0]
 
-            if nombre_nt in self.mapa_gramatica:
-                for beta in self.mapa_gramatica[nombre_nt]:
-                    cadenas_nt.update(self._generar(beta, cache, longitud_actual))
+    def iterar_longitudes(self) -> Iterator[Tuple[int, Set[str]]]:
+        """
+        Entrega (k, cadenas de longitud exactamente k) para k = 0..n_max,
+        calculando cada nivel solo cuando se pide.
+        """
+        if not self.simbolo_inicial:
+            for k in range(self.n_max + 1):
+                yield k, set()
+            return
+
+        verificar = verificador(self.token)
+        reglas, terminales = self._forma_normal()
+        total = len(reglas)
 
-            cache[nombre_nt] = cadenas_nt
+        anulable = self._anulables(reglas)
 
-        cadenas_resto = self._generar(resto, cache, longitud_actual)
-        resultado_final: Set[str] = set()
+        # Dentro de un mismo nivel k, L[A][k] incluye L[X][k] si hay una regla
+        # A -> X, A -> X Y con Y anulable o A -> Y X con Y anulable.
+        mismo_nivel: List[List[int]] = [[] for _ in range(total)]
+        binarias: List[Tuple[int, int, int]] = []
+        for a in range(total):
+            for c in reglas[a]:
+                if len(c) == 1:
+                    mismo_nivel[c[0]].append(a)
+                elif len(c) == 2:
+                    binarias.append((a, c[0], c[1]))
+                    if anulable[c[1]]:
+                        mismo_nivel[c[0]].append(a)
+                    if anulable[c[0]]:
+                        mismo_nivel[c[1]].append(a)
 
-        for s_nt in cadenas_nt:
-            for s_resto in cadenas_resto:
-                nueva = s_nt + s_resto
-                if len(nueva) <= self.n_max:
-                    resultado_final.add(nueva)
+        # Solo los operandos de reglas binarias necesitan sus niveles anteriores
+        L: Dict[int, List[Set[str]]] = {}
+        for _, x, y in binarias:
+            L.setdefault(x, [])
+            L.setdefault(y, [])
+        self.cadenas_guardadas = 0
+        for k in range(self.n_max + 1):
+            nivel: List[Set[str]] = [set() for _ in range(total)]
+            for x, texto in terminales.items():
+                if len(texto) == k:
+                    nivel[x].add(texto)
+            if k == 0:
+                for x in range(total):
+                    if anulable[x]:
+                        nivel[x].add("")
+            for a, x, y in binarias:
+                verificar()
+                for i in range(1, k):
+                    izquierdas, derechas = L[x][i], L[y][k - i]
+                    if izquierdas and derechas:
+                        nivel[a].update(u + v for u in izquierdas for v in derechas)
 
-        return resultado_final
+            # Punto fijo del nivel k
+            pila = [x for x in range(total) if nivel[x]]
+            while pila:
+                x = pila.pop()
+                for a in mismo_nivel[x]:
+                    if not nivel[x] <= nivel[a]:
+                        nivel[a] |= nivel[x]
+                        pila.append(a)
+
+            for x, historia in L.items():
+                historia.append(nivel[x])
+                self.cadenas_guardadas += len(nivel[x])
+            yield k, nivel[0]
 
     def generar_cadenas(self) -> Set[str]:
         """
         Genera las cadenas posibles desde el símbolo inicial hasta longitud n_max.
         """
-        if not self.simbolo_inicial:
-            return set()
-        simbolo_inicial = Simbolo(self.simbolo_inicial, es_terminal=False)
-        return self._generar([simbolo_inicial], {}, 0)
+        cadenas: Set[str] = set()
+        for _, nivel in self.iterar_longitudes():
+            cadenas |= nivel
+        return cadenas
+
+
+# ==============================
+#   Comparación por conteo
+# ==============================
+
+def _es_regular_de_un_caracter(producciones: List[Produccion]) -> bool:
+    """Tipo 3 y todos los terminales de un solo carácter (longitud = número de pasos)."""
+    if not producciones or ClasificadorChomsky(producciones).veredicto() != 3:
+        return False
+    return all(len(s.valor) == 1 for p in producciones for s in p.beta if s.es_terminal)
+
+
+def _afd_de_gramatica(
+    producciones: List[Produccion], alfabeto: Set[str], token: Optional[TokenCancelacion] = None
+) -> AFDDenso:
+    """Gramática regular -> NFA -> AFD denso sobre el alfabeto común."""
+    nfa = convertir_gramatica_a_nfa(producciones)
+    return AFDDenso.desde_spec(convertir_nfa_a_afd(nfa, alfabeto, token))
+
+
+class _ProductoAFD:
+    """
+    Producto de dos AFD sobre el mismo alfabeto. Un estado es un par (p, q);
+    SIN_TRANSICION hace de sumidero en cada componente.
+    """
+
+    def __init__(self, afd1: AFDDenso, afd2: AFDDenso):
+        self.afd1, self.afd2 = afd1, afd2
+        self.m = len(afd1.simbolos)
+        self.inicial = (afd1.inicial, afd2.inicial)
+
+    def acepta(self, estado: Tuple[int, int]) -> Tuple[bool, bool]:
+        p, q = estado
+        return (
+            p != SIN_TRANSICION and self.afd1.aceptacion[p] == 1,
+            q != SIN_TRANSICION and self.afd2.aceptacion[q] == 1,
+        )
+
+    def sucesores(self, estado: Tuple[int, int]) -> Iterator[Tuple[int, Tuple[int, int]]]:
+        """(columna, estado siguiente), sin el par (sumidero, sumidero)."""
+        p, q = estado
+        for c in range(self.m):
+            p2 = self.afd1.siguiente(p, c) if p != SIN_TRANSICION else SIN_TRANSICION
+            q2 = self.afd2.siguiente(q, c) if q != SIN_TRANSICION else SIN_TRANSICION
+            if p2 != SIN_TRANSICION or q2 != SIN_TRANSICION:
+                yield c, (p2, q2)
+
+    def cadena_distinguible(self) -> Optional[Tuple[str, bool]]:
+        """
+        BFS sobre los pares alcanzables. Devuelve (cadena, está_en_L1) para la
+        cadena más corta (y primera en orden lexicográfico) aceptada por solo
+        uno de los dos AFD, o None si aceptan el mismo lenguaje.
+        """
+        padres: Dict[Tuple[int, int], Optional[Tuple[Tuple[int, int], int]]] = {self.inicial: None}
+        cola = deque([self.inicial])
+        while cola:
+            estado = cola.popleft()
+            en1, en2 = self.acepta(estado)
+            if en1 != en2:
+                simbolos: List[str] = []
+                while padres[estado] is not None:
+                    estado, c = padres[estado]
+                    simbolos.append(self.afd1.simbolos[c])
+                return "".join(reversed(simbolos)), en1
+            for c, destino in self.sucesores(estado):
+                if destino not in padres:
+                    padres[destino] = (estado, c)
+                    cola.append(destino)
+        return None
+
+
+def comparar_regulares(
+    g1: List[Produccion], g2: List[Produccion], token: Optional[TokenCancelacion] = None
+) -> Tuple[bool, str]:
+    """
+    Decisión exacta para gramáticas regulares (Tipo 3, terminales de un
+    carácter): gramática -> NFA -> AFD -> AFD mínimo (Hopcroft) y BFS sobre el
+    producto de ambos AFD mínimos en busca de la cadena más corta que los
+    distingue. Si los lenguajes son iguales, los pares alcanzables son una
+    biyección entre los estados de ambos AFD mínimos, así que la búsqueda es
+    lineal en su tamaño.
+    """
+    alfabeto = {s.valor for g in (g1, g2) for p in g for s in p.beta if s.es_terminal}
+    afd1 = minimizar_afd(_afd_de_gramatica(g1, alfabeto, token))
+    afd2 = minimizar_afd(_afd_de_gramatica(g2, alfabeto, token))
+    diferencia = _ProductoAFD(afd1, afd2).cadena_distinguible()
+
+    if diferencia is None:
+        return True, (
+            f"Equivalentes.\n\n"
+            f"Ambas gramáticas son regulares: sus AFD mínimos ({len(afd1)} y {len(afd2)} "
+            f"estados) aceptan exactamente el mismo lenguaje, sin límite de longitud."
+        )
+
+    cadena, en_g1 = diferencia
+    return False, (
+        f"No equivalentes.\n\n"
+        f"Ambas gramáticas son regulares; la cadena más corta que las distingue es "
+        f"'{cadena or 'ε'}', que solo genera la Gramática {1 if en_g1 else 2}."
+    )
+
+
+def _huella(cadenas: Set[str]) -> int:
+    """Huella del conjunto: XOR de blake2b de cada cadena (no depende del orden)."""
+    acumulado = 0
+    for cadena in cadenas:
+        acumulado ^= int.from_bytes(blake2b(cadena.encode("utf-8"), digest_size=16).digest(), "big")
+    return acumulado
+
+
+# Cadenas que la comparación por conteo puede tener en memoria (sumando
+# ambas gramáticas) al verificar los conjuntos de cada longitud.
+LIMITE_CADENAS_CONTEO = 500_000
+
+
+def _conteos_o_none(producciones: List[Produccion], n_max: int, token: Optional[TokenCancelacion]) -> Optional[List[int]]:
+    try:
+        return AnalizadorEquivalencia(producciones, n_max, token).contar_derivaciones()
+    except ValueError:
+        return None
+
+
+def comparar_por_conteo(
+    g1: List[Produccion],
+    g2: List[Produccion],
+    n_max: int = 5,
+    token: Optional[TokenCancelacion] = None,
+    limite_cadenas: int = LIMITE_CADENAS_CONTEO,
+) -> Tuple[bool, str]:
+    """
+    Compara dos gramáticas longitud por longitud, pensado para n grande.
+
+    - Si ambas son regulares (Tipo 3, terminales de un carácter), la
+      respuesta exacta de comparar_regulares no depende de n.
+    - Si no, calcula el número de derivaciones de cada longitud hasta
+      n_max (AnalizadorEquivalencia.contar_derivaciones: solo enteros) y
+      compara los conjuntos de cada longitud, de menor a mayor, mientras
+      las cadenas guardadas no pasen de `limite_cadenas`. La primera
+      diferencia que se informa es siempre la de los conjuntos.
+    - Si se llega al límite antes de n_max, el resto solo se puede juzgar
+      por los conteos: para gramáticas no ambiguas son el número de
+      cadenas distintas de cada longitud. Si coinciden, la respuesta es
+      "Posible equivalencia" y el mensaje lo dice; si difieren, o no se
+      pueden usar (gramáticas ambiguas o con ciclos), el resultado es
+      "No concluyente" y se devuelve False.
+    """
+    if _es_regular_de_un_caracter(g1) and _es_regular_de_un_caracter(g2):
+        return comparar_regulares(g1, g2, token)
+
+    conteos1 = _conteos_o_none(g1, n_max, token)
+    conteos2 = _conteos_o_none(g2, n_max, token)
+    conteos_utiles = conteos1 is not None and conteos2 is not None
+    k_conteo = None
+    if conteos_utiles:
+        k_conteo = next((k for k in range(n_max + 1) if conteos1[k] != conteos2[k]), None)
+
+    analizador1 = AnalizadorEquivalencia(g1, n_max, token)
+    analizador2 = AnalizadorEquivalencia(g2, n_max, token)
+    total = 0
+    verificada = -1
+    for (k, nivel1), (_, nivel2) in zip(analizador1.iterar_longitudes(), analizador2.iterar_longitudes()):
+        _informar_longitud(token, k, n_max)
+        if nivel1 != nivel2:
+            return False, _mensaje_diferencia(
+                n_max, k, len(nivel1), len(nivel2), sorted(nivel1 - nivel2)[:5], sorted(nivel2 - nivel1)[:5]
+            )
+        if k == k_conteo:
+            # Mismas cadenas con distinto número de derivaciones: alguna
+            # gramática es ambigua y los conteos ya no sirven de evidencia
+            conteos_utiles = False
+        total += len(nivel1)
+        verificada = k
+        if analizador1.cadenas_guardadas + analizador2.cadenas_guardadas > limite_cadenas:
+            break
+
+    if verificada == n_max:
+        return True, _mensaje_igualdad(n_max, total, "conjuntos de cada longitud")
+    detalle = (
+        f"Ambas gramáticas generan las mismas cadenas hasta longitud {verificada} ({total} en total); "
+        f"más allá se alcanzó el límite de {limite_cadenas} cadenas en memoria."
+    )
+    if conteos_utiles and k_conteo is None:
+        detalle += (
+            f"\nDe {verificada + 1} a {n_max} coincide el número de derivaciones de cada longitud "
+            f"(es el número de cadenas si las gramáticas no son ambiguas)."
+        )
+        return True, f"Posible equivalencia.\n\n{detalle}"
+    if conteos_utiles:
+        detalle += (
+            f"\nEn la longitud {k_conteo} el número de derivaciones difiere ({conteos1[k_conteo]} contra "
+            f"{conteos2[k_conteo]}): si ninguna gramática es ambigua, no son equivalentes, pero las "
+            f"cadenas de esa longitud no se compararon."
+        )
+    else:
+        detalle += (
+            f"\nDe {verificada + 1} a {n_max} no se comparó nada: las gramáticas son ambiguas o tienen "
+            f"ciclos, así que el número de derivaciones no dice cuántas cadenas hay."
+        )
+    return False, f"No concluyente.\n\n{detalle}"
+
+
+def _informar_longitud(token: Optional[TokenCancelacion], k: int, n_max: int) -> None:
+    if token is not None:
+        token.informar(f"Longitud {k} de {n_max} comparada...")
+
+
+# ==============================
+#   Comparación por niveles
+# ==============================
+
+# Con n_max menor que este umbral, crear los procesos cuesta más
+# que enumerar ambas gramáticas en el proceso actual.
+UMBRAL_PARALELO = 8
+
+
+def _resumen_niveles(
+    producciones: List[Produccion], n_max: int, token: Optional[TokenCancelacion] = None
+) -> Iterator[Tuple[int, int, int]]:
+    """(k, tamaño, huella) de cada nivel; los conjuntos no salen de aquí."""
+    for k, nivel in AnalizadorEquivalencia(producciones, n_max, token).iterar_longitudes():
+        yield k, len(nivel), _huella(nivel)
+
+
+def _trabajador_niveles(indice: int, producciones: List[Produccion], n_max: int, cola) -> None:
+    """Proceso de trabajo: envía el resumen de cada nivel en cuanto lo calcula."""
+    try:
+        for k, tamano, huella in _resumen_niveles(producciones, n_max):
+            cola.put((indice, k, tamano, huella))
+    except Exception as e:
+        cola.put((indice, -1, 0, f"{type(e).__name__}: {e}"))
+
+
+def _niveles_en_serie(g1: List[Produccion], g2: List[Produccion], n_max: int, token: Optional[TokenCancelacion] = None):
+    for (k, t1, h1), (_, t2, h2) in zip(_resumen_niveles(g1, n_max, token), _resumen_niveles(g2, n_max, token)):
+        yield k, (t1, h1), (t2, h2)
+
+
+def _niveles_en_paralelo(g1: List[Produccion], g2: List[Produccion], n_max: int, token: Optional[TokenCancelacion] = None):
+    """
+    Enumera cada gramática en su propio proceso y entrega los resúmenes
+    de ambas, nivel por nivel y en orden. Al cerrar el generador (por
+    ejemplo, al encontrar una diferencia) o al cancelar con el token, los
+    procesos se terminan.
+    """
+    verificar = verificador(token)
+    cola = multiprocessing.Queue()
+    procesos = [
+        multiprocessing.Process(target=_trabajador_niveles, args=(i, g, n_max, cola), daemon=True)
+        for i, g in enumerate((g1, g2))
+    ]
+    for proceso in procesos:
+        proceso.start()
+    try:
+        recibidos: Tuple[Dict[int, Tuple[int, int]], ...] = ({}, {})
+        for k in range(n_max + 1):
+            while k not in recibidos[0] or k not in recibidos[1]:
+                verificar()
+                try:
+                    indice, nivel, tamano, huella = cola.get(timeout=0.5)
+                except queue.Empty:
+                    if any(p.exitcode not in (None, 0) for p in procesos):
+                        raise RuntimeError("Un proceso de enumeración terminó de forma inesperada.")
+                    continue
+                if nivel < 0:
+                    raise RuntimeError(f"Gramática {indice + 1}: {huella}")
+                recibidos[indice][nivel] = (tamano, huella)
+            yield k, recibidos[0].pop(k), recibidos[1].pop(k)
+    finally:
+        for proceso in procesos:
+            if proceso.is_alive():
+                proceso.terminate()
+            proceso.join()
+        cola.close()
+
+
+def _nivel(producciones: List[Produccion], k: int, token: Optional[TokenCancelacion] = None) -> Set[str]:
+    """Cadenas de longitud exactamente k."""
+    nivel: Set[str] = set()
+    for _, nivel in AnalizadorEquivalencia(producciones, k, token).iterar_longitudes():
+        pass
+    return nivel
+
+
+def _comparar_por_niveles(
+    g1: List[Produccion], g2: List[Produccion], n_max: int, paralelo: bool, token: Optional[TokenCancelacion] = None
+) -> Tuple[Optional[Tuple[int, int, int, List[str], List[str]]], int]:
+    """
+    Compara tamaño y huella de cada longitud, de menor a mayor, y se detiene
+    en la primera diferencia. Devuelve (diferencia, total): diferencia es
+    None si todas las longitudes coinciden, o (k, |L1_k|, |L2_k|, solo_g1,
+    solo_g2) con los ejemplos de esa longitud, que se calculan aquí mismo.
+    """
+    if paralelo:
+        niveles = _niveles_en_paralelo(g1, g2, n_max, token)
+    else:
+        niveles = _niveles_en_serie(g1, g2, n_max, token)
+
+    total = 0
+    with closing(niveles):
+        for k, (t1, h1), (t2, h2) in niveles:
+            _informar_longitud(token, k, n_max)
+            if t1 == t2 and h1 == h2:
+                total += t1
+                continue
+            break
+        else:
+            return None, total
+
+    nivel1, nivel2 = _nivel(g1, k, token), _nivel(g2, k, token)
+    solo_g1 = sorted(nivel1 - nivel2)[:5]
+    solo_g2 = sorted(nivel2 - nivel1)[:5]
+    return (k, t1, t2, solo_g1, solo_g2), total
+
+
+def _mensaje_igualdad(n_max: int, total: int, metodo: str) -> str:
+    return (
+        f"Posible equivalencia.\n\n"
+        f"Para cada longitud hasta {n_max}, ambas gramáticas generan las mismas "
+        f"cadenas ({total} en total; comparadas por {metodo})."
+    )
+
+
+def _mensaje_diferencia(
+    n_max: int, k: int, c1: int, c2: int, solo_g1: List[str], solo_g2: List[str]
+) -> str:
+    return (
+        f"No equivalentes (para n = {n_max}).\n\n"
+        f"Primera longitud con diferencias: {k} "
+        f"({c1} cadenas en Gramática 1, {c2} en Gramática 2).\n"
+        f"Cadenas solo en Gramática 1: {solo_g1}\n"
+        f"Cadenas solo en Gramática 2: {solo_g2}"
+    )
 
 
 def comparar_gramaticas(
     g1: List[Produccion],
     g2: List[Produccion],
     n_max: int = 5,
+    solo_conteo: bool = False,
+    paralelo: Optional[bool] = None,
+    token: Optional[TokenCancelacion] = None,
 ) -> Tuple[bool, str]:
     """
     Compara dos gramáticas generando sus lenguajes hasta longitud n_max.
     Devuelve (son_equivalentes, mensaje_explicativo).
+    Si ambas son regulares (Tipo 3, terminales de un carácter) la respuesta
+    es exacta y no depende de n_max (ver comparar_regulares).
+    Con solo_conteo=True compara los conjuntos solo hasta un límite de
+    memoria y, más allá, el número de derivaciones de cada longitud (ver
+    comparar_por_conteo), útil para n grandes; si eso no basta para
+    decidir, devuelve False con un mensaje "No concluyente".
+    En otro caso, las dos gramáticas se enumeran a la vez en procesos
+    separados (paralelo=None decide según UMBRAL_PARALELO), longitud por
+    longitud, y ambas se detienen en la primera longitud con diferencias.
+    Con un token, la comparación se puede cancelar: lanza TareaCancelada.
     """
     try:
-        set1 = AnalizadorEquivalencia(g1, n_max).generar_cadenas()
-        set2 = AnalizadorEquivalencia(g2, n_max).generar_cadenas()
+        if _es_regular_de_un_caracter(g1) and _es_regular_de_un_caracter(g2):
+            return comparar_regulares(g1, g2, token)
+        if solo_conteo:
+            return comparar_por_conteo(g1, g2, n_max, token)
+        if paralelo is None:
+            paralelo = n_max >= UMBRAL_PARALELO
+        diferencia, total = _comparar_por_niveles(g1, g2, n_max, paralelo, token)
+    except TareaCancelada:
+        raise
     except Exception as e:
-        return False, f"Error durante la generación de cadenas (posible recursión infinita): {e}"
+        return False, f"Error durante la generación de cadenas: {e}"
 
-    if set1 == set2:
+    if diferencia is None:
         return True, (
             f"Posible equivalencia.\n\n"
-            f"Ambas gramáticas generan el mismo conjunto de {len(set1)} "
+            f"Ambas gramáticas generan el mismo conjunto de {total} "
             f"cadenas (hasta longitud {n_max})."
         )
-
-    solo_g1 = list(set1 - set2)[:5]
-    solo_g2 = list(set2 - set1)[:5]
-
-    mensaje = (
-        f"No equivalentes (para n = {n_max}).\n\n"
-        f"Cadenas solo en Gramática 1: {solo_g1}\n"
-        f"Cadenas solo en Gramática 2: {solo_g2}"
-    )
-    return False, mensaje
+    return False, _mensaje_diferencia(n_max, *diferencia)
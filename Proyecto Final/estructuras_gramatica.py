@@ -1,26 +1,123 @@
+import codecs
+import mmap
+import os
 import re
-from typing import List, Dict
+import sys
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
 
-from utilidades_generales import EPSILON_GRAMATICA
+from utilidades_generales import EPSILON_GRAMATICA, NodoArbol
 
 
 class Simbolo:
-    """Un símbolo de la gramática (terminal o no-terminal)."""
+    """
+    Un símbolo de la gramática (terminal o no-terminal).
+    Dentro de una gramática cada símbolo existe una sola vez (ver
+    TablaSimbolos) y se identifica con un entero pequeño `id`.
+    Los símbolos creados fuera de una tabla tienen id = -1.
+    """
 
-    def __init__(self, valor: str, es_terminal: bool):
+    __slots__ = ("valor", "es_terminal", "id")
+
+    def __init__(self, valor: str, es_terminal: bool, id: int = -1):
         self.valor = valor
         self.es_terminal = es_terminal
+        self.id = id
 
     def __repr__(self):
         return f"'{self.valor}'" if self.es_terminal else f"<{self.valor}>"
 
 
+class TablaSimbolos:
+    """
+    Tabla de símbolos de una gramática.
+    Interna cada símbolo una sola vez y le asigna un id consecutivo
+    (0, 1, 2, ...), de modo que las producciones pueden compararse
+    y usarse como llaves a través de tuplas de enteros.
+    """
+
+    __slots__ = ("simbolos", "_por_clave", "_por_token", "_cuerpos")
+
+    def __init__(self):
+        self.simbolos: List[Simbolo] = []
+        self._por_clave: Dict[Tuple[str, bool], Simbolo] = {}
+        self._por_token: Dict[str, Simbolo] = {}
+        self._cuerpos: Dict[Tuple[Simbolo, ...], Tuple[Tuple[Simbolo, ...], Tuple[int, ...]]] = {}
+
+    def interna(self, valor: str, es_terminal: bool) -> Simbolo:
+        """Devuelve el símbolo único para (valor, es_terminal), creándolo si hace falta."""
+        clave = (valor, es_terminal)
+        simbolo = self._por_clave.get(clave)
+        if simbolo is None:
+            simbolo = Simbolo(sys.intern(valor), es_terminal, len(self.simbolos))
+            self.simbolos.append(simbolo)
+            self._por_clave[clave] = simbolo
+        return simbolo
+
+    def desde_token(self, token: str) -> Simbolo:
+        """Interna el símbolo correspondiente a un token tal como aparece en el texto."""
+        simbolo = self._por_token.get(token)
+        if simbolo is None:
+            es_nt = _es_no_terminal(token)
+            valor = _normalizar_no_terminal(token) if es_nt else token
+            simbolo = self.interna(valor, es_terminal=not es_nt)
+            self._por_token[token] = simbolo
+        return simbolo
+
+    def cuerpo(self, simbolos: Iterable[Simbolo]) -> Tuple[Tuple[Simbolo, ...], Tuple[int, ...]]:
+        """
+        Interna una secuencia de símbolos y devuelve (tupla_simbolos, tupla_ids).
+        Las secuencias repetidas comparten las mismas tuplas.
+        """
+        simbolos = tuple(simbolos)
+        par = self._cuerpos.get(simbolos)
+        if par is None:
+            par = (simbolos, tuple(s.id for s in simbolos))
+            self._cuerpos[simbolos] = par
+        return par
+
+    def produccion(self, lado_izquierdo: Iterable[Simbolo], lado_derecho: Iterable[Simbolo]) -> "Produccion":
+        """Crea una Produccion cuyos lados quedan internados en esta tabla."""
+        alpha, ids_alpha = self.cuerpo(lado_izquierdo)
+        beta, ids_beta = self.cuerpo(lado_derecho)
+        return Produccion(alpha, beta, ids_alpha, ids_beta)
+
+    def __len__(self) -> int:
+        return len(self.simbolos)
+
+    def __getitem__(self, id_simbolo: int) -> Simbolo:
+        return self.simbolos[id_simbolo]
+
+
 class Produccion:
-    """Producción limpia: alpha -> beta (listas de símbolos)."""
+    """
+    Producción limpia: alpha -> beta (tuplas de símbolos).
+    Guarda además los cuerpos como tuplas de ids (ids_alpha, ids_beta)
+    para poder comparar y usar producciones como llaves sin recorrer
+    cadenas de texto.
+    """
+
+    __slots__ = ("alpha", "beta", "ids_alpha", "ids_beta")
+
+    def __init__(
+        self,
+        lado_izquierdo: Iterable[Simbolo],
+        lado_derecho: Iterable[Simbolo],
+        ids_izquierdo: Optional[Tuple[int, ...]] = None,
+        ids_derecho: Optional[Tuple[int, ...]] = None,
+    ):
+        self.alpha: Tuple[Simbolo, ...] = tuple(lado_izquierdo)
+        self.beta: Tuple[Simbolo, ...] = tuple(lado_derecho)
+        self.ids_alpha: Tuple[int, ...] = (
+            ids_izquierdo if ids_izquierdo is not None else tuple(s.id for s in self.alpha)
+        )
+        self.ids_beta: Tuple[int, ...] = (
+            ids_derecho if ids_derecho is not None else tuple(s.id for s in self.beta)
+        )
 
-    def __init__(self, lado_izquierdo: List[Simbolo], lado_derecho: List[Simbolo]):
-        self.alpha = lado_izquierdo
-        self.beta = lado_derecho
+    @property
+    def clave(self) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+        """Llave hashable (ids_alpha, ids_beta), válida dentro de una misma tabla."""
+        return self.ids_alpha, self.ids_beta
 
     def __repr__(self):
         alpha_str = " ".join(s.valor for s in self.alpha)
@@ -50,17 +147,27 @@ def _normalizar_no_terminal(nombre: str) -> str:
     return nombre
 
 
-def _crear_simbolo(token: str) -> Simbolo:
+def _crear_simbolo(token: str, tabla: Optional[TablaSimbolos] = None) -> Simbolo:
+    if tabla is not None:
+        return tabla.desde_token(token)
     es_nt = _es_no_terminal(token)
     valor = _normalizar_no_terminal(token) if es_nt else token
     return Simbolo(valor, es_terminal=not es_nt)
 
 
-def leer_linea_gramatica(linea: str, numero_linea: int) -> List[Produccion]:
+_TEXTOS_EPSILON = frozenset({EPSILON_GRAMATICA, "ε", "E", "eps", "EPS"})
+
+
+def leer_linea_gramatica(
+    linea: str,
+    numero_linea: int,
+    tabla: Optional[TablaSimbolos] = None,
+) -> List[Produccion]:
     """
     Lee una línea de la forma:
         S -> a S b | a b
     y la convierte en una o varias Produccion.
+    Si se pasa una TablaSimbolos, los símbolos se internan en ella.
     """
     sin_comentario = linea.split("#", 1)[0].strip()
     if not sin_comentario:
@@ -81,40 +188,110 @@ def leer_linea_gramatica(linea: str, numero_linea: int) -> List[Produccion]:
         raise ValueError(f"Línea {numero_linea}: el lado derecho está vacío.")
 
     tokens_izq = lado_izq.split()
-    alpha = [_crear_simbolo(t) for t in tokens_izq]
+    alpha = [_crear_simbolo(t, tabla) for t in tokens_izq]
 
     producciones: List[Produccion] = []
     alternativas = [alt.strip() for alt in lado_der.split("|")]
 
     for alt in alternativas:
-        if not alt or alt in {EPSILON_GRAMATICA, "ε", "E", "eps", "EPS"}:
+        if not alt or alt in _TEXTOS_EPSILON:
             beta: List[Simbolo] = []
         else:
             tokens_der = alt.split()
-            beta = [_crear_simbolo(t) for t in tokens_der]
-        producciones.append(Produccion(alpha, beta))
+            beta = [_crear_simbolo(t, tabla) for t in tokens_der]
+        if tabla is not None:
+            producciones.append(tabla.produccion(alpha, beta))
+        else:
+            producciones.append(Produccion(alpha, beta))
 
     return producciones
 
 
-def leer_gramatica_desde_texto(texto: str) -> List[Produccion]:
+TAM_BLOQUE_LECTURA = 1 << 20
+
+
+def iterar_lineas_archivo(
+    ruta: Union[str, os.PathLike],
+    usar_mmap: bool = True,
+    codificacion: str = "utf-8",
+    tam_bloque: int = TAM_BLOQUE_LECTURA,
+) -> Iterator[str]:
     """
-    Lee un bloque de texto con varias líneas de gramática
-    y devuelve la lista de producciones.
+    Entrega las líneas de un archivo una por una, sin cargarlo completo.
+    Con usar_mmap=True el archivo se mapea en memoria (útil para archivos
+    de cientos de MB generados automáticamente).
+    Lee por bloques y corta con los mismos separadores que str.splitlines
+    (\n, \r, \r\n, ...), así que da las mismas líneas que
+    leer_gramatica_desde_texto sobre el texto completo.
     """
-    producciones: List[Produccion] = []
-    for i, linea in enumerate(texto.splitlines(), start=1):
+    decodificador = codecs.getincrementaldecoder(codificacion)()
+    with open(ruta, "rb") as f:
+        if usar_mmap and os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                bloques = (mapa[i:i + tam_bloque] for i in range(0, len(mapa), tam_bloque))
+                yield from _cortar_lineas(bloques, decodificador)
+        else:
+            yield from _cortar_lineas(iter(lambda: f.read(tam_bloque), b""), decodificador)
+
+
+def _cortar_lineas(bloques: Iterable[bytes], decodificador: codecs.IncrementalDecoder) -> Iterator[str]:
+    """Parte en líneas (como str.splitlines) un texto que llega por bloques de bytes."""
+    pendiente = ""
+    for bloque in bloques:
+        texto = pendiente + decodificador.decode(bloque)
+        # Un \r final se guarda: el \n que lo completa puede venir en el bloque siguiente
+        corte = len(texto) - 1 if texto.endswith("\r") else len(texto)
+        # Con el centinela, la última parte es siempre la línea aún incompleta
+        lineas = (texto[:corte] + "x").splitlines()
+        pendiente = lineas.pop()[:-1] + texto[corte:]
+        yield from lineas
+    pendiente += decodificador.decode(b"", final=True)
+    yield from pendiente.splitlines()
+
+
+def iterar_producciones(
+    fuente: Union[str, os.PathLike, Iterable[str]],
+    tabla: Optional[TablaSimbolos] = None,
+    usar_mmap: bool = True,
+) -> Iterator[Produccion]:
+    """
+    Lector por flujo: entrega las producciones una por una.
+    - fuente: ruta de un archivo (str o Path) o cualquier iterable de líneas.
+    Los errores conservan el número de línea, igual que leer_gramatica_desde_texto.
+    """
+    if isinstance(fuente, (str, os.PathLike)):
+        lineas: Iterable[str] = iterar_lineas_archivo(fuente, usar_mmap)
+    else:
+        lineas = fuente
+    if tabla is None:
+        tabla = TablaSimbolos()
+
+    hubo_producciones = False
+    for i, linea in enumerate(lineas, start=1):
         if not linea.strip():
             continue
-        prods_linea = leer_linea_gramatica(linea, i)
-        producciones.extend(prods_linea)
+        for produccion in leer_linea_gramatica(linea, i, tabla):
+            hubo_producciones = True
+            yield produccion
 
-    if not producciones:
+    if not hubo_producciones:
         raise ValueError("La gramática está vacía o solo contiene comentarios/espacios.")
-    return producciones
 
 
-def producciones_a_texto(producciones: List[Produccion]) -> str:
+def leer_gramatica_desde_texto(
+    texto: str,
+    tabla: Optional[TablaSimbolos] = None,
+) -> List[Produccion]:
+    """
+    Lee un bloque de texto con varias líneas de gramática
+    y devuelve la lista de producciones.
+    Todos los símbolos quedan internados en una misma TablaSimbolos
+    (una nueva si no se pasa ninguna).
+    """
+    return list(iterar_producciones(texto.splitlines(), tabla))
+
+
+def producciones_a_texto(producciones: Iterable[Produccion]) -> str:
     """
     Convierte una lista de Produccion a una gramática en texto,
     agrupando alternativas por lado izquierdo.
@@ -130,3 +307,73 @@ def producciones_a_texto(producciones: List[Produccion]) -> str:
         rhs = " | ".join(betas)
         lineas.append(f"{alpha_str} -> {rhs}")
     return "\n".join(lineas)
+
+
+# ==========================================
+#   Gramática de gramáticas (analizador LL(1))
+# ==========================================
+
+# Gramática LL(1) del formato de texto de las gramáticas, escrita sobre los
+# tipos de token de AnalizadorLexicoGramaticas.tokenizar_texto(...,
+# incluir_fin_linea=True). Se usa con motor_ll1 y el árbol resultante se
+# convierte en producciones con extraer_producciones.
+SIMBOLO_INICIAL_GRAMATICA = "Gramatica"
+GRAMATICA_DE_GRAMATICAS: Dict[str, List[List[str]]] = {
+    "Gramatica": [["Lineas"]],
+    "Lineas": [["FIN_LINEA", "Lineas"], ["Regla", "RestoLineas"], [EPSILON_GRAMATICA]],
+    "RestoLineas": [["FIN_LINEA", "Lineas"], [EPSILON_GRAMATICA]],
+    "Regla": [["LadoIzquierdo", "PRODUCCION", "Alternativas"]],
+    "LadoIzquierdo": [["Simbolo", "Simbolos"]],
+    "Alternativas": [["Cuerpo", "MasAlternativas"]],
+    "MasAlternativas": [["PIPE", "Cuerpo", "MasAlternativas"], [EPSILON_GRAMATICA]],
+    "Cuerpo": [["EPSILON"], ["Simbolo", "Simbolos"], [EPSILON_GRAMATICA]],
+    "Simbolos": [["Simbolo", "Simbolos"], [EPSILON_GRAMATICA]],
+    "Simbolo": [["NO_TERMINAL"], ["TERMINAL"]],
+}
+
+
+def _nodos_en_orden(raiz: NodoArbol, buscados: Tuple[str, ...], sin_entrar: Tuple[str, ...] = ()) -> List[NodoArbol]:
+    """
+    Nodos con símbolo en `buscados`, en orden de izquierda a derecha, sin
+    descender dentro de ellos ni de los símbolos en `sin_entrar`
+    (recorrido con pila, para no depender de la profundidad del árbol).
+    """
+    encontrados: List[NodoArbol] = []
+    pila = [raiz]
+    while pila:
+        nodo = pila.pop()
+        if nodo.simbolo in buscados:
+            encontrados.append(nodo)
+        elif nodo.simbolo not in sin_entrar:
+            pila.extend(reversed(nodo.hijos))
+    return encontrados
+
+
+def extraer_producciones(arbol: Optional[NodoArbol], tabla: Optional[TablaSimbolos] = None) -> List[Produccion]:
+    """
+    Convierte el árbol que produce el analizador LL(1) con
+    GRAMATICA_DE_GRAMATICAS en la lista de producciones.
+    Los símbolos se toman del tipo de token (NO_TERMINAL / TERMINAL).
+    """
+    if arbol is None:
+        return []
+    if tabla is None:
+        tabla = TablaSimbolos()
+
+    def simbolos(nodo: NodoArbol) -> List[Simbolo]:
+        hojas = _nodos_en_orden(nodo, ("NO_TERMINAL", "TERMINAL"))
+        return [
+            tabla.interna(_normalizar_no_terminal(h.lexema), es_terminal=False)
+            if h.simbolo == "NO_TERMINAL"
+            else tabla.interna(h.lexema, es_terminal=True)
+            for h in hojas
+        ]
+
+    producciones: List[Produccion] = []
+    for regla in _nodos_en_orden(arbol, ("Regla",)):
+        lado_izquierdo, _, alternativas = regla.hijos
+        alpha = simbolos(lado_izquierdo)
+        for cuerpo in _nodos_en_orden(alternativas, ("Cuerpo",)):
+            producciones.append(tabla.produccion(alpha, simbolos(cuerpo)))
+    return producciones
+
@@ -0,0 +1,463 @@
+import heapq
+from itertools import count
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# ======================
+#   AST de expresiones
+# ======================
+
+VACIO = "VACIO"
+EPSILON = "EPSILON"
+SIMBOLO = "SIMBOLO"
+UNION = "UNION"
+CONCAT = "CONCAT"
+ESTRELLA = "ESTRELLA"
+MAS = "MAS"
+
+_PRECEDENCIA = {UNION: 1, CONCAT: 2, ESTRELLA: 3, MAS: 3, SIMBOLO: 4, EPSILON: 4, VACIO: 4}
+
+# Caracteres con significado especial dentro de una expresión regular
+ESPECIALES_REGEX = set("()|*+?[]'\\.ε∅ ")
+
+
+class NodoRegex:
+    """
+    Nodo del AST de una expresión regular.
+    Los nodos se crean solo a través de FabricaRegex, que los comparte
+    (hash-consing): dos subexpresiones iguales son el mismo objeto.
+    """
+
+    __slots__ = ("tipo", "hijos", "simbolo", "id", "tamano", "anulable", "_texto")
+
+    def __init__(self, tipo: str, hijos: Tuple["NodoRegex", ...], simbolo: Optional[str], id: int):
+        self.tipo = tipo
+        self.hijos = hijos
+        self.simbolo = simbolo
+        self.id = id
+        self.tamano = 1 + sum(h.tamano for h in hijos)
+        if tipo in (EPSILON, ESTRELLA):
+            self.anulable = True
+        elif tipo == MAS:
+            self.anulable = hijos[0].anulable
+        elif tipo == UNION:
+            self.anulable = any(h.anulable for h in hijos)
+        elif tipo == CONCAT:
+            self.anulable = all(h.anulable for h in hijos)
+        else:
+            self.anulable = False
+        self._texto: Optional[str] = None
+
+    def a_texto(self) -> str:
+        """Convierte el AST a texto con los paréntesis mínimos."""
+        if self._texto is None:
+            self._texto = self._construir_texto()
+        return self._texto
+
+    def _construir_texto(self) -> str:
+        if self.tipo == VACIO:
+            return "∅"
+        if self.tipo == EPSILON:
+            return "ε"
+        if self.tipo == SIMBOLO:
+            return _texto_simbolo(self.simbolo)
+        if self.tipo == UNION:
+            if self.es_opcional():
+                # (ε|r) se escribe como r?
+                resto = [h for h in self.hijos if h.tipo != EPSILON]
+                texto = "|".join(h.a_texto() for h in resto)
+                if len(resto) == 1 and _precedencia(resto[0]) >= _PRECEDENCIA[SIMBOLO]:
+                    return texto + "?"
+                return f"({texto})?"
+            return "|".join(h.a_texto() for h in self.hijos)
+        if self.tipo == CONCAT:
+            return "".join(_entre_parentesis(h, CONCAT) for h in self.hijos)
+        # ESTRELLA o MAS
+        operador = "*" if self.tipo == ESTRELLA else "+"
+        hijo = self.hijos[0]
+        if _precedencia(hijo) >= _PRECEDENCIA[SIMBOLO]:
+            return hijo.a_texto() + operador
+        return f"({hijo.a_texto()}){operador}"
+
+    def es_opcional(self) -> bool:
+        """True si es una unión de ε con otras alternativas (se escribe r?)."""
+        return self.tipo == UNION and any(h.tipo == EPSILON for h in self.hijos)
+
+    def __repr__(self):
+        return f"<Regex: {self.a_texto()}>"
+
+
+def _texto_simbolo(simbolo: str) -> str:
+    """Un carácter común va tal cual; los especiales se escapan y los de varios caracteres van entre comillas."""
+    if len(simbolo) == 1:
+        return "\\" + simbolo if simbolo in ESPECIALES_REGEX else simbolo
+    escapado = simbolo.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escapado}'"
+
+
+def _precedencia(nodo: NodoRegex) -> int:
+    if nodo.es_opcional():
+        return _PRECEDENCIA[ESTRELLA]
+    return _PRECEDENCIA[nodo.tipo]
+
+
+def _entre_parentesis(nodo: NodoRegex, contexto: str) -> str:
+    if _precedencia(nodo) < _PRECEDENCIA[contexto]:
+        return f"({nodo.a_texto()})"
+    return nodo.a_texto()
+
+
+class FabricaRegex:
+    """
+    Crea nodos NodoRegex compartidos y simplificados sobre la marcha:
+      - ∅ anula la concatenación y desaparece de las uniones.
+      - ε desaparece de las concatenaciones.
+      - Las uniones se aplanan y no repiten alternativas;
+        ε se absorbe si otra alternativa ya acepta la cadena vacía.
+      - ∅* = ε* = ε, (r*)* = r*, (ε|r)* = r*.
+      - r+ = r* si r acepta ε, (r*)+ = r*, (r+)+ = r+.
+    """
+
+    def __init__(self):
+        self._nodos: Dict[Tuple, NodoRegex] = {}
+        self.vacio = self._nuevo(VACIO, (), None)
+        self.epsilon = self._nuevo(EPSILON, (), None)
+
+    def _nuevo(self, tipo: str, hijos: Tuple[NodoRegex, ...], simbolo: Optional[str]) -> NodoRegex:
+        clave = (tipo, simbolo, tuple(h.id for h in hijos))
+        nodo = self._nodos.get(clave)
+        if nodo is None:
+            nodo = NodoRegex(tipo, hijos, simbolo, len(self._nodos))
+            self._nodos[clave] = nodo
+        return nodo
+
+    def simbolo(self, valor: str) -> NodoRegex:
+        return self._nuevo(SIMBOLO, (), valor)
+
+    def union(self, *alternativas: NodoRegex) -> NodoRegex:
+        hijos: Dict[int, NodoRegex] = {}
+        for a in alternativas:
+            for h in (a.hijos if a.tipo == UNION else (a,)):
+                if h.tipo != VACIO:
+                    hijos[h.id] = h
+        if self.epsilon.id in hijos and any(
+            h.anulable for h in hijos.values() if h is not self.epsilon
+        ):
+            del hijos[self.epsilon.id]
+        if not hijos:
+            return self.vacio
+        if len(hijos) == 1:
+            return next(iter(hijos.values()))
+        return self._nuevo(UNION, tuple(hijos[i] for i in sorted(hijos)), None)
+
+    def concat(self, *partes: NodoRegex) -> NodoRegex:
+        hijos: List[NodoRegex] = []
+        for p in partes:
+            if p.tipo == VACIO:
+                return self.vacio
+            if p.tipo == EPSILON:
+                continue
+            hijos.extend(p.hijos if p.tipo == CONCAT else (p,))
+        if not hijos:
+            return self.epsilon
+        if len(hijos) == 1:
+            return hijos[0]
+        return self._nuevo(CONCAT, tuple(hijos), None)
+
+    def estrella(self, r: NodoRegex) -> NodoRegex:
+        if r.tipo in (VACIO, EPSILON):
+            return self.epsilon
+        if r.tipo == ESTRELLA:
+            return r
+        if r.tipo == UNION and self.epsilon in r.hijos:
+            r = self.union(*(h for h in r.hijos if h is not self.epsilon))
+            if r.tipo == ESTRELLA:
+                return r
+        if r.tipo == MAS:
+            r = r.hijos[0]
+        return self._nuevo(ESTRELLA, (r,), None)
+
+    def mas(self, r: NodoRegex) -> NodoRegex:
+        if r.tipo == VACIO:
+            return self.vacio
+        if r.anulable:
+            return self.estrella(r)
+        if r.tipo == MAS:
+            return r
+        return self._nuevo(MAS, (r,), None)
+
+    def opcional(self, r: NodoRegex) -> NodoRegex:
+        return self.union(self.epsilon, r)
+
+
+# ======================
+#   Parser de regex
+# ======================
+
+class ParserRegex:
+    """
+    Parser descendente recursivo de expresiones regulares a NodoRegex.
+
+    Sintaxis:
+      r|s            unión
+      rs             concatenación (implícita; un '.' explícito también se acepta)
+      r*  r+  r?     cierre de Kleene, una o más veces, opcional
+      (r)            agrupación
+      [a-z0-9_]      clase de caracteres (unión de cada uno)
+      'abc'          terminal de varios caracteres (admite comillas y barras escapadas)
+      \\c            carácter c escapado (por ejemplo \\* o \\|)
+      ε  ∅           cadena vacía y lenguaje vacío
+    Los espacios sin escapar se ignoran.
+    """
+
+    def __init__(self, expresion: str, fabrica: Optional[FabricaRegex] = None):
+        self.texto = expresion
+        self.pos = 0
+        self.fabrica = fabrica or FabricaRegex()
+
+    def _error(self, mensaje: str) -> ValueError:
+        return ValueError(f"Expresión regular inválida (posición {self.pos + 1}): {mensaje}")
+
+    def _saltar_espacios(self) -> None:
+        while self.pos < len(self.texto) and self.texto[self.pos] in " \t\r\n":
+            self.pos += 1
+
+    def _actual(self) -> Optional[str]:
+        self._saltar_espacios()
+        return self.texto[self.pos] if self.pos < len(self.texto) else None
+
+    def parsear(self) -> NodoRegex:
+        if not self.texto.strip():
+            raise ValueError("La expresión regular está vacía.")
+        nodo = self._union()
+        if self._actual() is not None:
+            raise self._error(f"')' sin abrir o carácter inesperado '{self.texto[self.pos]}'.")
+        return nodo
+
+    def _union(self) -> NodoRegex:
+        alternativas = [self._concatenacion()]
+        while self._actual() == "|":
+            self.pos += 1
+            alternativas.append(self._concatenacion())
+        return self.fabrica.union(*alternativas)
+
+    def _concatenacion(self) -> NodoRegex:
+        partes: List[NodoRegex] = []
+        while True:
+            c = self._actual()
+            if c is None or c in ")|":
+                break
+            if c == ".":
+                self.pos += 1
+                continue
+            partes.append(self._postfijo())
+        return self.fabrica.concat(*partes)
+
+    def _postfijo(self) -> NodoRegex:
+        nodo = self._atomo()
+        while True:
+            c = self._actual()
+            if c == "*":
+                nodo = self.fabrica.estrella(nodo)
+            elif c == "+":
+                nodo = self.fabrica.mas(nodo)
+            elif c == "?":
+                nodo = self.fabrica.opcional(nodo)
+            else:
+                return nodo
+            self.pos += 1
+
+    def _atomo(self) -> NodoRegex:
+        c = self._actual()
+        if c in ("*", "+", "?"):
+            raise self._error(f"el operador '{c}' no tiene operando.")
+        if c == "]":
+            raise self._error("']' sin abrir.")
+        self.pos += 1
+
+        if c == "(":
+            nodo = self._union()
+            if self._actual() != ")":
+                raise self._error("falta ')'.")
+            self.pos += 1
+            return nodo
+        if c == "[":
+            return self._clase()
+        if c == "'":
+            return self._comillas()
+        if c == "\\":
+            return self.fabrica.simbolo(self._escapado())
+        if c == "ε":
+            return self.fabrica.epsilon
+        if c == "∅":
+            return self.fabrica.vacio
+        return self.fabrica.simbolo(c)
+
+    def _escapado(self) -> str:
+        if self.pos >= len(self.texto):
+            raise self._error("'\\' al final de la expresión.")
+        c = self.texto[self.pos]
+        self.pos += 1
+        return c
+
+    def _comillas(self) -> NodoRegex:
+        caracteres: List[str] = []
+        while True:
+            if self.pos >= len(self.texto):
+                raise self._error("falta la comilla de cierre.")
+            c = self.texto[self.pos]
+            self.pos += 1
+            if c == "'":
+                break
+            caracteres.append(self._escapado() if c == "\\" else c)
+        if not caracteres:
+            return self.fabrica.epsilon
+        return self.fabrica.simbolo("".join(caracteres))
+
+    def _clase(self) -> NodoRegex:
+        simbolos: List[str] = []
+        while True:
+            if self.pos >= len(self.texto):
+                raise self._error("falta ']'.")
+            c = self.texto[self.pos]
+            self.pos += 1
+            if c == "]":
+                break
+            if c == "\\":
+                c = self._escapado()
+            if (
+                self.pos + 1 < len(self.texto)
+                and self.texto[self.pos] == "-"
+                and self.texto[self.pos + 1] != "]"
+            ):
+                self.pos += 1
+                fin = self._escapado()
+                if fin == "\\":
+                    fin = self._escapado()
+                if ord(fin) < ord(c):
+                    raise self._error(f"rango inválido '{c}-{fin}'.")
+                simbolos.extend(chr(x) for x in range(ord(c), ord(fin) + 1))
+            else:
+                simbolos.append(c)
+        if not simbolos:
+            raise self._error("clase de caracteres vacía.")
+        return self.fabrica.union(*(self.fabrica.simbolo(x) for x in simbolos))
+
+
+def parsear_regex(expresion: str, fabrica: Optional[FabricaRegex] = None) -> NodoRegex:
+    """Convierte el texto de una expresión regular en su AST."""
+    try:
+        return ParserRegex(expresion, fabrica).parsear()
+    except RecursionError:
+        raise ValueError("Expresión regular inválida: demasiados paréntesis anidados.") from None
+
+
+# ===========================
+#   AFD → Expresión Regular
+# ===========================
+
+def afd_a_regex_por_eliminacion(afd: Dict[str, Any]) -> str:
+    """
+    Convierte un AFD (formato de especificación) a expresión regular
+    por eliminación de estados sobre el AST compartido.
+    En cada paso elimina el estado de menor peso: el tamaño aproximado
+    de las expresiones nuevas que genera su eliminación. Los pesos viven
+    en un montículo y al eliminar un estado solo se recalculan los de sus
+    vecinos (las entradas viejas se descartan al salir).
+    """
+    return eliminar_estados(afd, FabricaRegex()).a_texto()
+
+
+def eliminar_estados(afd: Dict[str, Any], fabrica: FabricaRegex) -> NodoRegex:
+    inicio, fin = ("inicio",), ("fin",)
+    salidas: Dict[Any, Dict[Any, NodoRegex]] = {inicio: {}, fin: {}}
+    entradas: Dict[Any, Dict[Any, NodoRegex]] = {inicio: {}, fin: {}}
+
+    def agregar(p, q, r: NodoRegex):
+        salidas.setdefault(p, {})
+        entradas.setdefault(q, {})
+        previa = salidas[p].get(q)
+        nueva = fabrica.union(previa, r) if previa is not None else r
+        salidas[p][q] = nueva
+        entradas[q][p] = nueva
+
+    for q, a, r in zip(afd["estActua"], afd["lecturas"], afd["estsigui"]):
+        agregar(q, r, fabrica.simbolo(a))
+    agregar(inicio, afd["start_state"], fabrica.epsilon)
+    for qf in afd["accept_states"]:
+        agregar(qf, fin, fabrica.epsilon)
+
+    # Solo interesan los estados alcanzables desde el inicio que llegan al fin
+    utiles = _alcanzables(inicio, salidas) & _alcanzables(fin, entradas)
+    if fin not in utiles:
+        return fabrica.vacio
+    for p in set(salidas) | set(entradas):
+        if p not in utiles:
+            _quitar_estado(p, salidas, entradas)
+
+    intermedios = set(utiles) - {inicio, fin}
+
+    def peso(k) -> int:
+        bucle = salidas[k].get(k)
+        tam_bucle = bucle.tamano if bucle is not None else 0
+        llegan = [r for p, r in entradas[k].items() if p != k]
+        salen = [r for q, r in salidas[k].items() if q != k]
+        return (
+            sum(r.tamano for r in llegan) * len(salen)
+            + sum(r.tamano for r in salen) * len(llegan)
+            + tam_bucle * len(llegan) * len(salen)
+        )
+
+    # (peso, desempate por texto, número de entrada, estado); vigente[e] es
+    # el número de la última entrada de e, las demás quedaron viejas
+    turnos = count()
+    vigente: Dict[Any, int] = {}
+    monticulo = []
+
+    def programar(e) -> None:
+        turno = vigente[e] = next(turnos)
+        heapq.heappush(monticulo, (peso(e), str(e), turno, e))
+
+    for e in intermedios:
+        programar(e)
+
+    while intermedios:
+        _, _, turno, k = heapq.heappop(monticulo)
+        if k not in intermedios or vigente[k] != turno:
+            continue
+        intermedios.discard(k)
+
+        bucle = salidas[k].get(k)
+        estrella = fabrica.estrella(bucle) if bucle is not None else fabrica.epsilon
+        llegan = [(p, r) for p, r in entradas[k].items() if p != k]
+        salen = [(q, r) for q, r in salidas[k].items() if q != k]
+        _quitar_estado(k, salidas, entradas)
+
+        for p, r_entrada in llegan:
+            for q, r_salida in salen:
+                agregar(p, q, fabrica.concat(r_entrada, estrella, r_salida))
+
+        # Solo cambian los pesos de los vecinos del estado eliminado
+        for vecino in {p for p, _ in llegan} | {q for q, _ in salen}:
+            if vecino in intermedios:
+                programar(vecino)
+
+    return salidas[inicio].get(fin, fabrica.vacio)
+
+
+def _alcanzables(origen, aristas: Dict[Any, Dict[Any, NodoRegex]]) -> set:
+    vistos = {origen}
+    pila = [origen]
+    while pila:
+        for q in aristas.get(pila.pop(), {}):
+            if q not in vistos:
+                vistos.add(q)
+                pila.append(q)
+    return vistos
+
+
+def _quitar_estado(k, salidas, entradas) -> None:
+    for q in salidas.pop(k, {}):
+        entradas.get(q, {}).pop(k, None)
+    for p in entradas.pop(k, {}):
+        salidas.get(p, {}).pop(k, None)
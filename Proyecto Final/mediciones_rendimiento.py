@@ -0,0 +1,541 @@
+"""
+Mediciones de rendimiento de los motores del proyecto.
+
+Uso (desde la carpeta Proyecto Final):
+    python mediciones_rendimiento.py clasificador en_vivo lexico simulacion equivalencia reconocedores first_follow tabla_ll1 analizador_ll1 diagramas
+"""
+import argparse
+import random
+import tempfile
+import time
+from typing import Callable, Dict, List, Set
+
+from estructuras_gramatica import GRAMATICA_DE_GRAMATICAS, SIMBOLO_INICIAL_GRAMATICA, leer_gramatica_desde_texto
+from clasificador_chomsky import ClasificadorChomsky, ClasificadorIncremental
+from analizador_lexico_gramaticas import AnalizadorLexicoGramaticas
+from conversor_y_diagramas import (
+    AutomataNFA,
+    OPCIONES_DIAGRAMA,
+    _renderizar,
+    convertir_nfa_a_afd,
+    dibujar_automata,
+    expresion_regular_a_nfa,
+    graphviz_disponible,
+)
+from diagramas_svg import DisposicionPorCapas, aristas_agrupadas, automata_a_svg, estados_del_diagrama
+from simulacion_automatas import SimuladorNFA, EjecutorAFD
+from equivalencias import AnalizadorEquivalencia, comparar_regulares
+from reconocedores_cfg import ReconocedorCYK, ReconocedorEarley
+from motor_ll1 import GeneradorTablaLL1, analizar_sintactico
+from utilidades_generales import EPSILON_GRAMATICA
+
+
+def _cronometrar(funcion: Callable[[], object], repeticiones: int = 5) -> float:
+    """Devuelve el mejor tiempo (en segundos) de varias repeticiones."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def generar_gramatica_grande(n_producciones: int, tipo: int = 2, semilla: int = 0) -> str:
+    """
+    Genera una gramática sintética con n_producciones reglas.
+    tipo=3 produce solo reglas A -> a B | a; tipo=2 mezcla reglas
+    libres de contexto; tipo=0 agrega una regla con contexto que acorta.
+    """
+    aleatorio = random.Random(semilla)
+    no_terminales = ["S"] + [f"N{i}" for i in range(max(1, n_producciones // 4))]
+    terminales = ["a", "b", "c", "d"]
+    lineas: List[str] = []
+
+    for i in range(n_producciones):
+        A = no_terminales[i % len(no_terminales)]
+        a = aleatorio.choice(terminales)
+        B = aleatorio.choice(no_terminales)
+        if tipo == 3 or aleatorio.random() < 0.5:
+            lineas.append(f"{A} -> {a} {B}")
+        else:
+            lineas.append(f"{A} -> {a} {B} {aleatorio.choice(terminales)}")
+
+    if tipo == 0:
+        lineas.insert(1, "S A -> S")
+    return "\n".join(lineas)
+
+
+def _clasificar_tres_pasadas(clasificador: ClasificadorChomsky):
+    """Ruta anterior: tres recorridos completos con textos para cada tipo."""
+    es_t3, just_t3 = clasificador._es_tipo_3()
+    es_t2, just_t2 = clasificador._es_tipo_2()
+    es_t1, just_t1 = clasificador._es_tipo_1()
+    if es_t3:
+        return 3, just_t3
+    if es_t2:
+        return 2, just_t3 or just_t2
+    if es_t1:
+        return 1, just_t2 or just_t1
+    return 0, just_t2 or just_t1
+
+
+def medir_clasificador(tamanos=(1_000, 10_000, 50_000)):
+    print("Clasificador de Chomsky: tres pasadas vs. pasada única")
+    print(f"{'producciones':>12} {'tipo':>4} {'3 pasadas':>11} {'única':>11} {'única s/j':>11} {'veredicto':>11}")
+    for n in tamanos:
+        for tipo in (3, 2, 0):
+            clasificador = ClasificadorChomsky(leer_gramatica_desde_texto(generar_gramatica_grande(n, tipo)))
+            t_viejo = _cronometrar(lambda: _clasificar_tres_pasadas(clasificador))
+            t_unica = _cronometrar(lambda: clasificador.clasificar())
+            t_sin_just = _cronometrar(lambda: clasificador.clasificar(justificar=False))
+            t_veredicto = _cronometrar(lambda: clasificador.veredicto())
+            print(
+                f"{n:>12} {tipo:>4} {t_viejo * 1e3:>9.2f}ms {t_unica * 1e3:>9.2f}ms "
+                f"{t_sin_just * 1e3:>9.2f}ms {t_veredicto * 1e3:>9.2f}ms"
+            )
+
+
+def medir_en_vivo(n_lineas: int = 5_000, ediciones: int = 200):
+    print(f"Clasificación en vivo: {n_lineas} líneas, {ediciones} ediciones de una línea (ms por edición)")
+    aleatorio = random.Random(0)
+    lineas = generar_gramatica_grande(n_lineas, tipo=2).splitlines()
+    incremental = ClasificadorIncremental()
+    t_inicial = _cronometrar(lambda: ClasificadorIncremental().actualizar("\n".join(lineas)), repeticiones=1)
+    incremental.actualizar("\n".join(lineas))
+
+    textos = []
+    for _ in range(ediciones):
+        k = aleatorio.randrange(n_lineas)
+        lineas[k] += " a"
+        textos.append("\n".join(lineas))
+
+    inicio = time.perf_counter()
+    for texto in textos:
+        incremental.actualizar(texto)
+        incremental.veredicto()
+    t_incremental = (time.perf_counter() - inicio) / ediciones
+    t_completo = _cronometrar(
+        lambda: ClasificadorChomsky(leer_gramatica_desde_texto(textos[-1])).veredicto(), repeticiones=3
+    )
+    print(f"  primera lectura {t_inicial * 1e3:>8.1f}ms")
+    print(f"  incremental     {t_incremental * 1e3:>8.2f}ms")
+    print(f"  todo el texto   {t_completo * 1e3:>8.2f}ms")
+
+
+def _tokenizar_linea_por_reglas(analizador: AnalizadorLexicoGramaticas, linea: str, numero_linea: int):
+    """Versión anterior del léxico: prueba cada regex de analizador.reglas en cada posición."""
+    tokens = []
+    i, n = 0, len(linea)
+    while i < n:
+        columna = i + 1
+        for regex, tipo in analizador.reglas:
+            m = regex.match(linea, i)
+            if m:
+                i = m.end()
+                if tipo:
+                    lexema = m.group(0)
+                    if tipo == "TERMINAL_COMILLAS":
+                        tipo = "TERMINAL"
+                        lexema = lexema[1:-1]
+                    tokens.append((lexema, tipo, numero_linea, columna))
+                break
+        else:
+            tokens.append((linea[i], "INVALIDO", numero_linea, columna))
+            i += 1
+    return tokens
+
+
+def medir_lexico(megabytes=(1, 4)):
+    print("Analizador léxico: regex por regla (por línea) vs. patrón maestro (documento completo)")
+    analizador = AnalizadorLexicoGramaticas()
+    base = generar_gramatica_grande(20_000, tipo=2) + "\n<expr> -> <expr> '+' <term> | epsilon  # comentario\n"
+    for mb in megabytes:
+        texto = base * max(1, int(mb * 1e6 / len(base)))
+        tamano_mb = len(texto.encode("utf-8")) / 1e6
+
+        def por_reglas():
+            for i, linea in enumerate(texto.splitlines(), start=1):
+                _tokenizar_linea_por_reglas(analizador, linea, i)
+
+        def maestro():
+            for _ in analizador.tokenizar_texto(texto):
+                pass
+
+        t_reglas = _cronometrar(por_reglas, repeticiones=1)
+        t_maestro = _cronometrar(maestro, repeticiones=1)
+        print(
+            f"{tamano_mb:>6.1f} MB  por reglas: {tamano_mb / t_reglas:>6.2f} MB/s   "
+            f"patrón maestro: {tamano_mb / t_maestro:>6.2f} MB/s"
+        )
+
+
+def _simular_nfa_por_conjuntos(nfa: AutomataNFA, cadena) -> bool:
+    """Simulación de referencia: conjuntos de EstadoNFA y cerradura-ε en cada paso."""
+
+    def cerradura(estados):
+        pila, visitados = list(estados), set(estados)
+        while pila:
+            for siguiente in nfa.transiciones.get(pila.pop(), {}).get("ε", ()):
+                if siguiente not in visitados:
+                    visitados.add(siguiente)
+                    pila.append(siguiente)
+        return visitados
+
+    actuales = cerradura({nfa.estado_inicial})
+    for simbolo in cadena:
+        actuales = cerradura({s for q in actuales for s in nfa.transiciones.get(q, {}).get(simbolo, ())})
+        if not actuales:
+            return False
+    return nfa.estado_final in actuales
+
+
+def _ejecutar_afd_por_listas(afd, cadena) -> bool:
+    """Ejecución de referencia: busca δ(q, a) recorriendo las listas paralelas."""
+    q = afd["start_state"]
+    for simbolo in cadena:
+        for origen, leido, destino in zip(afd["estActua"], afd["lecturas"], afd["estsigui"]):
+            if origen == q and leido == simbolo:
+                q = destino
+                break
+        else:
+            return False
+    return q in afd["accept_states"]
+
+
+def medir_simulacion(n_cadenas: int = 200_000, longitud: int = 32):
+    print(f"Simulación de autómatas: {n_cadenas} cadenas de longitud {longitud} (cadenas/s)")
+    aleatorio = random.Random(0)
+    expresion = "(a|b)*a" + "(a|b)" * 6
+    nfa = expresion_regular_a_nfa(expresion)
+    afd = convertir_nfa_a_afd(nfa, {"a", "b"})
+    cadenas = ["".join(aleatorio.choice("ab") for _ in range(longitud)) for _ in range(n_cadenas)]
+    muestra = cadenas[: n_cadenas // 20]
+    print(f"  expresión {expresion}: NFA de {len(nfa.estados)} estados, AFD de {len(set(afd['estActua']))} estados")
+
+    filas = [
+        ("NFA por conjuntos", muestra, lambda: [_simular_nfa_por_conjuntos(nfa, w) for w in muestra]),
+        ("AFD por listas", muestra, lambda: [_ejecutar_afd_por_listas(afd, w) for w in muestra]),
+        ("SimuladorNFA (bits)", cadenas, lambda: SimuladorNFA(nfa).aceptar_lote(cadenas)),
+        ("EjecutorAFD (tabla)", cadenas, lambda: EjecutorAFD(afd).aceptar_lote(cadenas)),
+    ]
+    for nombre, lote, funcion in filas:
+        t = _cronometrar(funcion, repeticiones=1)
+        print(f"  {nombre:<22} {len(lote) / t:>12,.0f} cadenas/s")
+
+
+def medir_equivalencia(longitudes=(12, 16, 20, 24, 40)):
+    print("Equivalencia sobre {a, b}: conjuntos vs. AFD mínimos (regulares) y vs. conteo de derivaciones (Dyck)")
+    g1 = leer_gramatica_desde_texto("S -> a S | b S | epsilon")
+    g2 = leer_gramatica_desde_texto("S -> a A | b A | epsilon\nA -> a S | b S | a | b | epsilon")
+    d1 = leer_gramatica_desde_texto("S -> a S b S | epsilon")
+    d2 = leer_gramatica_desde_texto("S -> S a S b | epsilon")
+    t_exacto = _cronometrar(lambda: comparar_regulares(g1, g2))
+    for n in longitudes:
+        t_derivaciones = _cronometrar(
+            lambda: AnalizadorEquivalencia(d1, n).contar_derivaciones() == AnalizadorEquivalencia(d2, n).contar_derivaciones(),
+            repeticiones=1,
+        )
+        if n <= 16:
+            t_conjuntos = _cronometrar(
+                lambda: AnalizadorEquivalencia(g1, n).generar_cadenas() == AnalizadorEquivalencia(g2, n).generar_cadenas(),
+                repeticiones=1,
+            )
+            texto_conjuntos = f"{t_conjuntos * 1e3:>9.1f}ms"
+        else:
+            texto_conjuntos = f"{'(omitido)':>11}"
+        print(
+            f"  n = {n:>3}  conjuntos: {texto_conjuntos}   exacto (sin n): {t_exacto * 1e3:>7.2f}ms   "
+            f"derivaciones Dyck: {t_derivaciones * 1e3:>7.2f}ms"
+        )
+
+
+def _derivacion_aleatoria(reglas, inicial: str, longitud: int, aleatorio: random.Random) -> List[str]:
+    """
+    Deriva una cadena de aproximadamente `longitud` terminales expandiendo
+    siempre el No-Terminal más a la izquierda. Antes del límite prefiere
+    las alternativas con No-Terminales (para que la cadena crezca); cerca
+    del límite elige la más corta para terminar. Repite si queda muy corta.
+    """
+    while True:
+        cadena: List[str] = []
+        pila = [inicial]
+        while pila:
+            simbolo = pila.pop()
+            if simbolo not in reglas:
+                cadena.append(simbolo)
+                continue
+            alternativas = reglas[simbolo]
+            recursivas = [c for c in alternativas if any(s in reglas for s in c)]
+            if len(cadena) + len(pila) >= longitud:
+                cuerpo = min(alternativas, key=len)
+            elif recursivas and aleatorio.random() < 0.7:
+                cuerpo = aleatorio.choice(recursivas)
+            else:
+                cuerpo = aleatorio.choice(alternativas)
+            pila.extend(reversed(cuerpo))
+        if len(cadena) >= longitud // 2:
+            return cadena
+
+
+def medir_reconocedores(n_cadenas: int = 10_000, longitud: int = 100):
+    print(f"Reconocedores CYK / Earley: {n_cadenas} cadenas de unos {longitud} terminales (cadenas/s)")
+    gramaticas = {
+        "paréntesis": ("S -> ( S ) S | epsilon", {"S": [["(", "S", ")", "S"], []]}),
+        "expresiones": (
+            "E -> E + T | T\nT -> T * F | F\nF -> ( E ) | id",
+            {"E": [["E", "+", "T"], ["T"]], "T": [["T", "*", "F"], ["F"]], "F": [["(", "E", ")"], ["id"]]},
+        ),
+    }
+    aleatorio = random.Random(0)
+    for nombre, (texto, reglas) in gramaticas.items():
+        producciones = leer_gramatica_desde_texto(texto)
+        inicial = producciones[0].alpha[0].valor
+        cadenas = []
+        for i in range(n_cadenas):
+            cadena = _derivacion_aleatoria(reglas, inicial, longitud, aleatorio)
+            if i % 2:
+                # La mitad con un símbolo borrado (casi siempre fuera del lenguaje)
+                del cadena[aleatorio.randrange(len(cadena))]
+            cadenas.append(cadena)
+
+        for clase in (ReconocedorCYK, ReconocedorEarley):
+            reconocedor = clase(producciones)
+            inicio = time.perf_counter()
+            aceptadas = sum(reconocedor.aceptar_lote(cadenas))
+            duracion = time.perf_counter() - inicio
+            print(
+                f"  {nombre:<12} {clase.__name__:<18} {n_cadenas / duracion:>9,.0f} cadenas/s "
+                f"({aceptadas} aceptadas, {duracion:.1f} s)"
+            )
+
+
+def _first_follow_ingenuo(gramatica: Dict[str, List[List[str]]], inicial: str):
+    """Cálculo de referencia: rondas sobre todas las producciones hasta que nada cambie."""
+    no_terminales = set(gramatica)
+    first: Dict[str, Set[str]] = {A: set() for A in no_terminales}
+
+    def first_de(secuencia):
+        resultado = set()
+        for x in secuencia:
+            if x == EPSILON_GRAMATICA:
+                continue
+            fx = first[x] if x in no_terminales else {x}
+            resultado |= fx - {EPSILON_GRAMATICA}
+            if EPSILON_GRAMATICA not in fx:
+                return resultado
+        resultado.add(EPSILON_GRAMATICA)
+        return resultado
+
+    cambio = True
+    while cambio:
+        cambio = False
+        for A, producciones in gramatica.items():
+            for prod in producciones:
+                antes = len(first[A])
+                first[A] |= first_de(prod)
+                cambio |= len(first[A]) != antes
+
+    follow: Dict[str, Set[str]] = {A: set() for A in no_terminales}
+    follow[inicial].add("$")
+    cambio = True
+    while cambio:
+        cambio = False
+        for A, producciones in gramatica.items():
+            for prod in producciones:
+                for i, B in enumerate(prod):
+                    if B in no_terminales:
+                        antes = len(follow[B])
+                        first_beta = first_de(prod[i + 1:])
+                        follow[B] |= first_beta - {EPSILON_GRAMATICA}
+                        if EPSILON_GRAMATICA in first_beta:
+                            follow[B] |= follow[A]
+                        cambio |= len(follow[B]) != antes
+    return first, follow
+
+
+def generar_gramatica_ll1_grande(n_no_terminales: int, n_terminales: int = 40, semilla: int = 0):
+    """
+    Gramática en forma de diccionario (la de motor_ll1) con cadenas largas
+    de dependencias: cada N_i depende de N_{i+1}, que aparece después en el
+    diccionario, y algunas reglas vuelven hacia atrás formando ciclos.
+    """
+    aleatorio = random.Random(semilla)
+    terminales = [f"t{i}" for i in range(n_terminales)]
+    nombres = [f"N{i}" for i in range(n_no_terminales)]
+    gramatica: Dict[str, List[List[str]]] = {}
+    for i, A in enumerate(nombres):
+        siguiente = nombres[min(i + 1, n_no_terminales - 1)]
+        atras = nombres[aleatorio.randrange(i + 1)]
+        gramatica[A] = [
+            [siguiente, aleatorio.choice(terminales)],
+            [aleatorio.choice(terminales), atras, siguiente],
+            [atras, siguiente] if aleatorio.random() < 0.2 else [EPSILON_GRAMATICA],
+        ]
+    return gramatica, nombres[0]
+
+
+def medir_first_follow(tamanos=(100, 300, 1_000)):
+    print("FIRST / FOLLOW: rondas hasta el punto fijo vs. componentes fuertes con bits")
+    for n in tamanos:
+        gramatica, inicial = generar_gramatica_ll1_grande(n)
+        t_ingenuo = _cronometrar(lambda: _first_follow_ingenuo(gramatica, inicial), repeticiones=1)
+        t_nuevo = _cronometrar(lambda: GeneradorTablaLL1(gramatica, inicial), repeticiones=3)
+        print(
+            f"  {n:>6} no terminales: ingenuo {t_ingenuo * 1e3:>9.1f}ms   "
+            f"GeneradorTablaLL1 {t_nuevo * 1e3:>7.1f}ms   (x{t_ingenuo / t_nuevo:.0f})"
+        )
+
+
+def _construir_tabla_ingenua(generador: GeneradorTablaLL1):
+    """Construcción de referencia: celdas como listas y búsqueda lineal de conflictos repetidos."""
+    tabla = {A: {} for A in generador.no_terminales}
+    conflictos = []
+
+    def insertar(A, a, prod):
+        celda = tabla[A].setdefault(a, [])
+        if prod not in celda:
+            celda.append(prod)
+            if len(celda) > 1 and not any(c[0] == A and c[1] == a for c in conflictos):
+                conflictos.append((A, a, [p[:] for p in celda]))
+
+    for A, producciones in generador.G.items():
+        for prod in producciones:
+            first_alpha = generador._first_de_secuencia(prod)
+            for a in first_alpha - {EPSILON_GRAMATICA}:
+                insertar(A, a, prod)
+            if EPSILON_GRAMATICA in first_alpha:
+                for b in generador.FOLLOW[A]:
+                    insertar(A, b, prod)
+    return tabla, conflictos
+
+
+def generar_gramatica_con_conflictos(n_no_terminales: int, alternativas: int = 60, n_terminales: int = 30, semilla: int = 0):
+    """Gramática muy ambigua para LL(1): muchas alternativas por no terminal que empiezan igual."""
+    aleatorio = random.Random(semilla)
+    terminales = [f"t{i}" for i in range(n_terminales)]
+    nombres = [f"N{i}" for i in range(n_no_terminales)]
+    gramatica: Dict[str, List[List[str]]] = {}
+    for A in nombres:
+        gramatica[A] = [
+            [aleatorio.choice(terminales), aleatorio.choice(nombres), aleatorio.choice(terminales)]
+            for _ in range(alternativas)
+        ] + [[aleatorio.choice(nombres), aleatorio.choice(terminales)], [EPSILON_GRAMATICA]]
+    return gramatica, nombres[0]
+
+
+def medir_tabla_ll1(tamanos=(50, 200, 500)):
+    print("Tabla LL(1) en gramáticas con muchos conflictos: listas + búsqueda lineal vs. celdas por (A, a)")
+    for n in tamanos:
+        gramatica, inicial = generar_gramatica_con_conflictos(n)
+        generador = GeneradorTablaLL1(gramatica, inicial)
+        t_ingenua = _cronometrar(lambda: _construir_tabla_ingenua(generador), repeticiones=1)
+        t_nueva = _cronometrar(generador.construir_tabla, repeticiones=3)
+        print(
+            f"  {n:>4} no terminales: ingenua {t_ingenua * 1e3:>9.1f}ms   construir_tabla {t_nueva * 1e3:>7.1f}ms   "
+            f"({len(generador.reporte_conflictos)} conflictos)"
+        )
+
+
+def medir_analizador_ll1(n_producciones: int = 100_000):
+    print(f"Analizador LL(1) sobre GRAMATICA_DE_GRAMATICAS: texto de {n_producciones} reglas (tokens/s)")
+    generador = GeneradorTablaLL1(GRAMATICA_DE_GRAMATICAS, SIMBOLO_INICIAL_GRAMATICA)
+    generador.construir_tabla()
+    compilado = generador.compilar()
+    texto = generar_gramatica_grande(n_producciones)
+    tokens = list(AnalizadorLexicoGramaticas().tokenizar_texto(texto, incluir_fin_linea=True))
+    tipos = [t[1] for t in tokens]
+
+    filas = [
+        ("analizar_sintactico", lambda: analizar_sintactico(
+            tokens, generador.tabla_M, SIMBOLO_INICIAL_GRAMATICA, generador.FIRST, generador.FOLLOW
+        )),
+        ("compilado (árbol)", lambda: compilado.analizar(tokens)),
+        ("compilado (solo reconocer)", lambda: compilado.analizar(tokens, construir_arbol=False)),
+        ("compilado acepta(tipos)", lambda: compilado.acepta(tipos)),
+    ]
+    for nombre, funcion in filas:
+        t = _cronometrar(funcion, repeticiones=3)
+        print(f"  {nombre:<28} {len(tokens) / t:>12,.0f} tokens/s")
+
+
+def generar_afd_grande(n_estados: int, simbolos: str = "abc", semilla: int = 0) -> Dict[str, object]:
+    """
+    Especificación de un AFD completo con todos sus estados alcanzables:
+    un árbol desde el estado 0 más transiciones aleatorias en las celdas libres.
+    """
+    aleatorio = random.Random(semilla)
+    m = len(simbolos)
+    destinos = {}
+    for q in range(1, n_estados):
+        destinos[((q - 1) // m, simbolos[(q - 1) % m])] = q
+    spec = {
+        "nombre": f"AFD de {n_estados} estados",
+        "start_state": 0,
+        "accept_states": {q for q in range(n_estados) if aleatorio.random() < 0.2},
+        "alphabet": set(simbolos),
+        "estActua": [],
+        "lecturas": [],
+        "estsigui": [],
+    }
+    for q in range(n_estados):
+        for a in simbolos:
+            spec["estActua"].append(q)
+            spec["lecturas"].append(a)
+            spec["estsigui"].append(destinos.get((q, a), aleatorio.randrange(n_estados)))
+    return spec
+
+
+def medir_diagramas(tamanos=(100, 300, 1_000)):
+    print("Diagramas de AFD: acomodo por capas en SVG vs dot (y acierto en la caché)")
+    for n in tamanos:
+        spec = generar_afd_grande(n)
+        disposicion = DisposicionPorCapas(estados_del_diagrama(spec), "0", aristas_agrupadas(spec))
+        t_svg = _cronometrar(lambda: automata_a_svg(spec), repeticiones=3)
+        linea = (
+            f"  n={n:>6}  svg {t_svg * 1e3:>8.1f}ms"
+            f"  cruces {disposicion.cruces_iniciales:>7} -> {disposicion.cruces:<7}"
+        )
+        if graphviz_disponible():
+            with tempfile.TemporaryDirectory() as carpeta:
+                t_dot = _cronometrar(
+                    lambda: _renderizar(spec, "dot", carpeta, "diagrama", "png", OPCIONES_DIAGRAMA), repeticiones=1
+                )
+            linea += f"  dot {t_dot * 1e3:>9.1f}ms"
+        else:
+            linea += "  dot no disponible"
+        with tempfile.TemporaryDirectory() as carpeta:
+            dibujar_automata(spec, directorio_cache=carpeta)
+            t_cache = _cronometrar(lambda: dibujar_automata(spec, directorio_cache=carpeta))
+        print(linea + f"  caché {t_cache * 1e3:>6.2f}ms")
+
+
+MEDICIONES = {
+    "clasificador": medir_clasificador,
+    "en_vivo": medir_en_vivo,
+    "lexico": medir_lexico,
+    "simulacion": medir_simulacion,
+    "equivalencia": medir_equivalencia,
+    "reconocedores": medir_reconocedores,
+    "first_follow": medir_first_follow,
+    "tabla_ll1": medir_tabla_ll1,
+    "analizador_ll1": medir_analizador_ll1,
+    "diagramas": medir_diagramas,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mediciones de rendimiento.")
+    parser.add_argument(
+        "medicion", nargs="*", help=f"Mediciones a ejecutar (por defecto, todas): {', '.join(sorted(MEDICIONES))}."
+    )
+    args = parser.parse_args(argv)
+    desconocidas = [m for m in args.medicion if m not in MEDICIONES]
+    if desconocidas:
+        parser.error(f"medición desconocida: {', '.join(desconocidas)}")
+    for nombre in args.medicion or sorted(MEDICIONES):
+        MEDICIONES[nombre]()
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,100 @@
-from typing import List, Dict, Set, Tuple, Optional
+import gc
+import hashlib
+import json
+import os
+import tempfile
+from array import array
+from typing import Any, Callable, Iterable, List, Dict, Sequence, Set, Tuple, Optional
 from utilidades_generales import EPSILON_GRAMATICA, NodoArbol
 
 
+# Versión del formato de la caché en disco; se incluye en la huella, así que
+# al cambiarla los archivos viejos simplemente dejan de encontrarse.
+VERSION_CACHE_LL1 = 2
+
+
+def _componentes_fuertes(nodos: Iterable[str], sucesores: Callable[[str], Iterable[str]]) -> List[List[str]]:
+    """
+    Componentes fuertemente conexas (Tarjan, sin recursión), en orden
+    topológico inverso: cada componente sale después de todas las
+    componentes a las que llega.
+    """
+    indice: Dict[str, int] = {}
+    bajo: Dict[str, int] = {}
+    en_pila: Set[str] = set()
+    pila: List[str] = []
+    componentes: List[List[str]] = []
+
+    for raiz in nodos:
+        if raiz in indice:
+            continue
+        indice[raiz] = bajo[raiz] = len(indice)
+        pila.append(raiz)
+        en_pila.add(raiz)
+        trabajo = [(raiz, iter(sucesores(raiz)))]
+        while trabajo:
+            v, hijos = trabajo[-1]
+            for w in hijos:
+                if w not in indice:
+                    indice[w] = bajo[w] = len(indice)
+                    pila.append(w)
+                    en_pila.add(w)
+                    trabajo.append((w, iter(sucesores(w))))
+                    break
+                if w in en_pila and indice[w] < bajo[v]:
+                    bajo[v] = indice[w]
+            else:
+                trabajo.pop()
+                if trabajo:
+                    padre = trabajo[-1][0]
+                    if bajo[v] < bajo[padre]:
+                        bajo[padre] = bajo[v]
+                if bajo[v] == indice[v]:
+                    componente = []
+                    while True:
+                        w = pila.pop()
+                        en_pila.discard(w)
+                        componente.append(w)
+                        if w == v:
+                            break
+                    componentes.append(componente)
+    return componentes
+
+
+class ConflictoLL1:
+    """
+    Conflicto en la celda M[no_terminal, terminal] de la tabla LL(1).
+
+    - FIRST/FIRST: varias producciones de no_terminal pueden empezar con
+      `terminal` (o varias derivan epsilon).
+    - FIRST/FOLLOW: una producción anulable entra por FOLLOW(no_terminal)
+      y choca con otra que empieza con `terminal`.
+    """
+
+    def __init__(self, tipo: str, no_terminal: str, terminal: str, producciones: List[List[str]]):
+        self.tipo = tipo
+        self.no_terminal = no_terminal
+        self.terminal = terminal
+        self.producciones = producciones
+
+    def __repr__(self) -> str:
+        return f"ConflictoLL1({self.tipo!r}, {self.no_terminal!r}, {self.terminal!r}, {self.producciones!r})"
+
+    def __str__(self) -> str:
+        cuerpos = " | ".join(" ".join(p) for p in self.producciones)
+        return f"{self.tipo} en M[{self.no_terminal}, {self.terminal}]: {self.no_terminal} -> {cuerpos}"
+
+
 class GeneradorTablaLL1:
     """
     Calcula conjuntos FIRST, FOLLOW y la tabla LL(1) para una gramática dada.
     La gramática G se representa como: { NoTerminal: [ [simbolos], [simbolos], ... ] }
+
+    Internamente los conjuntos son máscaras de bits sobre los terminales
+    (ordenados; epsilon ocupa el bit siguiente al último terminal) y se
+    calculan en una sola pasada por las componentes fuertemente conexas del
+    grafo de dependencias, en lugar de repetir rondas hasta el punto fijo.
+    FIRST de cada sufijo de cada producción queda guardado en _first_sufijos.
     """
     def __init__(self, gramatica: Dict[str, List[List[str]]], simbolo_inicial: str):
         self.G = gramatica
@@ -14,13 +103,14 @@ class GeneradorTablaLL1:
         self.terminales = self._inferir_terminales()
 
         # FIRST, FOLLOW y tabla M
-        self.FIRST: Dict[str, Set[str]] = {
-            s: set() for s in list(self.no_terminales) + list(self.terminales) + [EPSILON_GRAMATICA]
-        }
-        self.FOLLOW: Dict[str, Set[str]] = {A: set() for A in self.no_terminales}
+        self.FIRST: Dict[str, Set[str]] = {}
+        self.FOLLOW: Dict[str, Set[str]] = {}
         self.tabla_M: Dict[str, Dict[str, List[List[str]]]] = {}
         self.conflictos: List[Tuple[str, str, List[List[str]]]] = []
+        self.reporte_conflictos: List[ConflictoLL1] = []
 
+        self._numerar_producciones()
+        self._indexar_terminales()
         self._calcular_conjuntos_first()
         self._calcular_conjuntos_follow()
 
@@ -34,92 +124,412 @@ class GeneradorTablaLL1:
         terminales.add("$")
         return terminales
 
-    def _first_de_secuencia(self, secuencia: List[str]) -> Set[str]:
-        resultado = set()
-        if not secuencia:
-            resultado.add(EPSILON_GRAMATICA)
-            return resultado
-
-        for simbolo in secuencia:
-            if simbolo not in self.FIRST:
-                if simbolo in self.terminales:
-                    self.FIRST[simbolo] = {simbolo}
-                else:
-                    return set()
-            first_simbolo = self.FIRST[simbolo]
-            resultado.update(first_simbolo - {EPSILON_GRAMATICA})
-            if EPSILON_GRAMATICA not in first_simbolo:
-                return resultado
-
-        resultado.add(EPSILON_GRAMATICA)
+    def _numerar_producciones(self):
+        """
+        Da a cada producción distinta un id entero; dos cuerpos iguales del
+        mismo no terminal comparten id (en la tabla cuentan como uno solo).
+        """
+        self.producciones: List[Tuple[str, List[str]]] = []
+        self.ids_produccion: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+        for A, producciones in self.G.items():
+            for prod in producciones:
+                clave = (A, tuple(prod))
+                if clave not in self.ids_produccion:
+                    self.ids_produccion[clave] = len(self.producciones)
+                    self.producciones.append((A, prod))
+
+    def _indexar_terminales(self):
+        self._orden_terminales: List[str] = sorted(self.terminales)
+        self._bit_terminal: Dict[str, int] = {t: 1 << i for i, t in enumerate(self._orden_terminales)}
+        self._bit_epsilon = 1 << len(self._orden_terminales)
+        self._first_bits: Dict[str, int] = {}
+        self._follow_bits: Dict[str, int] = {}
+        # _first_sufijos[A][j][i] = FIRST (en bits) de G[A][j][i:]
+        self._first_sufijos: Dict[str, List[List[int]]] = {}
+
+    def _terminales_de(self, bits: int) -> List[str]:
+        """Terminales de la máscara, en orden (sin epsilon)."""
+        terminales = []
+        bits &= ~self._bit_epsilon
+        while bits:
+            menor = bits & -bits
+            terminales.append(self._orden_terminales[menor.bit_length() - 1])
+            bits ^= menor
+        return terminales
+
+    def _a_conjunto(self, bits: int) -> Set[str]:
+        conjunto = set(self._terminales_de(bits))
+        if bits & self._bit_epsilon:
+            conjunto.add(EPSILON_GRAMATICA)
+        return conjunto
+
+    def _a_bits(self, conjunto: Iterable[str]) -> int:
+        bits = 0
+        for x in conjunto:
+            bits |= self._bit_epsilon if x == EPSILON_GRAMATICA else self._bit_terminal[x]
+        return bits
+
+    def _first_bits_de_secuencia(self, secuencia: List[str], siguiente: int) -> int:
+        """FIRST (en bits) de secuencia seguida de algo cuyo FIRST es `siguiente`."""
+        resultado = siguiente
+        for simbolo in reversed(secuencia):
+            if simbolo == EPSILON_GRAMATICA:
+                continue
+            bits = self._bit_terminal.get(simbolo)
+            if bits is None:
+                bits = self._first_bits.get(simbolo, 0)
+            if bits & self._bit_epsilon:
+                resultado |= bits ^ self._bit_epsilon
+            else:
+                resultado = bits
         return resultado
 
+    def _first_de_secuencia(self, secuencia: List[str]) -> Set[str]:
+        return self._a_conjunto(self._first_bits_de_secuencia(secuencia, self._bit_epsilon))
+
+    def _calcular_anulables(self) -> Set[str]:
+        """No terminales que derivan epsilon (lista de trabajo con contadores por producción)."""
+        pendientes: List[int] = []
+        usos: Dict[str, List[int]] = {}
+        cabezas: List[str] = []
+        anulables: Set[str] = set()
+        cola: List[str] = []
+        for A, producciones in self.G.items():
+            for prod in producciones:
+                simbolos = [x for x in prod if x != EPSILON_GRAMATICA]
+                if any(x not in self.no_terminales for x in simbolos):
+                    continue
+                k = len(cabezas)
+                cabezas.append(A)
+                pendientes.append(len(simbolos))
+                for x in simbolos:
+                    usos.setdefault(x, []).append(k)
+                if not simbolos and A not in anulables:
+                    anulables.add(A)
+                    cola.append(A)
+        while cola:
+            B = cola.pop()
+            for k in usos.get(B, ()):
+                pendientes[k] -= 1
+                if pendientes[k] == 0 and cabezas[k] not in anulables:
+                    anulables.add(cabezas[k])
+                    cola.append(cabezas[k])
+        return anulables
+
     def _calcular_conjuntos_first(self):
+        anulables = self._calcular_anulables()
+
+        # FIRST(A) = terminales iniciales directos ∪ FIRST de los no terminales
+        # que pueden aparecer al principio de algún cuerpo de A
+        directos: Dict[str, int] = {}
+        dependencias: Dict[str, Set[str]] = {}
         for A in self.no_terminales:
-            self.FIRST[A] = set()
+            bits = 0
+            deps: Set[str] = set()
+            for prod in self.G[A]:
+                for X in prod:
+                    if X == EPSILON_GRAMATICA:
+                        continue
+                    if X not in self.no_terminales:
+                        bits |= self._bit_terminal[X]
+                        break
+                    deps.add(X)
+                    if X not in anulables:
+                        break
+            directos[A] = bits
+            dependencias[A] = deps
+
+        # Dentro de una componente todos comparten FIRST (salvo epsilon)
+        first = self._first_bits
+        for componente in _componentes_fuertes(sorted(self.no_terminales), lambda A: dependencias[A]):
+            miembros = set(componente)
+            bits = 0
+            for A in componente:
+                bits |= directos[A]
+                for B in dependencias[A]:
+                    if B not in miembros:
+                        bits |= first[B] & ~self._bit_epsilon
+            for A in componente:
+                first[A] = bits | (self._bit_epsilon if A in anulables else 0)
+
+        self._calcular_first_sufijos()
+
+        self.FIRST = {A: self._a_conjunto(bits) for A, bits in first.items()}
         for t in self.terminales:
             self.FIRST[t] = {t}
         self.FIRST[EPSILON_GRAMATICA] = {EPSILON_GRAMATICA}
 
-        cambio = True
-        while cambio:
-            cambio = False
-            for A, producciones in self.G.items():
-                for prod in producciones:
-                    first_alpha = self._first_de_secuencia(prod)
-                    antes = len(self.FIRST[A])
-                    self.FIRST[A].update(first_alpha)
-                    if len(self.FIRST[A]) != antes:
-                        cambio = True
+    def _calcular_first_sufijos(self):
+        for A, producciones in self.G.items():
+            filas = []
+            for prod in producciones:
+                sufijos = [0] * (len(prod) + 1)
+                sufijos[-1] = self._bit_epsilon
+                for i in range(len(prod) - 1, -1, -1):
+                    sufijos[i] = self._first_bits_de_secuencia(prod[i:i + 1], sufijos[i + 1])
+                filas.append(sufijos)
+            self._first_sufijos[A] = filas
 
     def _calcular_conjuntos_follow(self):
-        for A in self.no_terminales:
-            self.FOLLOW[A] = set()
-        self.FOLLOW[self.simbolo_inicial].add("$")
-
-        cambio = True
-        while cambio:
-            cambio = False
-            for A, producciones in self.G.items():
-                for prod in producciones:
-                    for i, B in enumerate(prod):
-                        if B in self.no_terminales:
-                            beta = prod[i + 1:]
-                            first_beta = self._first_de_secuencia(beta)
-                            antes = len(self.FOLLOW[B])
-                            self.FOLLOW[B].update(first_beta - {EPSILON_GRAMATICA})
-                            if EPSILON_GRAMATICA in first_beta or not beta:
-                                self.FOLLOW[B].update(self.FOLLOW[A])
-                            if len(self.FOLLOW[B]) != antes:
-                                cambio = True
+        # FOLLOW(B) ⊇ FIRST(beta) - {epsilon} por cada A -> alpha B beta,
+        # y FOLLOW(B) ⊇ FOLLOW(A) si beta es anulable
+        directos: Dict[str, int] = {A: 0 for A in self.no_terminales}
+        dependencias: Dict[str, Set[str]] = {A: set() for A in self.no_terminales}
+        directos[self.simbolo_inicial] |= self._bit_terminal["$"]
+        for A, producciones in self.G.items():
+            for prod, sufijos in zip(producciones, self._first_sufijos[A]):
+                for i, B in enumerate(prod):
+                    if B in self.no_terminales:
+                        resto = sufijos[i + 1]
+                        directos[B] |= resto & ~self._bit_epsilon
+                        if resto & self._bit_epsilon and A != B:
+                            dependencias[B].add(A)
+
+        follow: Dict[str, int] = {}
+        for componente in _componentes_fuertes(sorted(self.no_terminales), lambda B: dependencias[B]):
+            miembros = set(componente)
+            bits = 0
+            for B in componente:
+                bits |= directos[B]
+                for A in dependencias[B]:
+                    if A not in miembros:
+                        bits |= follow[A]
+            for B in componente:
+                follow[B] = bits
+
+        self._follow_bits = follow
+        self.FOLLOW = {A: self._a_conjunto(bits) for A, bits in follow.items()}
 
     def construir_tabla(self) -> Dict[str, Dict[str, List[List[str]]]]:
+        """
+        Llena la tabla M. Las celdas se arman en un diccionario (A, a) ->
+        {id de producción: origen}, con origen "FIRST" o "FOLLOW", así que
+        insertar y detectar conflictos cuesta O(1) por entrada.
+        """
+        celdas: Dict[Tuple[str, str], Dict[int, str]] = {}
+        for A, producciones in self.G.items():
+            for prod, sufijos in zip(producciones, self._first_sufijos[A]):
+                pid = self.ids_produccion[(A, tuple(prod))]
+                for a in self._terminales_de(sufijos[0]):
+                    celdas.setdefault((A, a), {}).setdefault(pid, "FIRST")
+                if sufijos[0] & self._bit_epsilon:
+                    for b in self._terminales_de(self._follow_bits[A]):
+                        celdas.setdefault((A, b), {}).setdefault(pid, "FOLLOW")
+
         self.tabla_M = {A: {} for A in self.no_terminales}
         self.conflictos = []
-
-        for A, producciones in self.G.items():
-            for prod in producciones:
-                first_alpha = self._first_de_secuencia(prod)
-                for a in (first_alpha - {EPSILON_GRAMATICA}):
-                    celda = self.tabla_M[A].setdefault(a, [])
-                    if prod not in celda:
-                        celda.append(prod)
-                        if len(celda) > 1:
-                            # conflicto LL(1)
-                            existe = any(c[0] == A and c[1] == a for c in self.conflictos)
-                            if not existe:
-                                self.conflictos.append((A, a, [p[:] for p in celda]))
-                if EPSILON_GRAMATICA in first_alpha:
-                    for b in self.FOLLOW[A]:
-                        celda = self.tabla_M[A].setdefault(b, [])
-                        if prod not in celda:
-                            celda.append(prod)
-                            if len(celda) > 1:
-                                existe = any(c[0] == A and c[1] == b for c in self.conflictos)
-                                if not existe:
-                                    self.conflictos.append((A, b, [p[:] for p in celda]))
+        self.reporte_conflictos = []
+        for (A, a), origenes in celdas.items():
+            celda = [self.producciones[pid][1] for pid in origenes]
+            self.tabla_M[A][a] = celda
+            if len(celda) > 1:
+                self.conflictos.append((A, a, [p[:] for p in celda]))
+                self.reporte_conflictos.extend(self._clasificar_conflicto(A, a, origenes))
         return self.tabla_M
 
+    def _clasificar_conflicto(self, A: str, a: str, origenes: Dict[int, str]) -> List[ConflictoLL1]:
+        por_first = [self.producciones[pid][1] for pid, origen in origenes.items() if origen == "FIRST"]
+        por_follow = [self.producciones[pid][1] for pid, origen in origenes.items() if origen == "FOLLOW"]
+        conflictos = []
+        if len(por_first) > 1:
+            conflictos.append(ConflictoLL1("FIRST/FIRST", A, a, por_first))
+        if len(por_follow) > 1:
+            conflictos.append(ConflictoLL1("FIRST/FIRST", A, a, por_follow))
+        if por_first and por_follow:
+            conflictos.append(ConflictoLL1("FIRST/FOLLOW", A, a, por_first + por_follow))
+        return conflictos
+
+    def es_ll1(self) -> bool:
+        """True si la tabla (ya construida) no tiene celdas con más de una producción."""
+        return not self.conflictos
+
+    def resumen_conflictos(self) -> str:
+        """Texto con un conflicto por línea, agrupados por tipo (tabla ya construida)."""
+        if not self.reporte_conflictos:
+            return "La gramática es LL(1): no hay conflictos en la tabla."
+        lineas = [f"La gramática no es LL(1): {len(self.reporte_conflictos)} conflicto(s)."]
+        for tipo in ("FIRST/FIRST", "FIRST/FOLLOW"):
+            lineas.extend(f"  {c}" for c in self.reporte_conflictos if c.tipo == tipo)
+        return "\n".join(lineas)
+
+    def compilar(self) -> "AnalizadorLL1Compilado":
+        """AnalizadorLL1Compilado de esta tabla (se crea una vez y se reutiliza)."""
+        compilado = getattr(self, "_compilado", None)
+        if compilado is None:
+            compilado = self._compilado = AnalizadorLL1Compilado(self)
+        return compilado
+
+    def a_dict(self) -> Dict[str, Any]:
+        """Conjuntos FIRST / FOLLOW y tabla M en un diccionario serializable a JSON."""
+        return {
+            "terminales": sorted(self.terminales),
+            "FIRST": {s: sorted(c) for s, c in self.FIRST.items()},
+            "FOLLOW": {A: sorted(c) for A, c in self.FOLLOW.items()},
+            "tabla_M": self.tabla_M,
+            "conflictos": [list(c) for c in self.conflictos],
+            "reporte_conflictos": [
+                [c.tipo, c.no_terminal, c.terminal, c.producciones] for c in self.reporte_conflictos
+            ],
+        }
+
+    @classmethod
+    def desde_dict(
+        cls, gramatica: Dict[str, List[List[str]]], simbolo_inicial: str, datos: Dict[str, Any]
+    ) -> "GeneradorTablaLL1":
+        """Reconstruye el generador a partir de a_dict() sin volver a calcular los puntos fijos."""
+        generador = cls.__new__(cls)
+        generador.G = gramatica
+        generador.simbolo_inicial = simbolo_inicial
+        generador.no_terminales = set(gramatica.keys())
+        generador.terminales = set(datos["terminales"])
+        generador.FIRST = {s: set(c) for s, c in datos["FIRST"].items()}
+        generador.FOLLOW = {A: set(c) for A, c in datos["FOLLOW"].items()}
+        generador.tabla_M = datos["tabla_M"]
+        generador.conflictos = [(A, a, prods) for A, a, prods in datos["conflictos"]]
+        generador.reporte_conflictos = [ConflictoLL1(*c) for c in datos["reporte_conflictos"]]
+
+        # Ids, máscaras y FIRST de sufijos: pasadas lineales a partir de los conjuntos guardados
+        generador._numerar_producciones()
+        generador._indexar_terminales()
+        for A in generador.no_terminales:
+            generador._first_bits[A] = generador._a_bits(generador.FIRST[A])
+            generador._follow_bits[A] = generador._a_bits(generador.FOLLOW[A])
+        generador._calcular_first_sufijos()
+        return generador
+
+
+# ==========================================
+#   Caché de tablas LL(1)
+# ==========================================
+
+# Tablas ya construidas en este proceso, por huella de la gramática.
+# Se comparten entre todas las ventanas: no deben modificarse.
+_TABLAS_LL1: Dict[str, GeneradorTablaLL1] = {}
+
+
+def huella_gramatica(gramatica: Dict[str, List[List[str]]], simbolo_inicial: str) -> str:
+    """
+    Hash SHA-256 del contenido de la gramática (en su orden, que decide el
+    orden de las producciones en las celdas con conflicto).
+    """
+    contenido = json.dumps(
+        [VERSION_CACHE_LL1, simbolo_inicial, list(gramatica.items())],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def directorio_cache_ll1() -> str:
+    """Carpeta de caché del usuario (LOCALAPPDATA en Windows, XDG_CACHE_HOME o ~/.cache)."""
+    base = (
+        os.environ.get("LOCALAPPDATA")
+        or os.environ.get("XDG_CACHE_HOME")
+        or os.path.join(os.path.expanduser("~"), ".cache")
+    )
+    return os.path.join(base, "ChomskyClassifierAI", "ll1")
+
+
+def _leer_cache_ll1(
+    ruta: str, gramatica: Dict[str, List[List[str]]], simbolo_inicial: str
+) -> Optional[GeneradorTablaLL1]:
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return GeneradorTablaLL1.desde_dict(gramatica, simbolo_inicial, json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        # No existe o está dañado: se recalcula
+        return None
+
+
+def _escribir_cache_ll1(ruta: str, generador: GeneradorTablaLL1) -> None:
+    """Escribe en un temporal y lo renombra, para no dejar archivos a medias."""
+    try:
+        carpeta = os.path.dirname(ruta)
+        os.makedirs(carpeta, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                json.dump(generador.a_dict(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temporal, ruta)
+        except BaseException:
+            os.unlink(temporal)
+            raise
+    except OSError:
+        # Sin permisos o sin espacio: la tabla sigue sirviendo en memoria
+        pass
+
+
+def obtener_tabla_ll1(
+    gramatica: Dict[str, List[List[str]]],
+    simbolo_inicial: str,
+    directorio: Optional[str] = None,
+) -> GeneradorTablaLL1:
+    """
+    Devuelve el GeneradorTablaLL1 de la gramática con la tabla ya construida.
+
+    Primero busca en la memoria del proceso, luego en la caché en disco
+    (un JSON por huella de la gramática) y solo si no está calcula FIRST,
+    FOLLOW y la tabla, y la guarda para la próxima vez.
+    """
+    clave = huella_gramatica(gramatica, simbolo_inicial)
+    generador = _TABLAS_LL1.get(clave)
+    if generador is not None:
+        return generador
+
+    ruta = os.path.join(directorio or directorio_cache_ll1(), clave + ".json")
+    generador = _leer_cache_ll1(ruta, gramatica, simbolo_inicial)
+    if generador is None:
+        generador = GeneradorTablaLL1(gramatica, simbolo_inicial)
+        generador.construir_tabla()
+        _escribir_cache_ll1(ruta, generador)
+
+    _TABLAS_LL1[clave] = generador
+    return generador
+
+
+def _fin_de_entrada(lista_tokens: Sequence[Tuple[str, str, int, int]]) -> Tuple[str, str, int, int]:
+    """Token de fin de cadena, ubicado justo después del último token."""
+    if lista_tokens:
+        ultimo_lexema, _, ult_lin, ult_col = lista_tokens[-1][:4]
+        return "$", "$", ult_lin, ult_col + (len(ultimo_lexema) if ultimo_lexema else 1)
+    return "$", "$", 1, 1
+
+
+def _describir_token(lexema: str, tipo: str) -> str:
+    if tipo == "$":
+        return "<fin>"
+    if tipo == "FIN_LINEA":
+        return "<fin de línea>"
+    return f"'{lexema}'"
+
+
+def _error_terminal(token: Tuple[str, str, int, int], esperado: str) -> str:
+    lexema_actual, tipo_actual, lin_act, col_act = token
+    encontrado = _describir_token(lexema_actual, tipo_actual)
+    return (
+        f"[Línea {lin_act} | Columna {col_act}] "
+        f"Se encontró {encontrado} (tipo {tipo_actual}), pero se esperaba {esperado}."
+    )
+
+
+def _error_despues_del_fin(token: Tuple[str, str, int, int]) -> str:
+    lexema_actual, tipo_actual, lin_act, col_act = token
+    return (
+        f"[Línea {lin_act} | Columna {col_act}] "
+        f"Se encontró {_describir_token(lexema_actual, tipo_actual)} (tipo {tipo_actual}) después del fin esperado."
+    )
+
+
+def _error_no_terminal(token: Tuple[str, str, int, int], X: str, fila: Dict[str, Any]) -> str:
+    lexema_actual, tipo_actual, lin_act, col_act = token
+    encontrado = _describir_token(lexema_actual, tipo_actual)
+    esperados = ", ".join(sorted(list(fila.keys()))) if fila else "<ninguno>"
+    return (
+        f"[Línea {lin_act} | Columna {col_act}] "
+        f"Token inesperado {encontrado} (tipo {tipo_actual}). "
+        f"Para el No-Terminal <{X}> se esperaba uno de: {esperados}."
+    )
+
 
 def analizar_sintactico(
     lista_tokens: List[Tuple[str, str, int, int]],
@@ -137,13 +547,7 @@ def analizar_sintactico(
     entrada = [(tok[0], tok[1], tok[2], tok[3]) for tok in lista_tokens]
 
     # Añadir token de fin de cadena
-    if entrada:
-        ultimo_lexema, _, ult_lin, ult_col = entrada[-1]
-        fin_lin = ult_lin
-        fin_col = ult_col + (len(ultimo_lexema) if ultimo_lexema else 1)
-    else:
-        fin_lin, fin_col = 1, 1
-    entrada.append(("$", "$", fin_lin, fin_col))
+    entrada.append(_fin_de_entrada(entrada))
 
     pila: List[NodoArbol] = []
     raiz = NodoArbol(simbolo_inicial)
@@ -173,34 +577,21 @@ def analizar_sintactico(
                 i += 1
                 continue
             else:
-                encontrado = f"'{lexema_actual}'" if tipo_actual != "$" else "<fin>"
-                return None, (
-                    f"[Línea {lin_act} | Columna {col_act}] "
-                    f"Se encontró {encontrado} (tipo {tipo_actual}), pero se esperaba {X}."
-                )
+                return None, _error_terminal(entrada[i], X)
 
         # Caso: fin de pila
         if X == "$":
             if tipo_actual == "$":
                 return raiz, None  # éxito total
             else:
-                return None, (
-                    f"[Línea {lin_act} | Columna {col_act}] "
-                    f"Se encontró '{lexema_actual}' (tipo {tipo_actual}) después del fin esperado."
-                )
+                return None, _error_despues_del_fin(entrada[i])
 
         # Caso: no-terminal
         fila = tabla_M.get(X, {})
         candidatos = fila.get(tipo_actual, [])
 
         if not candidatos:
-            encontrado = f"'{lexema_actual}'" if tipo_actual != "$" else "<fin>"
-            esperados = ", ".join(sorted(list(fila.keys()))) if fila else "<ninguno>"
-            return None, (
-                f"[Línea {lin_act} | Columna {col_act}] "
-                f"Token inesperado {encontrado} (tipo {tipo_actual}). "
-                f"Para el No-Terminal <{X}> se esperaba uno de: {esperados}."
-            )
+            return None, _error_no_terminal(entrada[i], X, fila)
 
         produccion = candidatos[0]
         hijos = [NodoArbol(simbolo) for simbolo in produccion]
@@ -211,3 +602,248 @@ def analizar_sintactico(
                 pila.append(h)
 
     return None, "Error inesperado: se terminó el ciclo sin aceptar la entrada."
+
+
+def analizar_sintactico_con_recuperacion(
+    lista_tokens: List[Tuple[str, str, int, int]],
+    tabla_M: Dict[str, Dict[str, List[List[str]]]],
+    simbolo_inicial: str,
+    first_sets: Dict[str, Set[str]],
+    follow_sets: Dict[str, Set[str]],
+) -> Tuple[NodoArbol, List[str]]:
+    """
+    Como analizar_sintactico, pero no se detiene en el primer error
+    (recuperación en modo pánico). Devuelve:
+      (raiz_del_arbol_parcial, lista_de_errores)   # lista vacía si todo salió bien
+
+    - Terminal esperado que no llega: se informa y se da por insertado
+      (o, si el token siguiente es el esperado, se descarta el actual).
+    - No terminal X sin entrada en la tabla: se descartan tokens hasta uno
+      de FIRST(X) (se sigue con X) o de FOLLOW(X) (se abandona X).
+    Tras un error no se informa otro hasta aceptar un token, para no
+    repetir mensajes en cascada. Los nodos abandonados quedan sin hijos y
+    los terminales insertados, sin lexema.
+    """
+    no_terminales = set(tabla_M.keys())
+    entrada = [(tok[0], tok[1], tok[2], tok[3]) for tok in lista_tokens]
+    entrada.append(_fin_de_entrada(entrada))
+
+    errores: List[str] = []
+    en_panico = False
+
+    def informar(mensaje: str) -> None:
+        nonlocal en_panico
+        if not en_panico:
+            errores.append(mensaje)
+        en_panico = True
+
+    raiz = NodoArbol(simbolo_inicial)
+    pila: List[NodoArbol] = [NodoArbol("$"), raiz]
+
+    i = 0
+    while pila:
+        nodo_X = pila.pop()
+        X = nodo_X.simbolo
+        lexema_actual, tipo_actual, lin_act, col_act = entrada[i]
+
+        if X == EPSILON_GRAMATICA:
+            continue
+
+        # Caso: fin de pila (lo que quede en la entrada sobra)
+        if X == "$":
+            if tipo_actual != "$":
+                informar(_error_despues_del_fin(entrada[i]))
+            break
+
+        # Caso: X es terminal
+        if X not in no_terminales:
+            if X == tipo_actual:
+                nodo_X.lexema = lexema_actual
+                nodo_X.linea = lin_act
+                nodo_X.columna = col_act
+                i += 1
+                en_panico = False
+            else:
+                informar(_error_terminal(entrada[i], X))
+                if tipo_actual != "$" and entrada[i + 1][1] == X:
+                    # token de más: se descarta y X se vuelve a intentar
+                    i += 1
+                    pila.append(nodo_X)
+            continue
+
+        # Caso: no-terminal
+        fila = tabla_M.get(X, {})
+        candidatos = fila.get(tipo_actual)
+        if not candidatos:
+            informar(_error_no_terminal(entrada[i], X, fila))
+            siguientes = follow_sets.get(X, set())
+            sincronizacion = (first_sets.get(X, set()) - {EPSILON_GRAMATICA}) | siguientes
+            while entrada[i][1] != "$" and entrada[i][1] not in sincronizacion:
+                i += 1
+            candidatos = fila.get(entrada[i][1])
+            if not candidatos:
+                # En FOLLOW(X) o fin de la entrada: se abandona X
+                continue
+
+        hijos = [NodoArbol(simbolo) for simbolo in candidatos[0]]
+        for h in hijos:
+            nodo_X.agregar_hijo(h)
+        for h in reversed(hijos):
+            if h.simbolo != EPSILON_GRAMATICA:
+                pila.append(h)
+
+    return raiz, errores
+
+
+class AnalizadorLL1Compilado:
+    """
+    Analizador LL(1) sobre tablas de enteros.
+
+    Los terminales se numeran 0..T-1 (en el orden de GeneradorTablaLL1, con
+    "$") y los no terminales T..T+N-1; la tabla M es un array('i') plano de
+    N filas por T + 1 columnas (la última, para tipos de token desconocidos)
+    con el id de la producción elegida o -1. Cada producción guarda los
+    códigos a apilar ya invertidos y sin epsilon.
+
+    - acepta / aceptar_lote: solo reconocen, sin crear nodos.
+    - analizar: mismo resultado y mismos mensajes que analizar_sintactico;
+      con construir_arbol=False devuelve (None, error) sin crear el árbol.
+    """
+
+    def __init__(self, generador: GeneradorTablaLL1):
+        if not generador.tabla_M and generador.G:
+            generador.construir_tabla()
+        self.tabla_M = generador.tabla_M
+        self.simbolo_inicial = generador.simbolo_inicial
+
+        terminales = list(generador._orden_terminales)
+        no_terminales = sorted(generador.no_terminales)
+        self.nombres: List[str] = terminales + no_terminales
+        self.codigos: Dict[str, int] = {s: c for c, s in enumerate(self.nombres)}
+        self.n_terminales = T = len(terminales)
+        self.ancho = T + 1
+        self.desconocido = T
+        self.fin = self.codigos["$"]
+        self.inicial = self.codigos[self.simbolo_inicial]
+
+        # Por producción: símbolos (para los hijos del árbol) y, ya invertidos
+        # y sin epsilon, los códigos a apilar y la posición del hijo de cada uno
+        self.simbolos: List[Tuple[str, ...]] = []
+        self.apilar: List[Tuple[int, ...]] = []
+        self.posiciones: List[Tuple[int, ...]] = []
+        for _, prod in generador.producciones:
+            indices = [k for k, x in enumerate(prod) if x != EPSILON_GRAMATICA]
+            self.simbolos.append(tuple(prod))
+            self.apilar.append(tuple(self.codigos[prod[k]] for k in reversed(indices)))
+            self.posiciones.append(tuple(reversed(indices)))
+
+        self.tabla = array("i", [-1]) * (len(no_terminales) * self.ancho)
+        for A, fila in generador.tabla_M.items():
+            base = (self.codigos[A] - T) * self.ancho
+            for a, candidatos in fila.items():
+                if candidatos:
+                    self.tabla[base + self.codigos[a]] = generador.ids_produccion[(A, tuple(candidatos[0]))]
+
+    def _codificar(self, tipos: Iterable[str]) -> List[int]:
+        codigos, desconocido = self.codigos, self.desconocido
+        resultado = [codigos.get(t, desconocido) for t in tipos]
+        resultado.append(self.fin)
+        return resultado
+
+    def _reconocer(self, entrada: List[int]) -> Tuple[int, int]:
+        """
+        Recorre la entrada (ya codificada, terminada en fin) solo con la pila
+        de códigos. Devuelve (-1, -1) si acepta, o (posición, símbolo de la
+        pila) donde falló.
+        """
+        tabla, apilar, ancho, T, fin = self.tabla, self.apilar, self.ancho, self.n_terminales, self.fin
+        pila = [fin, self.inicial]
+        i = 0
+        a = entrada[0]
+        while True:
+            X = pila.pop()
+            if X < T:
+                if X != a:
+                    return i, X
+                if X == fin:
+                    return -1, -1
+                i += 1
+                a = entrada[i]
+            else:
+                p = tabla[(X - T) * ancho + a]
+                if p < 0:
+                    return i, X
+                pila.extend(apilar[p])
+
+    def acepta(self, tipos: Sequence[str]) -> bool:
+        """True si la secuencia de tipos de token pertenece al lenguaje."""
+        return self._reconocer(self._codificar(tipos))[0] < 0
+
+    def aceptar_lote(self, secuencias: Iterable[Sequence[str]]) -> List[bool]:
+        return [self.acepta(tipos) for tipos in secuencias]
+
+    def _mensaje_error(self, token: Tuple[str, str, int, int], X: int) -> str:
+        nombre = self.nombres[X]
+        if X >= self.n_terminales:
+            return _error_no_terminal(token, nombre, self.tabla_M.get(nombre, {}))
+        if X == self.fin:
+            return _error_despues_del_fin(token)
+        return _error_terminal(token, nombre)
+
+    def analizar(
+        self, lista_tokens: Sequence[Tuple[str, str, int, int]], construir_arbol: bool = True
+    ) -> Tuple[Optional[NodoArbol], Optional[str]]:
+        """(raiz_del_arbol, mensaje_error), como analizar_sintactico."""
+        entrada = self._codificar(tok[1] for tok in lista_tokens)
+        fin_entrada = _fin_de_entrada(lista_tokens)
+
+        def token(i: int) -> Tuple[str, str, int, int]:
+            return fin_entrada if i == len(lista_tokens) else tuple(lista_tokens[i][:4])
+
+        if not construir_arbol:
+            i, X = self._reconocer(entrada)
+            return None, (None if i < 0 else self._mensaje_error(token(i), X))
+
+        # El árbol no tiene ciclos: se pausa el recolector mientras se crean
+        # los nodos para que no recorra una y otra vez los ya creados
+        gc_activo = gc.isenabled()
+        gc.disable()
+        try:
+            raiz, i, X = self._construir_arbol(lista_tokens, entrada)
+        finally:
+            if gc_activo:
+                gc.enable()
+        return (raiz, None) if i < 0 else (None, self._mensaje_error(token(i), X))
+
+    def _construir_arbol(
+        self, lista_tokens: Sequence[Tuple[str, str, int, int]], entrada: List[int]
+    ) -> Tuple[Optional[NodoArbol], int, int]:
+        """Como _reconocer, pero creando los nodos; devuelve (raiz, posición, símbolo)."""
+        tabla, apilar, posiciones, simbolos = self.tabla, self.apilar, self.posiciones, self.simbolos
+        ancho, T, fin = self.ancho, self.n_terminales, self.fin
+        raiz = NodoArbol(self.simbolo_inicial)
+        pila = [fin, self.inicial]
+        nodos = [None, raiz]
+        i = 0
+        a = entrada[0]
+        while True:
+            X = pila.pop()
+            nodo = nodos.pop()
+            if X < T:
+                if X != a:
+                    return None, i, X
+                if X == fin:
+                    return raiz, -1, -1
+                tok = lista_tokens[i]
+                nodo.lexema, nodo.linea, nodo.columna = tok[0], tok[2], tok[3]
+                i += 1
+                a = entrada[i]
+            else:
+                p = tabla[(X - T) * ancho + a]
+                if p < 0:
+                    return None, i, X
+                hijos = [NodoArbol(s) for s in simbolos[p]]
+                nodo.hijos.extend(hijos)
+                pila.extend(apilar[p])
+                nodos.extend([hijos[k] for k in posiciones[p]])
+
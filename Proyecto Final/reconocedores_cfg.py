@@ -0,0 +1,358 @@
+"""
+Reconocedores para gramáticas de Tipo 2 (libres de contexto):
+decide si una cadena w pertenece a L(G) sin enumerar el lenguaje.
+
+- convertir_a_fnc: lleva una lista de Produccion a Forma Normal de
+  Chomsky (A -> B C, A -> a y, si corresponde, S -> ε).
+- ReconocedorCYK: CYK sobre la gramática en FNC. Para cada no terminal
+  A y cada posición i guarda un entero cuyos bits son las posiciones j
+  tales que A =>* w[i:j], y propaga solo los bits nuevos.
+- ReconocedorEarley: Earley sobre la gramática original, sin normalizar.
+
+Las cadenas son secuencias de terminales: un str sirve cuando todos los
+terminales son de un carácter; para terminales como "id" se pasa una
+lista o tupla de símbolos.
+"""
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+from estructuras_gramatica import Produccion, TablaSimbolos
+
+
+# Símbolo interno: (es_terminal, valor)
+_SimboloFNC = Tuple[bool, str]
+_Cuerpo = Tuple[_SimboloFNC, ...]
+
+
+def _leer_tipo_2(producciones: Iterable[Produccion]) -> Tuple[str, Dict[str, List[_Cuerpo]]]:
+    """Devuelve (símbolo inicial, reglas A -> [cuerpos]) y valida que sea Tipo 2."""
+    inicial = None
+    reglas: Dict[str, List[_Cuerpo]] = {}
+    for p in producciones:
+        if len(p.alpha) != 1 or p.alpha[0].es_terminal:
+            raise ValueError(f"La regla '{p}' no es de Tipo 2: el lado izquierdo debe ser un solo No-Terminal.")
+        A = p.alpha[0].valor
+        if inicial is None:
+            inicial = A
+        cuerpo = tuple((s.es_terminal, s.valor) for s in p.beta)
+        cuerpos = reglas.setdefault(A, [])
+        if cuerpo not in cuerpos:
+            cuerpos.append(cuerpo)
+    if inicial is None:
+        raise ValueError("La gramática está vacía.")
+    return inicial, reglas
+
+
+def _anulables(reglas: Dict[str, List[_Cuerpo]]) -> Set[str]:
+    anulables: Set[str] = set()
+    cambio = True
+    while cambio:
+        cambio = False
+        for A, cuerpos in reglas.items():
+            if A not in anulables and any(
+                all(not t and v in anulables for t, v in cuerpo) for cuerpo in cuerpos
+            ):
+                anulables.add(A)
+                cambio = True
+    return anulables
+
+
+# ===========================
+#   Forma Normal de Chomsky
+# ===========================
+
+def _fnc_interna(producciones: Iterable[Produccion]) -> Tuple[str, Dict[str, List[_Cuerpo]]]:
+    inicial, reglas = _leer_tipo_2(producciones)
+    usados = set(reglas) | {v for cuerpos in reglas.values() for c in cuerpos for t, v in c if not t}
+
+    def nombre_nuevo(base: str) -> str:
+        nombre, k = base, 1
+        while nombre in usados:
+            nombre = f"{base}{k}"
+            k += 1
+        usados.add(nombre)
+        return nombre
+
+    def agregar(A: str, cuerpo: _Cuerpo) -> None:
+        cuerpos = reglas.setdefault(A, [])
+        if cuerpo not in cuerpos:
+            cuerpos.append(cuerpo)
+
+    # 1) Inicial nuevo si el inicial aparece en algún lado derecho
+    if any((False, inicial) in c for cuerpos in reglas.values() for c in cuerpos):
+        anterior, inicial = inicial, nombre_nuevo(f"{inicial}0")
+        reglas = {inicial: [((False, anterior),)], **reglas}
+
+    # 2) Terminales dentro de cuerpos largos -> No-Terminal T_a -> a
+    por_terminal: Dict[str, str] = {}
+    for A in list(reglas):
+        nuevos: List[_Cuerpo] = []
+        for cuerpo in reglas[A]:
+            if len(cuerpo) >= 2:
+                reemplazo = []
+                for t, v in cuerpo:
+                    if t:
+                        if v not in por_terminal:
+                            por_terminal[v] = nombre_nuevo(f"T_{v}")
+                        reemplazo.append((False, por_terminal[v]))
+                    else:
+                        reemplazo.append((t, v))
+                cuerpo = tuple(reemplazo)
+            nuevos.append(cuerpo)
+        reglas[A] = nuevos
+    for v, T in por_terminal.items():
+        reglas[T] = [((True, v),)]
+
+    # 3) Cuerpos de más de dos símbolos -> cadenas de reglas binarias (sufijos compartidos)
+    por_sufijo: Dict[_Cuerpo, str] = {}
+
+    def binarizar(cuerpo: _Cuerpo) -> _Cuerpo:
+        if len(cuerpo) <= 2:
+            return cuerpo
+        sufijo = cuerpo[1:]
+        X = por_sufijo.get(sufijo)
+        if X is None:
+            X = por_sufijo[sufijo] = nombre_nuevo("X")
+            reglas[X] = [binarizar(sufijo)]
+        return cuerpo[0], (False, X)
+
+    for A in list(reglas):
+        reglas[A] = [binarizar(c) for c in reglas[A]]
+
+    # 4) Eliminar reglas ε (salvo inicial -> ε)
+    anulables = _anulables(reglas)
+    for A in list(reglas):
+        nuevos = []
+        for cuerpo in reglas[A]:
+            variantes = [cuerpo]
+            if len(cuerpo) == 2:
+                (t1, v1), (t2, v2) = cuerpo
+                if not t1 and v1 in anulables:
+                    variantes.append(cuerpo[1:])
+                if not t2 and v2 in anulables:
+                    variantes.append(cuerpo[:1])
+            for variante in variantes:
+                if variante and variante not in nuevos:
+                    nuevos.append(variante)
+        reglas[A] = nuevos
+    if inicial in anulables:
+        agregar(inicial, ())
+
+    # 5) Eliminar reglas unitarias A -> B
+    for A in list(reglas):
+        alcanzados = [A]
+        vistos = {A}
+        for B in alcanzados:
+            for cuerpo in reglas.get(B, []):
+                if len(cuerpo) == 1 and not cuerpo[0][0] and cuerpo[0][1] not in vistos:
+                    vistos.add(cuerpo[0][1])
+                    alcanzados.append(cuerpo[0][1])
+        nuevos = []
+        for B in alcanzados:
+            for cuerpo in reglas.get(B, []):
+                es_unitaria = len(cuerpo) == 1 and not cuerpo[0][0]
+                if not es_unitaria and cuerpo not in nuevos:
+                    nuevos.append(cuerpo)
+        reglas[A] = nuevos
+
+    # 6) Quitar símbolos que no generan cadenas o que no son alcanzables
+    generadores: Set[str] = set()
+    cambio = True
+    while cambio:
+        cambio = False
+        for A, cuerpos in reglas.items():
+            if A not in generadores and any(all(t or v in generadores for t, v in c) for c in cuerpos):
+                generadores.add(A)
+                cambio = True
+    alcanzables = [inicial] if inicial in generadores else []
+    vistos = set(alcanzables)
+    for A in alcanzables:
+        for cuerpo in reglas[A]:
+            if all(t or v in generadores for t, v in cuerpo):
+                for t, v in cuerpo:
+                    if not t and v not in vistos:
+                        vistos.add(v)
+                        alcanzables.append(v)
+
+    resultado = {
+        A: [c for c in reglas[A] if all(t or v in generadores for t, v in c)]
+        for A in alcanzables
+    }
+    return inicial, resultado
+
+
+def convertir_a_fnc(producciones: Iterable[Produccion]) -> List[Produccion]:
+    """
+    Convierte una gramática de Tipo 2 a Forma Normal de Chomsky:
+    todas las reglas quedan como A -> B C o A -> a, más S0 -> ε si la
+    gramática genera la cadena vacía. Los No-Terminales nuevos se llaman
+    S0 (inicial), T_a (terminal a) y X, X1, X2... (binarización).
+    El lenguaje no cambia; la primera producción es la del símbolo inicial.
+    Si el lenguaje es vacío, la lista resultante también lo es.
+    """
+    inicial, reglas = _fnc_interna(producciones)
+    tabla = TablaSimbolos()
+    resultado: List[Produccion] = []
+    for A, cuerpos in reglas.items():
+        izquierdo = [tabla.interna(A, es_terminal=False)]
+        for cuerpo in cuerpos:
+            resultado.append(
+                tabla.produccion(izquierdo, [tabla.interna(v, es_terminal=t) for t, v in cuerpo])
+            )
+    return resultado
+
+
+# ===========================
+#   CYK
+# ===========================
+
+class ReconocedorCYK:
+    """
+    Reconocedor CYK. La gramática se convierte a FNC una sola vez; luego
+    cada no terminal es un índice y las reglas binarias se agrupan por su
+    primer símbolo: por_izquierdo[B] = [(A, C), ...] para A -> B C.
+
+    Para una cadena w de largo n, fin[A][i] es un entero cuyo bit j indica
+    A =>* w[i:j]. Las posiciones se procesan de derecha a izquierda, así
+    que fin[C][j] ya está completo para todo j > i; en cada posición solo
+    se propagan los bits recién agregados (lista de trabajo), de modo que
+    el costo depende de las derivaciones que existen y no de n³.
+    """
+
+    def __init__(self, producciones: Iterable[Produccion]):
+        inicial, reglas = _fnc_interna(producciones)
+        self.no_terminales: List[str] = list(reglas)
+        indice = {A: i for i, A in enumerate(self.no_terminales)}
+        self.inicial = indice.get(inicial, -1)
+        self.acepta_vacia = () in reglas.get(inicial, [])
+
+        self.por_terminal: Dict[str, List[int]] = {}
+        self.por_izquierdo: List[List[Tuple[int, int]]] = [[] for _ in self.no_terminales]
+        for A, cuerpos in reglas.items():
+            for cuerpo in cuerpos:
+                if len(cuerpo) == 1:
+                    self.por_terminal.setdefault(cuerpo[0][1], []).append(indice[A])
+                elif len(cuerpo) == 2:
+                    self.por_izquierdo[indice[cuerpo[0][1]]].append((indice[A], indice[cuerpo[1][1]]))
+
+    def acepta(self, cadena: Sequence[str]) -> bool:
+        n = len(cadena)
+        if n == 0:
+            return self.acepta_vacia
+        if self.inicial < 0:
+            return False
+
+        por_terminal, por_izquierdo = self.por_terminal, self.por_izquierdo
+        if any(simbolo not in por_terminal for simbolo in cadena):
+            # Algún símbolo no aparece en ninguna regla A -> a
+            return False
+        fin = [[0] * (n + 1) for _ in self.no_terminales]
+        for i in range(n - 1, -1, -1):
+            pendientes = []
+            for A in por_terminal.get(cadena[i], ()):
+                bit = 1 << (i + 1)
+                if not fin[A][i] & bit:
+                    fin[A][i] |= bit
+                    pendientes.append((A, bit))
+            while pendientes:
+                B, nuevos_B = pendientes.pop()
+                for A, C in por_izquierdo[B]:
+                    fila_C = fin[C]
+                    alcance = 0
+                    resto = nuevos_B
+                    while resto:
+                        bit = resto & -resto
+                        alcance |= fila_C[bit.bit_length() - 1]
+                        resto ^= bit
+                    alcance &= ~fin[A][i]
+                    if alcance:
+                        fin[A][i] |= alcance
+                        pendientes.append((A, alcance))
+        return bool(fin[self.inicial][0] >> n & 1)
+
+    def aceptar_lote(self, cadenas: Iterable[Sequence[str]]) -> List[bool]:
+        acepta = self.acepta
+        return [acepta(cadena) for cadena in cadenas]
+
+
+# ===========================
+#   Earley
+# ===========================
+
+class ReconocedorEarley:
+    """
+    Reconocedor de Earley sobre la gramática original (con reglas ε,
+    unitarias y cuerpos largos). Las reglas se numeran una vez; un ítem
+    es (regla, punto, origen). Para las reglas ε se usa el ajuste de
+    Aycock y Horspool: al predecir un no terminal anulable, el ítem
+    también avanza sobre él.
+    """
+
+    def __init__(self, producciones: Iterable[Produccion]):
+        self.inicial, reglas = _leer_tipo_2(producciones)
+        self.anulables = _anulables(reglas)
+        self.izquierdos: List[str] = []
+        self.cuerpos: List[_Cuerpo] = []
+        self.reglas_de: Dict[str, List[int]] = {}
+        for A, cuerpos in reglas.items():
+            for cuerpo in cuerpos:
+                self.reglas_de.setdefault(A, []).append(len(self.cuerpos))
+                self.izquierdos.append(A)
+                self.cuerpos.append(cuerpo)
+
+    def acepta(self, cadena: Sequence[str]) -> bool:
+        n = len(cadena)
+        cuerpos, izquierdos, reglas_de, anulables = self.cuerpos, self.izquierdos, self.reglas_de, self.anulables
+        columnas: List[Set[Tuple[int, int, int]]] = [set() for _ in range(n + 1)]
+        columnas[0].update((r, 0, 0) for r in reglas_de.get(self.inicial, ()))
+        # esperando[i][X] = ítems de la columna i con el punto antes del No-Terminal X
+        esperando: List[Dict[str, List[Tuple[int, int, int]]]] = []
+
+        for i in range(n + 1):
+            columna = columnas[i]
+            esperando.append({})
+            esperando_aqui = esperando[i]
+            pendientes = list(columna)
+            simbolo = cadena[i] if i < n else None
+
+            while pendientes:
+                r, punto, origen = pendientes.pop()
+                cuerpo = cuerpos[r]
+                if punto == len(cuerpo):
+                    # Completar. Si origen == i, el No-Terminal es anulable y los
+                    # ítems que lo esperaban ya avanzaron al predecirlo.
+                    if origen != i:
+                        for r2, p2, o2 in esperando[origen].get(izquierdos[r], ()):
+                            item = (r2, p2 + 1, o2)
+                            if item not in columna:
+                                columna.add(item)
+                                pendientes.append(item)
+                    continue
+
+                es_terminal, valor = cuerpo[punto]
+                if es_terminal:
+                    # Avanzar sobre el terminal
+                    if valor == simbolo:
+                        columnas[i + 1].add((r, punto + 1, origen))
+                    continue
+
+                # Predecir
+                esperando_aqui.setdefault(valor, []).append((r, punto, origen))
+                nuevos = [(r2, 0, i) for r2 in reglas_de.get(valor, ())]
+                if valor in anulables:
+                    nuevos.append((r, punto + 1, origen))
+                for item in nuevos:
+                    if item not in columna:
+                        columna.add(item)
+                        pendientes.append(item)
+
+            if i < n and not columnas[i + 1]:
+                return False
+
+        return any(
+            punto == len(cuerpos[r]) and origen == 0 and izquierdos[r] == self.inicial
+            for r, punto, origen in columnas[n]
+        )
+
+    def aceptar_lote(self, cadenas: Iterable[Sequence[str]]) -> List[bool]:
+        acepta = self.acepta
+        return [acepta(cadena) for cadena in cadenas]
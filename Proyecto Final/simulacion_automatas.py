@@ -0,0 +1,208 @@
+"""
+Simulación de autómatas: decide si una cadena pertenece al lenguaje
+de un NFA (AutomataNFA) o de un AFD (especificación del Proyecto 1).
+
+- SimuladorNFA: simulación por conjuntos de estados representados como
+  máscaras de bits, con tablas por símbolo en bloques de 8 estados y una
+  caché de transiciones (conjunto, símbolo) -> conjunto.
+- EjecutorAFD: recorre la tabla plana de un AFDDenso (array de enteros)
+  indexada por estado y por posición del símbolo en el alfabeto.
+
+Las cadenas de entrada son secuencias de símbolos: un str sirve cuando
+todos los símbolos son de un carácter; para terminales de varios
+caracteres (por ejemplo "id") se pasa una lista o tupla de símbolos.
+"""
+from array import array
+from typing import Any, Dict, Iterable, List, Sequence, Union
+
+from automata_denso import AFDDenso, SIN_TRANSICION, como_denso
+from conversor_y_diagramas import AutomataNFA, _cerraduras_epsilon_bits, _iterar_bits
+
+
+BITS_POR_BLOQUE = 8
+MASCARA_BLOQUE = (1 << BITS_POR_BLOQUE) - 1
+LIMITE_CACHE_NFA = 1 << 16
+
+
+class SimuladorNFA:
+    """
+    Simulador de un NFA con transiciones ε.
+
+    Los estados se numeran 0..n-1 y un conjunto de estados es un entero.
+    Para cada símbolo se precalcula, por cada bloque de 8 estados, la tabla
+    de 256 entradas con la cerradura-ε de los destinos de cada combinación
+    de estados del bloque; así un paso de la simulación cuesta n/8 consultas
+    y OR de enteros, en lugar de recorrer estado por estado.
+    """
+
+    def __init__(self, nfa: AutomataNFA, limite_cache: int = LIMITE_CACHE_NFA):
+        if nfa.estado_inicial is None:
+            raise ValueError("El NFA no tiene estado inicial definido.")
+
+        todos = set(nfa.estados) | {nfa.estado_inicial}
+        if nfa.estado_final is not None:
+            todos.add(nfa.estado_final)
+        self.indices = {estado: i for i, estado in enumerate(sorted(todos, key=lambda e: e.id))}
+        self.cerraduras = _cerraduras_epsilon_bits(nfa, self.indices)
+        self.bit_final = 1 << self.indices[nfa.estado_final] if nfa.estado_final is not None else 0
+        self.inicial = self.cerraduras[self.indices[nfa.estado_inicial]]
+
+        # destinos[a][i] = cerradura-ε de los estados a los que llega i leyendo a
+        self.destinos: Dict[str, List[int]] = {}
+        for estado, trans in nfa.transiciones.items():
+            i = self.indices[estado]
+            for simbolo, siguientes in trans.items():
+                if simbolo == "ε":
+                    continue
+                fila = self.destinos.setdefault(simbolo, [0] * len(self.indices))
+                for siguiente in siguientes:
+                    fila[i] |= self.cerraduras[self.indices[siguiente]]
+
+        self.alfabeto = set(self.destinos)
+        self._tablas: Dict[str, List[List[int]]] = {}
+        self._cache: Dict[tuple, int] = {}
+        self._limite_cache = limite_cache
+
+    def _tabla(self, simbolo: str) -> List[List[int]]:
+        """Tablas por bloque del símbolo (se construyen la primera vez que se usan)."""
+        tablas = self._tablas.get(simbolo)
+        if tablas is None:
+            fila = self.destinos[simbolo]
+            tablas = []
+            for inicio in range(0, len(fila), BITS_POR_BLOQUE):
+                bloque = fila[inicio:inicio + BITS_POR_BLOQUE]
+                tabla = [0] * (1 << len(bloque))
+                for b in range(1, len(tabla)):
+                    menor = b & -b
+                    tabla[b] = tabla[b ^ menor] | bloque[menor.bit_length() - 1]
+                tablas.append(tabla)
+            self._tablas[simbolo] = tablas
+        return tablas
+
+    def paso(self, conjunto: int, simbolo: str) -> int:
+        """Conjunto de estados (ya con cerradura-ε) tras leer `simbolo`."""
+        clave = (conjunto, simbolo)
+        siguiente = self._cache.get(clave)
+        if siguiente is not None:
+            return siguiente
+        if simbolo not in self.destinos:
+            return 0
+
+        siguiente = 0
+        resto = conjunto
+        for tabla in self._tabla(simbolo):
+            bloque = resto & MASCARA_BLOQUE
+            if bloque:
+                siguiente |= tabla[bloque]
+            resto >>= BITS_POR_BLOQUE
+            if not resto:
+                break
+
+        if len(self._cache) >= self._limite_cache:
+            self._cache.clear()
+        self._cache[clave] = siguiente
+        return siguiente
+
+    def acepta(self, cadena: Sequence[str]) -> bool:
+        conjunto = self.inicial
+        cache = self._cache
+        for simbolo in cadena:
+            siguiente = cache.get((conjunto, simbolo))
+            conjunto = siguiente if siguiente is not None else self.paso(conjunto, simbolo)
+            if not conjunto:
+                return False
+        return bool(conjunto & self.bit_final)
+
+    def aceptar_lote(self, cadenas: Iterable[Sequence[str]]) -> List[bool]:
+        acepta = self.acepta
+        return [acepta(cadena) for cadena in cadenas]
+
+    def estados_activos(self, cadena: Sequence[str]) -> List[int]:
+        """Índices de los estados del NFA activos tras leer la cadena (para depurar)."""
+        conjunto = self.inicial
+        for simbolo in cadena:
+            conjunto = self.paso(conjunto, simbolo)
+        return list(_iterar_bits(conjunto))
+
+
+class EjecutorAFD:
+    """
+    Ejecuta un AFD (especificación del Proyecto 1 o AFDDenso) sobre una
+    tabla plana.
+
+    Parte de la tabla de AFDDenso, pero cada celda guarda el desplazamiento
+    de la fila destino (estado * m), de modo que un paso es tabla[q + columna]
+    sin multiplicar. La última fila es el estado sumidero, que representa
+    las transiciones no definidas.
+    """
+
+    def __init__(self, afd: Union[Dict[str, Any], AFDDenso]):
+        densa = como_denso(afd)
+        self.columnas: Dict[str, int] = densa.columnas
+        m = max(1, len(densa.simbolos))
+        n = len(densa)
+
+        self.m = m
+        self.sumidero = n * m
+        self.inicial = densa.inicial * m
+        self.tabla = array("i", [self.sumidero]) * ((n + 1) * m)
+        for celda, r in enumerate(densa.tabla):
+            if r != SIN_TRANSICION:
+                self.tabla[celda] = r * m
+
+        self.aceptacion = bytearray((n + 1) * m)
+        for q in range(n):
+            if densa.aceptacion[q]:
+                self.aceptacion[q * m] = 1
+
+    def acepta(self, cadena: Sequence[str]) -> bool:
+        tabla, columnas, sumidero = self.tabla, self.columnas, self.sumidero
+        q = self.inicial
+        for simbolo in cadena:
+            c = columnas.get(simbolo)
+            if c is None:
+                return False
+            q = tabla[q + c]
+            if q == sumidero:
+                return False
+        return self.aceptacion[q] == 1
+
+    def aceptar_lote(self, cadenas: Iterable[Sequence[str]]) -> List[bool]:
+        tabla, columnas, sumidero, aceptacion = self.tabla, self.columnas, self.sumidero, self.aceptacion
+        inicial = self.inicial
+        resultados: List[bool] = []
+        agregar = resultados.append
+        for cadena in cadenas:
+            q = inicial
+            for simbolo in cadena:
+                c = columnas.get(simbolo)
+                if c is None:
+                    q = sumidero
+                    break
+                q = tabla[q + c]
+                if q == sumidero:
+                    break
+            agregar(aceptacion[q] == 1)
+        return resultados
+
+
+def crear_simulador(automata: Union[AutomataNFA, AFDDenso, Dict[str, Any]]):
+    """Devuelve el simulador adecuado: EjecutorAFD para un AFD, SimuladorNFA para un NFA."""
+    if isinstance(automata, AutomataNFA):
+        return SimuladorNFA(automata)
+    return EjecutorAFD(automata)
+
+
+def acepta_cadena(automata: Union[AutomataNFA, AFDDenso, Dict[str, Any]], cadena: Sequence[str]) -> bool:
+    """Indica si el autómata (NFA o AFD) acepta la cadena."""
+    return crear_simulador(automata).acepta(cadena)
+
+
+def aceptar_lote(
+    automata: Union[AutomataNFA, AFDDenso, Dict[str, Any]], cadenas: Iterable[Sequence[str]]
+) -> List[bool]:
+    """
+    Prueba muchas cadenas contra el mismo autómata (NFA o AFD).
+    Las tablas se construyen una sola vez para todo el lote.
+    """
+    return crear_simulador(automata).aceptar_lote(cadenas)
@@ -0,0 +1,181 @@
+"""
+Tareas largas fuera del hilo de Tk.
+
+Las comparaciones de equivalencia, la construcción de subconjuntos, el
+dibujo con Graphviz y los reportes PDF pueden tardar minutos; si corren
+en el hilo principal la aplicación entera se congela.
+
+- EjecutorTareas: corre una función en un hilo del grupo compartido y,
+  con after(), revisa cada cierto tiempo si terminó; los callbacks
+  (al_terminar, al_fallar, al_cancelar, al_avanzar) siempre se llaman en
+  el hilo de Tk, así que pueden tocar los widgets.
+- TokenCancelacion: cancelación cooperativa. Los bucles largos llaman a
+  verificar(), que lanza TareaCancelada si se pidió cancelar, y pueden
+  informar su avance con informar().
+- cancelar_todas: cancela las tareas vivas. Los hilos del grupo no son
+  demonio y Python los espera al salir, así que la aplicación la llama al
+  cerrarse; si no, el proceso seguiría vivo hasta que termine la tarea.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Set
+
+
+class TareaCancelada(Exception):
+    """La tarea se detuvo porque alguien pidió cancelarla."""
+
+
+class TokenCancelacion:
+    """Bandera de cancelación y último mensaje de avance de una tarea."""
+
+    def __init__(self):
+        self._evento = threading.Event()
+        self.avance: Optional[str] = None
+
+    def cancelar(self) -> None:
+        self._evento.set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._evento.is_set()
+
+    def verificar(self) -> None:
+        if self._evento.is_set():
+            raise TareaCancelada("La tarea fue cancelada.")
+
+    def informar(self, avance: str) -> None:
+        # Una asignación de atributo es atómica; el hilo de Tk solo la lee
+        self.avance = avance
+
+
+def _sin_cancelacion() -> None:
+    pass
+
+
+def verificador(token: Optional[TokenCancelacion]) -> Callable[[], None]:
+    """token.verificar, o una función que no hace nada si no hay token."""
+    return token.verificar if token is not None else _sin_cancelacion
+
+
+# Hilos compartidos por todas las ventanas (se crean al primer uso)
+_GRUPO: Optional[ThreadPoolExecutor] = None
+_CANDADO_GRUPO = threading.Lock()
+HILOS_DE_TRABAJO = 2
+
+
+def _grupo() -> ThreadPoolExecutor:
+    global _GRUPO
+    with _CANDADO_GRUPO:
+        if _GRUPO is None:
+            _GRUPO = ThreadPoolExecutor(max_workers=HILOS_DE_TRABAJO, thread_name_prefix="tarea")
+        return _GRUPO
+
+
+# Tareas lanzadas y aún sin terminar (para cancelar_todas)
+_TAREAS_VIVAS: Set["Tarea"] = set()
+_CANDADO_TAREAS = threading.Lock()
+
+
+class Tarea:
+    """Una ejecución en curso: su futuro y su token de cancelación."""
+
+    def __init__(self, futuro: Future, token: TokenCancelacion):
+        self.futuro = futuro
+        self.token = token
+        with _CANDADO_TAREAS:
+            _TAREAS_VIVAS.add(self)
+        futuro.add_done_callback(self._terminar)
+
+    def _terminar(self, futuro: Future) -> None:
+        with _CANDADO_TAREAS:
+            _TAREAS_VIVAS.discard(self)
+
+    def cancelar(self) -> None:
+        self.token.cancelar()
+        self.futuro.cancel()
+
+    @property
+    def terminada(self) -> bool:
+        return self.futuro.done()
+
+
+def cancelar_todas() -> None:
+    """Pide cancelar todas las tareas vivas, de cualquier ventana."""
+    with _CANDADO_TAREAS:
+        tareas = list(_TAREAS_VIVAS)
+    for tarea in tareas:
+        tarea.cancelar()
+
+
+class EjecutorTareas:
+    """
+    Corre funciones en segundo plano y entrega el resultado en el hilo de Tk.
+
+    La función recibe el TokenCancelacion como único argumento:
+        ejecutor.ejecutar(lambda token: comparar(g1, g2, token=token),
+                          al_terminar=mostrar_resultado)
+    """
+
+    def __init__(self, widget: Any, intervalo_ms: int = 100):
+        self.widget = widget
+        self.intervalo_ms = intervalo_ms
+        self.actual: Optional[Tarea] = None
+
+    @property
+    def ocupado(self) -> bool:
+        return self.actual is not None and not self.actual.terminada
+
+    def ejecutar(
+        self,
+        funcion: Callable[[TokenCancelacion], Any],
+        al_terminar: Optional[Callable[[Any], None]] = None,
+        al_fallar: Optional[Callable[[BaseException], None]] = None,
+        al_cancelar: Optional[Callable[[], None]] = None,
+        al_avanzar: Optional[Callable[[str], None]] = None,
+    ) -> Tarea:
+        """Lanza la tarea; si había otra en curso en este ejecutor, la cancela."""
+        self.cancelar()
+        token = TokenCancelacion()
+        tarea = Tarea(_grupo().submit(funcion, token), token)
+        self.actual = tarea
+        self.widget.after(
+            self.intervalo_ms, self._revisar, tarea, al_terminar, al_fallar, al_cancelar, al_avanzar, None
+        )
+        return tarea
+
+    def cancelar(self) -> None:
+        if self.actual is not None:
+            self.actual.cancelar()
+
+    def _revisar(self, tarea, al_terminar, al_fallar, al_cancelar, al_avanzar, ultimo_avance) -> None:
+        try:
+            vivo = bool(self.widget.winfo_exists())
+        except Exception:
+            vivo = False
+        if not vivo:
+            # La ventana se cerró: nadie espera el resultado
+            tarea.cancelar()
+            return
+
+        if not tarea.terminada:
+            avance = tarea.token.avance
+            if al_avanzar is not None and avance is not None and avance != ultimo_avance:
+                al_avanzar(avance)
+            self.widget.after(
+                self.intervalo_ms, self._revisar, tarea, al_terminar, al_fallar, al_cancelar, al_avanzar, avance
+            )
+            return
+
+        if self.actual is not tarea:
+            # Reemplazada por otra tarea del mismo ejecutor: sus callbacks ya no aplican
+            return
+        self.actual = None
+        error = None if tarea.futuro.cancelled() else tarea.futuro.exception()
+        if tarea.futuro.cancelled() or isinstance(error, TareaCancelada):
+            if al_cancelar is not None:
+                al_cancelar()
+        elif error is not None:
+            if al_fallar is not None:
+                al_fallar(error)
+        elif al_terminar is not None:
+            al_terminar(tarea.futuro.result())
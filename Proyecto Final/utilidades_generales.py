@@ -16,6 +16,9 @@ EPSILON_GRAMATICA = "epsilon"
 class NodoArbol:
     """Nodo simple para representar un árbol de derivación (por si quieres usarlo)."""
 
+    # Sin __dict__: los árboles de entradas grandes tienen millones de nodos
+    __slots__ = ("simbolo", "hijos", "lexema", "linea", "columna")
+
     def __init__(self, simbolo: str):
         self.simbolo = simbolo
         self.hijos: List["NodoArbol"] = []
@@ -2,9 +2,10 @@ import tkinter as tk
 from tkinter import scrolledtext, filedialog
 
 from utilidades_generales import VentanaCentrada, Alerta
-from estructuras_gramatica import leer_gramatica_desde_texto, producciones_a_texto
-from clasificador_chomsky import ClasificadorChomsky
+from estructuras_gramatica import producciones_a_texto
+from clasificador_chomsky import ClasificadorChomsky, ClasificadorIncremental
 from reportes_pdf import crear_reporte_pdf
+from tareas_segundo_plano import EjecutorTareas
 
 
 class TextoConNumerosLinea(tk.Frame):
@@ -15,6 +16,9 @@ class TextoConNumerosLinea(tk.Frame):
     def __init__(self, master, **kwargs):
         super().__init__(master, bg="#b9ede2")
         self.canvas_lineas = tk.Canvas(self, width=40, bg="#e0e0e0", highlightthickness=0)
+        # Ítems de texto del canvas, uno por línea visible; se reutilizan
+        self._items_lineas = []
+        self._textos_items = []
         self.texto = tk.Text(self, **kwargs)
         self.barra = tk.Scrollbar(self, orient="vertical", command=self._scroll_vertical)
 
@@ -39,7 +43,13 @@ class TextoConNumerosLinea(tk.Frame):
         self._actualizar_lineas()
 
     def _actualizar_lineas(self, event=None):
-        self.canvas_lineas.delete("all")
+        """
+        Dibuja los números de las líneas visibles reutilizando los ítems del
+        canvas: solo se mueven o cambian de texto los que cambiaron, y los
+        que sobran se ocultan.
+        """
+        canvas = self.canvas_lineas
+        usados = 0
         i = self.texto.index("@0,0")
         while True:
             dline = self.texto.dlineinfo(i)
@@ -47,11 +57,22 @@ class TextoConNumerosLinea(tk.Frame):
                 break
             y = dline[1]
             linea = str(i).split(".")[0]
-            self.canvas_lineas.create_text(
-                2, y, anchor="nw", text=linea, fill="#606060", font=("Consolas", 9)
-            )
+            if usados == len(self._items_lineas):
+                self._items_lineas.append(
+                    canvas.create_text(2, y, anchor="nw", text=linea, fill="#606060", font=("Consolas", 9))
+                )
+                self._textos_items.append((linea, y))
+            elif self._textos_items[usados] != (linea, y):
+                item = self._items_lineas[usados]
+                canvas.coords(item, 2, y)
+                canvas.itemconfigure(item, text=linea, state="normal")
+                self._textos_items[usados] = (linea, y)
+            usados += 1
             i = self.texto.index(f"{i}+1line")
-        self.canvas_lineas.configure(scrollregion=self.canvas_lineas.bbox("all"))
+        for k in range(usados, len(self._items_lineas)):
+            if self._textos_items[k] is not None:
+                canvas.itemconfigure(self._items_lineas[k], state="hidden")
+                self._textos_items[k] = None
 
     # Métodos de conveniencia
     def get(self, *args, **kwargs):
@@ -85,7 +106,15 @@ class VentanaClasificador(tk.Toplevel, VentanaCentrada):
         self.justificacion = []
         self.texto_gramatica_original = ""
 
+        # Clasificación en vivo mientras se escribe
+        self.clasificador_vivo = ClasificadorIncremental()
+        self._pendiente_en_vivo = None
+
+        # El PDF se genera en segundo plano
+        self.ejecutor_pdf = EjecutorTareas(self)
+
         self._construir_interfaz()
+        self._clasificar_en_vivo()
 
     def _construir_interfaz(self):
         marco = tk.Frame(self, bg="#b9ede2")
@@ -132,6 +161,17 @@ class VentanaClasificador(tk.Toplevel, VentanaCentrada):
             "# - Usa 'epsilon' o 'ε' para la cadena vacía.\n"
         )
         self.caja_entrada.insert("1.0", ejemplo)
+        self.caja_entrada.texto.bind("<KeyRelease>", self._programar_en_vivo, add="+")
+
+        self.etiqueta_en_vivo = tk.Label(
+            marco_izq,
+            text="",
+            bg="#b9ede2",
+            font=("Segoe UI", 10),
+            anchor="w",
+            justify="left",
+        )
+        self.etiqueta_en_vivo.pack(fill="x", pady=(4, 0))
 
         # Lado derecho: salida
         marco_der = tk.Frame(marco, bg="#b9ede2")
@@ -170,6 +210,21 @@ class VentanaClasificador(tk.Toplevel, VentanaCentrada):
         )
         self.boton_pdf.pack(side="left", padx=5)
 
+    def _programar_en_vivo(self, event=None):
+        # Espera a que el usuario deje de teclear un momento
+        if self._pendiente_en_vivo is not None:
+            self.after_cancel(self._pendiente_en_vivo)
+        self._pendiente_en_vivo = self.after(150, self._clasificar_en_vivo)
+
+    def _clasificar_en_vivo(self):
+        self._pendiente_en_vivo = None
+        self.clasificador_vivo.actualizar(self.caja_entrada.get("1.0", "end"))
+        error = self.clasificador_vivo.error()
+        if error:
+            self.etiqueta_en_vivo.config(text=f"En vivo: {error}", fg="#a03030")
+        else:
+            self.etiqueta_en_vivo.config(text=f"En vivo: {self.clasificador_vivo.descripcion()}", fg="#206040")
+
     def _mostrar_salida(self, texto: str):
         self.caja_salida.config(state="normal")
         self.caja_salida.delete("1.0", "end")
@@ -185,7 +240,12 @@ class VentanaClasificador(tk.Toplevel, VentanaCentrada):
         self.texto_gramatica_original = texto
 
         try:
-            self.producciones = leer_gramatica_desde_texto(texto)
+            # Las líneas ya leídas por la clasificación en vivo no se vuelven a leer
+            self.clasificador_vivo.actualizar(texto)
+            error = self.clasificador_vivo.error()
+            if error:
+                raise ValueError(error)
+            self.producciones = self.clasificador_vivo.producciones()
             clasificador = ClasificadorChomsky(self.producciones)
             tipo, descripcion, justificacion = clasificador.clasificar()
 
@@ -227,12 +287,17 @@ class VentanaClasificador(tk.Toplevel, VentanaCentrada):
         if not ruta:
             return
 
-        ok, mensaje = crear_reporte_pdf(
-            ruta,
-            self.texto_gramatica_original,
-            self.tipo_descripcion,
-            self.justificacion,
+        texto, tipo, justificacion = self.texto_gramatica_original, self.tipo_descripcion, list(self.justificacion)
+        self.boton_pdf.config(state="disabled")
+        self.ejecutor_pdf.ejecutar(
+            lambda token: crear_reporte_pdf(ruta, texto, tipo, justificacion),
+            al_terminar=self._pdf_terminado,
+            al_fallar=lambda error: self._pdf_terminado((False, f"No se pudo generar el PDF:\n{error}")),
         )
+
+    def _pdf_terminado(self, resultado):
+        ok, mensaje = resultado
+        self.boton_pdf.config(state="normal")
         if ok:
             Alerta.mostrar(self, "Éxito", mensaje)
         else:
@@ -3,13 +3,14 @@ from tkinter import scrolledtext
 
 from utilidades_generales import VentanaCentrada, Alerta
 from analizador_lexico_gramaticas import AnalizadorLexicoGramaticas
-from motor_ll1 import GeneradorTablaLL1, analizar_sintactico
+from motor_ll1 import obtener_tabla_ll1, analizar_sintactico_con_recuperacion
 from estructuras_gramatica import (
     GRAMATICA_DE_GRAMATICAS,
     SIMBOLO_INICIAL_GRAMATICA,
     extraer_producciones,
 )
 from equivalencias import comparar_gramaticas
+from tareas_segundo_plano import EjecutorTareas
 
 
 class VentanaComparadorEquivalencia(tk.Toplevel, VentanaCentrada):
@@ -22,8 +23,9 @@ class VentanaComparadorEquivalencia(tk.Toplevel, VentanaCentrada):
         self.centrar_ventana(self, 900, 600)
 
         self.analizador_lexico = AnalizadorLexicoGramaticas()
-        self.generador_tabla = GeneradorTablaLL1(GRAMATICA_DE_GRAMATICAS, SIMBOLO_INICIAL_GRAMATICA)
-        self.tabla_M = self.generador_tabla.construir_tabla()
+        self.generador_tabla = obtener_tabla_ll1(GRAMATICA_DE_GRAMATICAS, SIMBOLO_INICIAL_GRAMATICA)
+        self.analizador_ll1 = self.generador_tabla.compilar()
+        self.ejecutor = EjecutorTareas(self)
 
         self._crear_interfaz()
 
@@ -70,13 +72,14 @@ class VentanaComparadorEquivalencia(tk.Toplevel, VentanaCentrada):
         self.entrada_n.delete(0, "end")
         self.entrada_n.insert(0, "5")
 
-        tk.Button(
+        self.boton_comparar = tk.Button(
             marco_inferior,
             text="Comparar Gramáticas",
             command=self.ejecutar_comparacion,
             font=("Times New Roman", 12, "bold"),
             bg="#c9c695",
-        ).pack(side="left", padx=10)
+        )
+        self.boton_comparar.pack(side="left", padx=10)
 
         self.etiqueta_resultado = tk.Label(
             marco_principal,
@@ -88,21 +91,19 @@ class VentanaComparadorEquivalencia(tk.Toplevel, VentanaCentrada):
         self.etiqueta_resultado.grid(row=3, column=0, columnspan=2, pady=(10, 0), sticky="ew")
 
     def _parsear_gramatica(self, texto: str):
-        tokens = []
-        for i, linea in enumerate(texto.splitlines()):
-            tokens.extend(
-                [t for t in self.analizador_lexico.tokenizar_linea(linea, i + 1) if t[1] != "INVALIDO"]
-            )
+        tokens = [t for t in self.analizador_lexico.tokenizar_texto(texto, incluir_fin_linea=True) if t[1] != "INVALIDO"]
 
-        arbol, error = analizar_sintactico(
-            tokens,
-            self.tabla_M,
-            SIMBOLO_INICIAL_GRAMATICA,
-            self.generador_tabla.FIRST,
-            self.generador_tabla.FOLLOW,
-        )
+        arbol, error = self.analizador_ll1.analizar(tokens)
         if error:
-            Alerta.mostrar(self, "Error de Parseo", f"No se pudo analizar la gramática:\n{error}")
+            # Segunda pasada con recuperación para informar todos los errores de una vez
+            _, errores = analizar_sintactico_con_recuperacion(
+                tokens,
+                self.generador_tabla.tabla_M,
+                SIMBOLO_INICIAL_GRAMATICA,
+                self.generador_tabla.FIRST,
+                self.generador_tabla.FOLLOW,
+            )
+            Alerta.mostrar(self, "Error de Parseo", "No se pudo analizar la gramática:\n" + "\n".join(errores))
             return None
 
         producciones = extraer_producciones(arbol)
@@ -113,6 +114,11 @@ class VentanaComparadorEquivalencia(tk.Toplevel, VentanaCentrada):
         return producciones
 
     def ejecutar_comparacion(self):
+        if self.ejecutor.ocupado:
+            # El mismo botón sirve para cancelar la comparación en curso
+            self.ejecutor.cancelar()
+            return
+
         texto_g1 = self.caja_g1.get("1.0", tk.END)
         texto_g2 = self.caja_g2.get("1.0", tk.END)
 
@@ -129,5 +135,26 @@ class VentanaComparadorEquivalencia(tk.Toplevel, VentanaCentrada):
         if not g2:
             return
 
-        equivalentes, texto = comparar_gramaticas(g1, g2, n)
+        self.boton_comparar.config(text="Cancelar")
+        self.etiqueta_resultado.config(text="Comparando...", fg="black")
+        self.ejecutor.ejecutar(
+            lambda token: comparar_gramaticas(g1, g2, n, token=token),
+            al_terminar=self._mostrar_resultado,
+            al_fallar=self._mostrar_fallo,
+            al_cancelar=self._mostrar_cancelacion,
+            al_avanzar=lambda avance: self.etiqueta_resultado.config(text=avance),
+        )
+
+    def _mostrar_resultado(self, resultado):
+        equivalentes, texto = resultado
+        self.boton_comparar.config(text="Comparar Gramáticas")
         self.etiqueta_resultado.config(text=texto, fg="green" if equivalentes else "red")
+
+    def _mostrar_fallo(self, error):
+        self.boton_comparar.config(text="Comparar Gramáticas")
+        self.etiqueta_resultado.config(text="La comparación falló.", fg="red")
+        Alerta.mostrar(self, "Error", str(error))
+
+    def _mostrar_cancelacion(self):
+        self.boton_comparar.config(text="Comparar Gramáticas")
+        self.etiqueta_resultado.config(text="Comparación cancelada.", fg="black")
@@ -13,10 +13,13 @@ from conversor_y_diagramas import (
     convertir_gramatica_a_nfa,
     obtener_alfabeto_desde_nfa,
     convertir_afd_a_expresion_regular,
+    minimizar_afd,
+    contar_estados_afd,
     dibujar_automata,
     mostrar_imagen_en_ventana,
 )
 from automatas_ejemplo import DefinicionesAutomatas
+from tareas_segundo_plano import EjecutorTareas
 
 
 class VentanaConversor(tk.Toplevel, VentanaCentrada):
@@ -32,6 +35,8 @@ class VentanaConversor(tk.Toplevel, VentanaCentrada):
         self.title("Conversor de Modelos - Jearquía Chomsky")
         self.configure(bg="#b9ede2")
         self.centrar_ventana(self, 1000, 620)
+        # Conversiones y diagramas corren fuera del hilo de Tk, de a una a la vez
+        self.ejecutor = EjecutorTareas(self)
         self._construir_interfaz()
 
     def _construir_interfaz(self):
@@ -56,7 +61,7 @@ class VentanaConversor(tk.Toplevel, VentanaCentrada):
 
         tk.Label(
             panel_regex,
-            text="Expresión Regular (alfabeto de letras minúsculas, operadores: |, *, paréntesis)",
+            text="Expresión Regular (operadores: |, *, +, ?, paréntesis, clases [a-z], 'terminal')",
             bg="#b9ede2",
             anchor="w",
         ).grid(row=0, column=0, sticky="ew", padx=5, pady=(5, 2))
@@ -173,10 +178,86 @@ class VentanaConversor(tk.Toplevel, VentanaCentrada):
             command=self.ver_diagrama_ejemplo_l1,
         ).pack(side="left", padx=5)
 
+        self.boton_cancelar = tk.Button(
+            panel_inferior,
+            text="Cancelar",
+            bg="#c9c695",
+            font=("Segoe UI", 10),
+            state="disabled",
+            command=self.ejecutor.cancelar,
+        )
+        self.boton_cancelar.pack(side="left", padx=5)
+
+        self.etiqueta_estado = tk.Label(panel_inferior, text="", bg="#b9ede2", font=("Segoe UI", 10))
+        self.etiqueta_estado.pack(side="left", padx=5)
+
+        self.var_minimizar = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            panel_inferior,
+            text="Minimizar AFD (Hopcroft)",
+            variable=self.var_minimizar,
+            bg="#b9ede2",
+            font=("Segoe UI", 10),
+        ).pack(side="right", padx=5)
+
     # ==========================
     #   Acciones de conversión
     # ==========================
 
+    def _en_segundo_plano(self, descripcion, funcion, al_terminar, mensaje_error):
+        """
+        Corre funcion(token) en segundo plano mostrando `descripcion` en la
+        barra inferior; al_terminar recibe el resultado en el hilo de Tk.
+        """
+        self.etiqueta_estado.config(text=descripcion)
+        self.boton_cancelar.config(state="normal")
+
+        def terminar(resultado):
+            self._fin_de_tarea("")
+            al_terminar(resultado)
+
+        def fallar(error):
+            self._fin_de_tarea("")
+            Alerta.mostrar(self, "Error", f"{mensaje_error}{error}")
+
+        self.ejecutor.ejecutar(
+            funcion,
+            al_terminar=terminar,
+            al_fallar=fallar,
+            al_cancelar=lambda: self._fin_de_tarea("Operación cancelada."),
+        )
+
+    def _fin_de_tarea(self, texto):
+        self.etiqueta_estado.config(text=texto)
+        self.boton_cancelar.config(state="disabled")
+
+    def _ver_diagrama(self, afd, nombre, titulo):
+        def mostrar(ruta):
+            try:
+                mostrar_imagen_en_ventana(self, ruta, titulo)
+            except Exception as e:
+                Alerta.mostrar(self, "Error", str(e))
+
+        self._en_segundo_plano(
+            "Dibujando diagrama...",
+            lambda token: dibujar_automata(afd, nombre, token=token),
+            mostrar,
+            "",
+        )
+
+    @staticmethod
+    def _etapa_minimizacion(afd, minimizar):
+        """
+        Etapa opcional después de la construcción de subconjuntos.
+        Devuelve (afd_resultante, texto_con_conteo_de_estados).
+        """
+        antes = contar_estados_afd(afd)
+        if not minimizar:
+            return afd, f"Estados del AFD: {antes}"
+        minimo = minimizar_afd(afd)
+        despues = contar_estados_afd(minimo)
+        return minimo, f"Estados del AFD: {antes} → {despues} (minimizado con Hopcroft)"
+
     def convertir_desde_regex(self):
         self.salida_regex.delete("1.0", "end")
         self._afd_desde_regex = None
@@ -186,21 +267,30 @@ class VentanaConversor(tk.Toplevel, VentanaCentrada):
             Alerta.mostrar(self, "Error", "Ingresa una expresión regular.")
             return
 
-        try:
+        minimizar = self.var_minimizar.get()
+
+        def convertir(token):
             nfa = expresion_regular_a_nfa(expresion)
             alfabeto = obtener_alfabeto_desde_nfa(nfa)
-            afd = convertir_nfa_a_afd(nfa, alfabeto)
-            self._afd_desde_regex = afd
+            afd = convertir_nfa_a_afd(nfa, alfabeto, token)
+            afd, texto_estados = self._etapa_minimizacion(afd, minimizar)
             gram = convertir_afd_a_gramatica(afd)
-            texto_gram = producciones_a_texto(gram)
-        except Exception as e:
-            Alerta.mostrar(self, "Error", f"No se pudo convertir la expresión regular:\n{e}")
-            return
+            return afd, alfabeto, texto_estados, producciones_a_texto(gram)
 
+        self._en_segundo_plano(
+            "Convirtiendo expresión regular...",
+            convertir,
+            lambda resultado: self._mostrar_conversion_regex(expresion, *resultado),
+            "No se pudo convertir la expresión regular:\n",
+        )
+
+    def _mostrar_conversion_regex(self, expresion, afd, alfabeto, texto_estados, texto_gram):
+        self._afd_desde_regex = afd
         salida = []
         salida.append("=== Resultado de la conversión ===\n")
         salida.append(f"Expresión regular: {expresion}\n")
         salida.append(f"Alfabeto detectado: {sorted(list(alfabeto))}\n")
+        salida.append(f"{texto_estados}\n")
         salida.append("--- Gramática regular equivalente ---")
         salida.append(texto_gram)
 
@@ -210,34 +300,39 @@ class VentanaConversor(tk.Toplevel, VentanaCentrada):
         if not self._afd_desde_regex:
             Alerta.mostrar(self, "Error", "Primero convierte una expresión regular.")
             return
-        try:
-            ruta = dibujar_automata(self._afd_desde_regex, "afd_desde_regex")
-            mostrar_imagen_en_ventana(self, ruta, "Diagrama del AFD (desde Regex)")
-        except Exception as e:
-            Alerta.mostrar(self, "Error", str(e))
+        self._ver_diagrama(self._afd_desde_regex, "afd_desde_regex", "Diagrama del AFD (desde Regex)")
 
     def convertir_desde_gramatica(self):
         self.salida_gram.delete("1.0", "end")
         self._afd_desde_gramatica = None
 
         texto = self.entrada_gramatica.get("1.0", "end")
-        try:
+        minimizar = self.var_minimizar.get()
+
+        def convertir(token):
             producciones = leer_gramatica_desde_texto(texto)
             nfa = convertir_gramatica_a_nfa(producciones)
             alfabeto = obtener_alfabeto_desde_nfa(nfa)
-            afd = convertir_nfa_a_afd(nfa, alfabeto)
-            self._afd_desde_gramatica = afd
-            regex = convertir_afd_a_expresion_regular(afd)
-        except Exception as e:
-            Alerta.mostrar(self, "Error", f"No se pudo convertir la gramática:\n{e}")
-            return
+            afd = convertir_nfa_a_afd(nfa, alfabeto, token)
+            afd, texto_estados = self._etapa_minimizacion(afd, minimizar)
+            return afd, alfabeto, texto_estados, convertir_afd_a_expresion_regular(afd)
+
+        self._en_segundo_plano(
+            "Convirtiendo gramática...",
+            convertir,
+            lambda resultado: self._mostrar_conversion_gramatica(texto, *resultado),
+            "No se pudo convertir la gramática:\n",
+        )
 
+    def _mostrar_conversion_gramatica(self, texto, afd, alfabeto, texto_estados, regex):
+        self._afd_desde_gramatica = afd
         salida = []
         salida.append("=== Resultado de la conversión ===\n")
         salida.append("--- Gramática original ingresada ---")
         salida.append(texto.strip())
         salida.append("")
         salida.append(f"Alfabeto detectado en el NFA/AFD: {sorted(list(alfabeto))}")
+        salida.append(texto_estados)
         salida.append(f"Expresión regular equivalente (aprox): {regex}")
 
         self.salida_gram.insert("1.0", "\n".join(salida))
@@ -246,11 +341,9 @@ class VentanaConversor(tk.Toplevel, VentanaCentrada):
         if not self._afd_desde_gramatica:
             Alerta.mostrar(self, "Error", "Primero convierte una gramática.")
             return
-        try:
-            ruta = dibujar_automata(self._afd_desde_gramatica, "afd_desde_gramatica")
-            mostrar_imagen_en_ventana(self, ruta, "Diagrama del AFD (desde Gramática)")
-        except Exception as e:
-            Alerta.mostrar(self, "Error", str(e))
+        self._ver_diagrama(
+            self._afd_desde_gramatica, "afd_desde_gramatica", "Diagrama del AFD (desde Gramática)"
+        )
 
     def uso_ejemplo_l1(self):
         spec = DefinicionesAutomatas.automata_l1()
@@ -264,8 +357,4 @@ class VentanaConversor(tk.Toplevel, VentanaCentrada):
 
     def ver_diagrama_ejemplo_l1(self):
         spec = DefinicionesAutomatas.automata_l1()
-        try:
-            ruta = dibujar_automata(spec, "afd_ejemplo_l1")
-            mostrar_imagen_en_ventana(self, ruta, "Diagrama AFD L1: (ab)*")
-        except Exception as e:
-            Alerta.mostrar(self, "Error", str(e))
+        self._ver_diagrama(spec, "afd_ejemplo_l1", "Diagrama AFD L1: (ab)*")
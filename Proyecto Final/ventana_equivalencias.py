@@ -4,6 +4,7 @@ from tkinter import scrolledtext
 from utilidades_generales import VentanaCentrada, Alerta
 from estructuras_gramatica import leer_gramatica_desde_texto
 from equivalencias import comparar_gramaticas
+from tareas_segundo_plano import EjecutorTareas
 
 
 class VentanaEquivalencias(tk.Toplevel, VentanaCentrada):
@@ -17,6 +18,7 @@ class VentanaEquivalencias(tk.Toplevel, VentanaCentrada):
         self.title("Comparador de Equivalencia de Gramáticas")
         self.configure(bg="#b9ede2")
         self.centrar_ventana(self, 1000, 620)
+        self.ejecutor = EjecutorTareas(self)
         self._construir_interfaz()
 
     def _construir_interfaz(self):
@@ -60,18 +62,28 @@ class VentanaEquivalencias(tk.Toplevel, VentanaCentrada):
             side="left"
         )
 
-        self.spin_n = tk.Spinbox(panel_inferior, from_=1, to=10, width=5)
+        self.spin_n = tk.Spinbox(panel_inferior, from_=1, to=30, width=5)
         self.spin_n.pack(side="left", padx=5)
         self.spin_n.delete(0, "end")
         self.spin_n.insert(0, "5")
 
-        tk.Button(
+        self.boton_comparar = tk.Button(
             panel_inferior,
             text="Comparar Gramáticas",
             bg="#c9c695",
             font=("Segoe UI", 11, "bold"),
             command=self.ejecutar_comparacion,
-        ).pack(side="left", padx=10)
+        )
+        self.boton_comparar.pack(side="left", padx=10)
+
+        self.var_solo_conteo = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            panel_inferior,
+            text="Solo conteo por longitud (para n grande)",
+            variable=self.var_solo_conteo,
+            bg="#b9ede2",
+            font=("Segoe UI", 10),
+        ).pack(side="left", padx=5)
 
         self.etiqueta_resultado = tk.Label(
             marco,
@@ -83,6 +95,11 @@ class VentanaEquivalencias(tk.Toplevel, VentanaCentrada):
         self.etiqueta_resultado.grid(row=3, column=0, columnspan=2, sticky="ew", pady=10)
 
     def ejecutar_comparacion(self):
+        if self.ejecutor.ocupado:
+            # El mismo botón sirve para cancelar la comparación en curso
+            self.ejecutor.cancelar()
+            return
+
         texto1 = self.caja_g1.get("1.0", "end")
         texto2 = self.caja_g2.get("1.0", "end")
 
@@ -104,8 +121,30 @@ class VentanaEquivalencias(tk.Toplevel, VentanaCentrada):
             Alerta.mostrar(self, "Error en Gramática 2", str(e))
             return
 
-        son_eq, mensaje = comparar_gramaticas(g1, g2, n_max=n)
+        solo_conteo = self.var_solo_conteo.get()
+        self.boton_comparar.config(text="Cancelar")
+        self.etiqueta_resultado.config(text="Comparando...", fg="black")
+        self.ejecutor.ejecutar(
+            lambda token: comparar_gramaticas(g1, g2, n_max=n, solo_conteo=solo_conteo, token=token),
+            al_terminar=self._mostrar_resultado,
+            al_fallar=self._mostrar_fallo,
+            al_cancelar=self._mostrar_cancelacion,
+            al_avanzar=lambda avance: self.etiqueta_resultado.config(text=avance),
+        )
+
+    def _mostrar_resultado(self, resultado):
+        son_eq, mensaje = resultado
+        self.boton_comparar.config(text="Comparar Gramáticas")
         self.etiqueta_resultado.config(
             text=mensaje,
             fg="green" if son_eq else "red",
         )
+
+    def _mostrar_fallo(self, error):
+        self.boton_comparar.config(text="Comparar Gramáticas")
+        self.etiqueta_resultado.config(text="La comparación falló.", fg="red")
+        Alerta.mostrar(self, "Error", str(error))
+
+    def _mostrar_cancelacion(self):
+        self.boton_comparar.config(text="Comparar Gramáticas")
+        self.etiqueta_resultado.config(text="Comparación cancelada.", fg="black")